@@ -0,0 +1,225 @@
+# run_benchmarks.py
+# Speed benchmarks for the game engine (week5), the reference encoder and the DQN agent (week4).
+# Results are written as JSON and compared against a saved baseline to catch regressions.
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ("week5", "week4", "reference"):
+    sys.path.insert(0, os.path.join(ROOT, folder))
+
+import numpy as np
+import pygame
+from game_board import GameBoard
+from player import Player
+from search_state import SearchState
+from tron_game import update_game_state
+from util import generate_output
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results", "latest.json")
+
+class FixedAI:
+    def __init__(self, direction):
+        self.direction = direction
+
+    def get_direction(self, *args):
+        return self.direction
+
+def measure(func, repeat):
+    """
+    Run func repeat times and keep the median, which is less noisy than the mean.
+    :param func: Callable returning a measurement
+    :return: Median of the measurements
+    """
+    return statistics.median(func() for _ in range(repeat))
+
+def bench_engine(sizes, steps, repeat):
+    results = {}
+    for width, height in sizes:
+        def run():
+            done = 0
+            elapsed = 0.0
+            while done < steps:
+                # Two bikes driving straight past each other on neighbouring rows
+                board = GameBoard(width, height)
+                player1 = Player(0, height // 2, (255, 0, 0), 1, FixedAI([1, 0]))
+                player2 = Player(width - 1, height // 2 + 1, (0, 0, 255), 2, FixedAI([-1, 0]))
+                start = time.perf_counter()
+                while done < steps and update_game_state(player1, player2, board) == 0:
+                    done += 1
+                elapsed += time.perf_counter() - start
+            return steps / elapsed
+        results[f"engine_steps_per_sec_{width}x{height}"] = measure(run, repeat)
+    return results
+
+def bench_draw(frames, repeat):
+    pygame.init()
+    screen = pygame.Surface((800, 600))
+    board = GameBoard(40, 30)
+    rng = random.Random(0)
+    for _ in range(300):
+        board.grid[rng.randrange(30)][rng.randrange(40)] = rng.choice([1, 2])
+
+    def run():
+        start = time.perf_counter()
+        for _ in range(frames):
+            board.draw(screen)
+        return (time.perf_counter() - start) / frames * 1e3
+    return {"draw_frame_ms_40x30": measure(run, repeat)}
+
+def bench_encoder(calls, repeat):
+    rng = random.Random(0)
+    snake = {(rng.randrange(0, 600, 50), rng.randrange(0, 600, 50)) for _ in range(200)}
+    heads = [(rng.randrange(0, 600, 50), rng.randrange(0, 600, 50)) for _ in range(calls)]
+
+    def run():
+        start = time.perf_counter()
+        for head in heads:
+            generate_output(snake, head, (300, 300), 600, 600)
+        return calls / (time.perf_counter() - start)
+    return {"encoder_calls_per_sec": measure(run, repeat)}
+
+def bench_search(depth, repeat):
+    board = GameBoard(40, 30)
+    state = SearchState.from_game(board, Player(10, 15, (255, 0, 0), 1, None),
+                                  Player(30, 15, (0, 0, 255), 2, None))
+
+    def search(depth):
+        # Full-width simultaneous-move tree, counting applied moves
+        if depth == 0 or state.result:
+            return 0
+        nodes = 0
+        for m1 in state.moves(0) or [state.d1]:
+            for m2 in state.moves(1) or [state.d2]:
+                state.apply(m1, m2)
+                nodes += 1 + search(depth - 1)
+                state.undo()
+        return nodes
+
+    def run():
+        start = time.perf_counter()
+        nodes = search(depth)
+        return nodes / (time.perf_counter() - start)
+    return {"search_nodes_per_sec_40x30": measure(run, repeat)}
+
+def bench_agent(calls, updates, repeat):
+    try:
+        from dqn_agent import DQNAgent
+    except ImportError as e:
+        print(f"Skipping agent benchmarks: {e}")
+        return {}
+    np.random.seed(0)
+    random.seed(0)
+    agent = DQNAgent(4, 2)
+    agent.epsilon = 0.0
+    state = np.random.rand(1, 4).astype(np.float32)
+    for _ in range(500):
+        agent.remember(np.random.rand(1, 4), random.randrange(2), 1.0, np.random.rand(1, 4), False)
+    agent.act(state)
+    agent.replay(32)
+
+    def run_act():
+        start = time.perf_counter()
+        for _ in range(calls):
+            agent.act(state)
+        return (time.perf_counter() - start) / calls * 1e3
+
+    def run_replay():
+        start = time.perf_counter()
+        for _ in range(updates):
+            agent.replay(32)
+        return updates / (time.perf_counter() - start)
+    return {"agent_act_ms": measure(run_act, repeat),
+            "agent_replay_updates_per_sec": measure(run_replay, repeat)}
+
+def lower_is_better(metric):
+    return metric.endswith("_ms")
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with a baseline run.
+    :param threshold: Allowed relative slowdown before a metric counts as a regression
+    :return: List of (metric, baseline value, new value, relative change) for regressions
+    """
+    regressions = []
+    for metric, value in results["metrics"].items():
+        old = baseline["metrics"].get(metric)
+        if not old:
+            continue
+        # Positive change always means slower
+        change = (value - old) / old if lower_is_better(metric) else (old - value) / old
+        status = "REGRESSION" if change > threshold else "ok"
+        print(f"{metric:>40}: {old:12.3f} -> {value:12.3f} ({-change:+.1%}) {status}")
+        if change > threshold:
+            regressions.append((metric, old, value, change))
+    return regressions
+
+def run(groups, quick):
+    scale = 0.1 if quick else 1.0
+    repeat = 3 if quick else 5
+    random.seed(0)
+    np.random.seed(0)
+    metrics = {}
+    if "engine" in groups:
+        metrics.update(bench_engine([(40, 30), (200, 200), (1000, 1000)], int(20000 * scale), repeat))
+    if "draw" in groups:
+        metrics.update(bench_draw(int(50 * scale) or 1, repeat))
+    if "encoder" in groups:
+        metrics.update(bench_encoder(int(20000 * scale), repeat))
+    if "search" in groups:
+        metrics.update(bench_search(4 if quick else 6, repeat))
+    if "agent" in groups:
+        metrics.update(bench_agent(int(100 * scale) or 1, int(50 * scale) or 1, repeat))
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "processor": platform.processor(), "cpus": os.cpu_count(),
+                    "numpy": np.__version__},
+        "quick": quick,
+        "metrics": metrics,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Tron bot speed benchmarks")
+    parser.add_argument("--groups", default="engine,draw,encoder,search,agent",
+                        help="Comma separated list of engine, draw, encoder, search, agent")
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations, for smoke runs")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Also store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Relative slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    results = run(args.groups.split(","), args.quick)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    for metric, value in results["metrics"].items():
+        print(f"{metric:>40}: {value:12.3f}")
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nComparing with baseline from {baseline['created']}")
+        regressions = compare(results, baseline, args.threshold)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,18 @@
 import pygame
 from pygame.locals import *
 from GameObjects import Snake
+import numpy as np
+import random
 import time
 
+def game_rngs(seed, count=2):
+    # Independent random streams per snake derived from the game seed, as in week5's game_record
+    return [random.Random(int(child.generate_state(1)[0]))
+            for child in np.random.SeedSequence(seed).spawn(count)]
+
 class Game:
-    def __init__(self, show):
+    def __init__(self, show, seed=None):
+        # seed: the same seed gives the same start cells; None picks a fresh one
         pygame.init()
         self.HEIGHT_GRID = 40
         self.WIDTH_GRID = 40
@@ -12,8 +20,9 @@ class Game:
         self.HEIGHT = self.HEIGHT_GRID * self.TILE_SIZE
         self.WIDTH = self.WIDTH_GRID * self.TILE_SIZE
         self.surface = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
-        self.snake1 = Snake(self.surface, self.WIDTH_GRID, self.HEIGHT_GRID, self.TILE_SIZE, (255, 0, 0))
-        self.snake2 = Snake(self.surface, self.WIDTH_GRID, self.HEIGHT_GRID, self.TILE_SIZE, (0, 0, 255))
+        rng1, rng2 = game_rngs(seed)
+        self.snake1 = Snake(self.surface, self.WIDTH_GRID, self.HEIGHT_GRID, self.TILE_SIZE, (255, 0, 0), rng1)
+        self.snake2 = Snake(self.surface, self.WIDTH_GRID, self.HEIGHT_GRID, self.TILE_SIZE, (0, 0, 255), rng2)
         self.clock = pygame.time.Clock()
         self.directions1 = {
             K_UP: (0, -1),
@@ -2,12 +2,13 @@ import pygame
 import random
 
 class Snake:
-    def __init__(self, parent_screen, parent_width, parent_height, tile_size, color):
+    def __init__(self, parent_screen, parent_width, parent_height, tile_size, color, rng=random):
+        # rng: random.Random for the starting cell; the global random module by default
         self.parent_screen = parent_screen
         self.tile_size = tile_size
         self.color = color
-        cords = (random.randint(0, parent_width - 1) * tile_size, 
-                 random.randint(0, parent_height - 1) * tile_size)
+        cords = (rng.randint(0, parent_width - 1) * tile_size, 
+                 rng.randint(0, parent_height - 1) * tile_size)
         self.cords = [list(cords)]
         self.cords_set = {cords}
         self.direction = [1, 0]
@@ -0,0 +1,16 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+from Game import Game
+
+def start_cells(game):
+    return game.snake1.cords[0], game.snake2.cords[0]
+
+def test_seed_gives_same_start_cells():
+    first, second = start_cells(Game(False, seed=7)), start_cells(Game(False, seed=7))
+    assert first == second, "Same seed should give the same start cells"
+    others = {tuple(map(tuple, start_cells(Game(False, seed=seed)))) for seed in range(8)}
+    assert len(others) > 1, "Different seeds should give different start cells"
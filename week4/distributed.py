@@ -0,0 +1,223 @@
+# distributed.py
+# Ape-X style training on one machine: actor processes play with a NumPy copy of the
+# policy, a replay process stores their transitions, and the learner (the main process,
+# the only one that imports TensorFlow) trains and broadcasts weights through shared memory.
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import time
+import numpy as np
+from cart_pole_env import create_env
+from train_profiler import PROFILER
+import perf_config
+
+def actor_epsilons(num_actors, base=0.4, alpha=7.0):
+    # Each actor explores at a fixed rate, from base down to base ** (1 + alpha)
+    if num_actors == 1:
+        return [base]
+    return [base ** (1 + alpha * i / (num_actors - 1)) for i in range(num_actors)]
+
+def numpy_forward(weights, state):
+    # Same network as DQNAgent._build_model: relu hidden layers, linear output
+    x = state
+    for i in range(0, len(weights) - 2, 2):
+        x = np.maximum(x @ weights[i] + weights[i + 1], 0)
+    return x @ weights[-2] + weights[-1]
+
+class SharedWeights:
+    def __init__(self, shapes, ctx=mp):
+        """
+        Policy weights in shared memory, written by the learner and polled by actors.
+        :param shapes: Shape of each array in model.get_weights()
+        :param ctx: Multiprocessing context the actors will be started from
+        """
+        self.shapes = [tuple(shape) for shape in shapes]
+        self.buffer = ctx.Array('f', int(sum(np.prod(shape) for shape in self.shapes)))
+        self.version = ctx.Value('i', 0, lock=False)
+
+    def publish(self, weights):
+        with self.buffer.get_lock():
+            flat = np.frombuffer(self.buffer.get_obj(), dtype=np.float32)
+            flat[:] = np.concatenate([np.ravel(w) for w in weights])
+            self.version.value += 1
+
+    def read(self):
+        with self.buffer.get_lock():
+            flat = np.frombuffer(self.buffer.get_obj(), dtype=np.float32).copy()
+            version = self.version.value
+        weights = []
+        offset = 0
+        for shape in self.shapes:
+            size = int(np.prod(shape))
+            weights.append(flat[offset:offset + size].reshape(shape))
+            offset += size
+        return version, weights
+
+def actor_process(actor_id, epsilon, shared_weights, transition_queue, score_queue, stop_event,
+                  env_fn=create_env, send_every=64, sync_every=400):
+    """
+    Play episodes with a locally cached policy and ship transitions in batches.
+    :param send_every: Number of transitions per message to the replay process
+    :param sync_every: Number of steps between checks for newer learner weights
+    """
+    env = env_fn()
+    rng = np.random.default_rng(actor_id)
+    action_size = env.action_space.n
+    version, weights = shared_weights.read()
+    outbox = []
+    steps = 0
+    while not stop_event.is_set():
+        state, _ = env.reset(seed=int(rng.integers(2 ** 31)))
+        state = np.asarray(state, dtype=np.float32)
+        total_reward = 0
+        done = False
+        while not done and not stop_event.is_set():
+            if rng.random() <= epsilon:
+                action = int(rng.integers(action_size))
+            else:
+                action = int(np.argmax(numpy_forward(weights, state)))
+            next_state, reward, terminated, truncated, _ = env.step(action)
+            next_state = np.asarray(next_state, dtype=np.float32)
+            done = terminated or truncated
+            total_reward += reward
+            reward = reward if not done else -10
+            outbox.append((state, action, reward, next_state, done))
+            state = next_state
+            steps += 1
+
+            if len(outbox) >= send_every:
+                transition_queue.put(_pack(outbox))
+                outbox = []
+            if steps % sync_every == 0 and shared_weights.version.value != version:
+                version, weights = shared_weights.read()
+        score_queue.put((actor_id, total_reward))
+    env.close()
+
+def _pack(transitions):
+    states, actions, rewards, next_states, dones = zip(*transitions)
+    return (np.stack(states), np.array(actions, dtype=np.int64), np.array(rewards, dtype=np.float32),
+            np.stack(next_states), np.array(dones, dtype=np.float32))
+
+def replay_process(state_size, capacity, transition_queue, sample_conn, stop_event, seed=0,
+                   drain_limit=16):
+    """
+    Central replay memory: a ring of preallocated arrays filled from the actors' queue,
+    sampled on request from the learner over a pipe.
+    """
+    rng = np.random.default_rng(seed)
+    states = np.zeros((capacity, state_size), dtype=np.float32)
+    next_states = np.zeros((capacity, state_size), dtype=np.float32)
+    actions = np.zeros(capacity, dtype=np.int64)
+    rewards = np.zeros(capacity, dtype=np.float32)
+    dones = np.zeros(capacity, dtype=np.float32)
+    position = 0
+    size = 0
+    while not stop_event.is_set():
+        # Take a bounded number of actor messages so sample requests are never starved
+        try:
+            for _ in range(drain_limit):
+                batch = transition_queue.get(timeout=0.001 if size else 0.05)
+                n = len(batch[1])
+                idx = (position + np.arange(n)) % capacity
+                for store, values in zip((states, actions, rewards, next_states, dones), batch):
+                    store[idx] = values
+                position = (position + n) % capacity
+                size = min(size + n, capacity)
+        except queue.Empty:
+            pass
+
+        if sample_conn.poll():
+            batch_size = sample_conn.recv()
+            if batch_size is None:
+                break
+            if size < batch_size:
+                sample_conn.send(None)
+            else:
+                idx = rng.integers(0, size, batch_size)
+                sample_conn.send((states[idx], actions[idx], rewards[idx], next_states[idx], dones[idx]))
+
+def train(num_actors=4, updates=5000, batch_size=32, capacity=100000, broadcast_every=50,
+          target_every=500, log_every=100, jit_compile=False, stats=None):
+    """
+    Run actors and the replay process in child processes and the learner here.
+    :param jit_compile: Compile the learner's train step with XLA
+    :param stats: Optional dict that receives the number of updates, finished actor
+                  episodes and the last published weights version
+    :return: The trained DQNAgent
+    """
+    # Spawned children only import this module (NumPy + gym), never TensorFlow
+    ctx = mp.get_context("spawn")
+    from dqn_agent import DQNAgent
+
+    env = create_env()
+    state_size = env.observation_space.shape[0]
+    action_size = env.action_space.n
+    env.close()
+    agent = DQNAgent(state_size, action_size, jit_compile=jit_compile)
+
+    stop_event = ctx.Event()
+    transition_queue = ctx.Queue(maxsize=num_actors * 64)
+    score_queue = ctx.Queue()
+    learner_conn, sample_conn = ctx.Pipe()
+    shared_weights = SharedWeights([w.shape for w in agent.model.get_weights()], ctx)
+    shared_weights.publish(agent.model.get_weights())
+
+    workers = [ctx.Process(target=replay_process,
+                           args=(state_size, capacity, transition_queue, sample_conn, stop_event))]
+    for actor_id, epsilon in enumerate(actor_epsilons(num_actors)):
+        workers.append(ctx.Process(target=actor_process,
+                                   args=(actor_id, epsilon, shared_weights, transition_queue,
+                                         score_queue, stop_event)))
+    for worker in workers:
+        worker.daemon = True
+        worker.start()
+
+    scores = []
+    update = 0
+    start = time.time()
+    try:
+        while update < updates:
+            with PROFILER.timer("replay_sample"):
+                learner_conn.send(batch_size)
+                batch = learner_conn.recv()
+            if batch is None:
+                time.sleep(0.01)
+                continue
+            agent.train_batch(*batch)
+            update += 1
+
+            if update % broadcast_every == 0:
+                shared_weights.publish(agent.model.get_weights())
+            if update % target_every == 0:
+                agent.update_target_model()
+            while not score_queue.empty():
+                scores.append(score_queue.get()[1])
+            if update % log_every == 0:
+                recent = np.mean(scores[-20:]) if scores else 0.0
+                print(f"Update: {update}/{updates}, Episodes: {len(scores)}, "
+                      f"Recent score: {recent:.1f}, Updates/sec: {update / (time.time() - start):.1f}")
+    finally:
+        stop_event.set()
+        learner_conn.send(None)
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        if stats is not None:
+            stats.update(updates=update, episodes=len(scores), weights_version=shared_weights.version.value)
+    return agent
+
+if __name__ == "__main__":
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+    parser = argparse.ArgumentParser(description="Distributed actor/learner DQN on CartPole")
+    parser.add_argument("--actors", type=int, default=4)
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    perf_config.add_arguments(parser)
+    args = parser.parse_args()
+    perf_config.configure_from_args(args)
+    trained = train(num_actors=args.actors, updates=args.updates, batch_size=args.batch_size,
+                    jit_compile=args.jit_compile)
+    trained.save("cartpole-dqn-distributed.weights.h5")
+    print("Training completed.")
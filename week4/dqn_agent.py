@@ -1,19 +1,40 @@
 # dqn_agent.py
 import numpy as np
 import random
-from collections import deque
 import tensorflow as tf
 from keras import models, layers, optimizers
+from train_profiler import PROFILER
+from replay_buffer import ReplayBuffer
 
 class DQNAgent:
-    def __init__(self, state_size, action_size):
+    def __init__(self, state_size, action_size, n_step=1, frame_stack=1, jit_compile=False,
+                 gamma=0.95, epsilon=1.0, epsilon_min=0.01, epsilon_decay=0.995,
+                 learning_rate=0.001, memory_size=2000):
         self.state_size = state_size
+        self.action_size = action_size
+        self.n_step = n_step            # rewards summed before bootstrapping
+        self.frame_stack = frame_stack  # consecutive states fed to the network
+        self.gamma = gamma    # discount rate
+        self.memory = ReplayBuffer(memory_size, state_size, n_step, frame_stack, self.gamma,
+                                   action_size=action_size)
+        self.epsilon = epsilon   # exploration rate, multiplied by epsilon_decay every replay
+        self.epsilon_min = epsilon_min
+        self.epsilon_decay = epsilon_decay
+        self.learning_rate = learning_rate
+        self.model = self._build_model()
+        self.target_model = self._build_model()
+        self.update_target_model()
+        # Target computation and gradient update run as one graph, XLA-compiled if asked
+        self.model.optimizer.build(self.model.trainable_variables)
+        self._train_step = tf.function(self._train_step_eager, jit_compile=jit_compile,
+                                       reduce_retracing=True)
 
     def _build_model(self):
         model = models.Sequential([
-            layers.Dense(24, activation='relu', input_dim=self.state_size),
+            layers.Dense(24, activation='relu', input_dim=self.state_size * self.frame_stack),
             layers.Dense(24, activation='relu'),
-            layers.Dense(self.action_size, activation='linear')
+            # float32 outputs, also under the bfloat16 mixed precision policy
+            layers.Dense(self.action_size, activation='linear', dtype='float32')
         ])
         model.compile(loss='mse', optimizer=optimizers.Adam(learning_rate=self.learning_rate))
         return model
@@ -21,34 +42,96 @@ class DQNAgent:
     def update_target_model(self):
         self.target_model.set_weights(self.model.get_weights())
 
-    def remember(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done))
+    def remember(self, state, action, reward, next_state, done, mask=None):
+        # next_state is the state of the following step, which the memory stores anyway;
+        # mask marks the legal actions in state and is used for the target of earlier steps
+        self.memory.add(state, action, reward, done, mask)
 
-    def act(self, state):
+    def act(self, state, mask=None):
+        # mask: optional bool array of legal actions; illegal ones are never explored or chosen
         if np.random.rand() <= self.epsilon:
-            return random.randrange(self.action_size)
-        act_values = self.model.predict(state, verbose=0)
+            if mask is None:
+                return random.randrange(self.action_size)
+            return int(random.choice(np.flatnonzero(mask)))
+        with PROFILER.timer("inference"):
+            act_values = self.model.predict(self.memory.stack_current(state), verbose=0)
+        if mask is not None:
+            act_values[0, ~np.asarray(mask, dtype=bool)] = -np.inf
         return np.argmax(act_values[0])
 
-    def replay(self, batch_size):
-        minibatch = random.sample(self.memory, batch_size)
-        states = np.array([i[0] for i in minibatch]).reshape(-1, self.state_size)
-        actions = np.array([i[1] for i in minibatch])
-        rewards = np.array([i[2] for i in minibatch])
-        next_states = np.array([i[3] for i in minibatch]).reshape(-1, self.state_size)
-        dones = np.array([i[4] for i in minibatch])
+    def act_batch(self, states, masks=None):
+        """
+        Epsilon-greedy actions for many states at once (e.g. a vectorized env).
+        :param states: (batch, network input size) array
+        :param masks: Optional (batch, action_size) bool array of legal actions
+        :return: Array of actions
+        """
+        states = np.asarray(states, dtype=np.float32)
+        if masks is None:
+            masks = np.ones((len(states), self.action_size), dtype=bool)
+        with PROFILER.timer("inference"):
+            q_values = self.model(states, training=False).numpy()
+        actions = np.argmax(np.where(masks, q_values, -np.inf), axis=1)
+        explore = np.random.rand(len(states)) <= self.epsilon
+        if explore.any():
+            # Uniform among the legal actions of every exploring row
+            noise = np.random.rand(explore.sum(), self.action_size) * masks[explore]
+            actions[explore] = np.argmax(noise, axis=1)
+        return actions
 
-        targets = rewards + self.gamma * np.amax(self.target_model.predict(next_states, verbose=0), axis=1) * (1 - dones)
-        targets_full = self.model.predict(states, verbose=0)
-        targets_full[np.arange(batch_size), actions] = targets
+    def replay(self, batch_size):
+        with PROFILER.timer("replay_sample"):
+            states, actions, returns, next_states, dones, next_masks = self.memory.sample(batch_size, with_masks=True)
 
-        self.model.fit(states, targets_full, epochs=1, verbose=0, batch_size=batch_size)
+        self.train_batch(states, actions, returns, next_states, dones, self.gamma ** self.n_step, next_masks)
 
         if self.epsilon > self.epsilon_min:
             self.epsilon *= self.epsilon_decay
 
+    def train_batch(self, states, actions, rewards, next_states, dones, discount=None, next_masks=None):
+        # discount is gamma ** n for n-step returns, gamma by default; next_masks limits
+        # the target max to the legal actions of the next states
+        if discount is None:
+            discount = self.gamma
+        if next_masks is None:
+            next_masks = np.ones((len(actions), self.action_size), dtype=bool)
+        with PROFILER.timer("gradient_step"):
+            self._train_step(tf.convert_to_tensor(states, tf.float32),
+                             tf.convert_to_tensor(actions, tf.int32),
+                             tf.convert_to_tensor(rewards, tf.float32),
+                             tf.convert_to_tensor(next_states, tf.float32),
+                             tf.convert_to_tensor(dones, tf.float32),
+                             tf.constant(discount, tf.float32),
+                             tf.convert_to_tensor(next_masks, tf.bool))
+
+    def _train_step_eager(self, states, actions, rewards, next_states, dones, discount, next_masks):
+        next_q = self.target_model(next_states, training=False)
+        # Illegal actions get a large negative value rather than -inf, so 0 * value stays 0
+        next_q = tf.where(next_masks, next_q, tf.fill(tf.shape(next_q), -1e9))
+        targets = rewards + discount * tf.reduce_max(next_q, axis=1) * (1 - dones)
+        with tf.GradientTape() as tape:
+            q_values = self.model(states, training=True)
+            chosen = tf.gather(q_values, actions, batch_dims=1)
+            # Same loss as fitting mse on Q-values with only the taken action replaced
+            loss = tf.reduce_sum(tf.square(targets - chosen)) / tf.cast(tf.size(q_values), tf.float32)
+        gradients = tape.gradient(loss, self.model.trainable_variables)
+        self.model.optimizer.apply_gradients(zip(gradients, self.model.trainable_variables))
+        return loss
+
     def load(self, name):
         self.model.load_weights(name)
 
     def save(self, name):
-        self.model.save_weights(name)
\ No newline at end of file
+        self.model.save_weights(name)
+
+    def export_numpy(self, name):
+        # Plain .npz with W0, b0, W1, b1, ... and one activation name per layer,
+        # so inference (week5 PolicyAI) can run without importing TensorFlow
+        arrays = {}
+        activations = []
+        for i, layer in enumerate(self.model.layers):
+            weights, bias = layer.get_weights()
+            arrays[f"W{i}"] = weights.astype(np.float32)
+            arrays[f"b{i}"] = bias.astype(np.float32)
+            activations.append(layer.activation.__name__)
+        np.savez(name, activations=np.array(activations), **arrays)
\ No newline at end of file
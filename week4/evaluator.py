@@ -0,0 +1,162 @@
+# evaluator.py
+# Greedy evaluation in a background process, so training never waits for it. The learner
+# sends weight snapshots; the evaluator plays many headless episodes at once on
+# VecCartPole and sends back score statistics (and optionally a video of one episode).
+import multiprocessing as mp
+import os
+import queue
+import shutil
+import subprocess
+import numpy as np
+from distributed import numpy_forward
+from vec_cart_pole import VecCartPole
+
+def evaluate_policy(weights, episodes=100, max_steps=500, seed=0):
+    """
+    Play one greedy episode in each of `episodes` environments.
+    :param weights: model.get_weights() of a DQNAgent
+    :return: Array with the total reward of every episode
+    """
+    env = VecCartPole(episodes, max_steps, seed)
+    observations = env.reset()
+    scores = np.zeros(episodes)
+    finished = np.zeros(episodes, dtype=bool)
+    while not finished.all():
+        actions = np.argmax(numpy_forward(weights, observations), axis=1)
+        observations, rewards, terminated, truncated, _ = env.step(actions)
+        scores += rewards * ~finished
+        finished |= terminated | truncated
+    return scores
+
+def summarize(tag, scores):
+    p5, p50, p95 = np.percentile(scores, [5, 50, 95])
+    return {"tag": tag, "episodes": len(scores), "mean": float(np.mean(scores)),
+            "p5": float(p5), "p50": float(p50), "p95": float(p95),
+            "min": float(np.min(scores)), "max": float(np.max(scores))}
+
+def find_ffmpeg():
+    # week4 stays independent of week5, so this is its own copy of the lookup
+    path = shutil.which("ffmpeg")
+    if path:
+        return path
+    try:
+        import imageio_ffmpeg
+    except ImportError:
+        raise RuntimeError("ffmpeg not found; install it or the imageio-ffmpeg package")
+    return imageio_ffmpeg.get_ffmpeg_exe()
+
+def record_episode(weights, path, max_steps=500, fps=50, seed=0):
+    """
+    Render one greedy episode off-screen with gym and encode it with ffmpeg.
+    :return: Total reward of the episode
+    """
+    from cart_pole_env import create_env
+
+    env = create_env(render_mode="rgb_array")
+    state, _ = env.reset(seed=seed)
+    frame = env.render()
+    height, width, _ = frame.shape
+    command = [find_ffmpeg(), "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+               "-s", f"{width}x{height}", "-r", str(fps), "-i", "-"]
+    if path.endswith(".mp4"):
+        command += ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p"]
+    process = subprocess.Popen(command + [path], stdin=subprocess.PIPE)
+    total_reward = 0
+    try:
+        for _ in range(max_steps):
+            process.stdin.write(frame.tobytes())
+            action = int(np.argmax(numpy_forward(weights, np.asarray(state, dtype=np.float32))))
+            state, reward, terminated, truncated, _ = env.step(action)
+            total_reward += reward
+            frame = env.render()
+            if terminated or truncated:
+                break
+        process.stdin.write(frame.tobytes())
+    finally:
+        process.stdin.close()
+        process.wait()
+        env.close()
+    if process.returncode != 0:
+        raise RuntimeError("ffmpeg failed to encode the video")
+    return total_reward
+
+def evaluator_process(snapshot_queue, result_queue, episodes, max_steps, video_dir, video_every, seed):
+    evaluations = 0
+    stop = False
+    while not stop:
+        item = snapshot_queue.get()
+        if item is None:
+            break
+        # Skip to the newest snapshot if the learner got ahead; a snapshot queued
+        # before the stop sentinel is still evaluated
+        while True:
+            try:
+                newer = snapshot_queue.get_nowait()
+            except queue.Empty:
+                break
+            if newer is None:
+                stop = True
+                break
+            item = newer
+        tag, weights = item
+        result = summarize(tag, evaluate_policy(weights, episodes, max_steps, seed))
+        if video_dir and video_every and evaluations % video_every == 0:
+            path = os.path.join(video_dir, f"cartpole-eval-{tag}.mp4")
+            try:
+                record_episode(weights, path, max_steps, seed=seed)
+                result["video"] = path
+            except Exception as e:
+                result["video_error"] = str(e)
+        evaluations += 1
+        result_queue.put(result)
+
+class Evaluator:
+    def __init__(self, episodes=100, max_steps=500, video_dir=None, video_every=0, seed=0):
+        """
+        Start the evaluation process.
+        :param episodes: Greedy episodes per snapshot
+        :param max_steps: Episode length limit
+        :param video_dir: Directory for recorded episodes, None for no videos
+        :param video_every: Record a video every this many evaluations
+        :param seed: Seed of the start states, the same for every snapshot
+        """
+        if video_dir:
+            os.makedirs(video_dir, exist_ok=True)
+        # Spawned so the child does not inherit the learner's TensorFlow state
+        ctx = mp.get_context("spawn")
+        self.snapshots = ctx.Queue()
+        self.results = ctx.Queue()
+        self.process = ctx.Process(target=evaluator_process,
+                                   args=(self.snapshots, self.results, episodes, max_steps,
+                                         video_dir, video_every, seed),
+                                   daemon=True)
+        self.process.start()
+
+    def submit(self, tag, weights):
+        """
+        Queue a snapshot without waiting. Snapshots still queued when a newer one
+        arrives are skipped.
+        """
+        self.snapshots.put((tag, [np.asarray(w, dtype=np.float32) for w in weights]))
+
+    def poll(self):
+        """
+        :return: Results that have arrived since the last call, oldest first
+        """
+        results = []
+        while True:
+            try:
+                results.append(self.results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def close(self, timeout=30):
+        """
+        Evaluate the newest snapshot still queued, then stop the process.
+        :return: Results not polled yet
+        """
+        self.snapshots.put(None)
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        return self.poll()
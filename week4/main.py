@@ -1,10 +1,14 @@
 # main.py
+import argparse
 import numpy as np
 from cart_pole_env import create_env
 from dqn_agent import DQNAgent
 import time
 import os
 import tensorflow as tf
+from train_profiler import PROFILER
+from evaluator import Evaluator
+import perf_config
 
 # Suppress TensorFlow warnings
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
@@ -48,12 +52,33 @@ def visualize_agent(env, agent, episode):
     env.close()  # Close the environment after the episode is done
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train a DQN agent on CartPole")
+    parser.add_argument("--eval-every", type=int, default=5, help="Episodes between background evaluations")
+    parser.add_argument("--eval-episodes", type=int, default=100)
+    parser.add_argument("--video-dir", default=None, help="Record an evaluation episode to this directory")
+    parser.add_argument("--video-every", type=int, default=10, help="Evaluations between recorded videos")
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--watch", action="store_true", help="Show the trained agent in a window at the end")
+    perf_config.add_arguments(parser)
+    args = parser.parse_args()
+    perf_config.configure_from_args(args)
+
     env = create_env()
     state_size = env.observation_space.shape[0]
     action_size = env.action_space.n
-    agent = DQNAgent(state_size, action_size)
-    batch_size = 32
-    EPISODES = 1000
+    agent = DQNAgent(state_size, action_size, jit_compile=args.jit_compile)
+    batch_size = args.batch_size
+    EPISODES = args.episodes
+    evaluator = Evaluator(args.eval_episodes, video_dir=args.video_dir, video_every=args.video_every)
+
+    def report(results):
+        for r in results:
+            line = (f"Evaluation after episode {r['tag']}: mean {r['mean']:.1f}, "
+                    f"p5 {r['p5']:.0f}, median {r['p50']:.0f}, p95 {r['p95']:.0f} over {r['episodes']} episodes")
+            if "video" in r:
+                line += f", video {r['video']}"
+            print(line)
 
     for e in range(EPISODES):
         state = env.reset()
@@ -64,7 +89,8 @@ if __name__ == "__main__":
         total_reward = 0
         for cur_time in range(500):
             action = agent.act(state)
-            next_state, reward, done, truncated, _ = env.step(action)
+            with PROFILER.timer("env_step"):
+                next_state, reward, done, truncated, _ = env.step(action)
             done = done or truncated
             reward = reward if not done else -10
             next_state = process_state(next_state)
@@ -80,13 +106,19 @@ if __name__ == "__main__":
         agent.update_target_model()
         print(f"Episode: {e}/{EPISODES}, Score: {cur_time}, Total Reward: {total_reward}, Epsilon: {agent.epsilon:.2f}")
 
-        # Visualize the agent's performance every 5 episodes
-        if e % 5 == 0:
-            vis_env = create_env(render_mode="human")  # Create a new environment for each visualization
-            visualize_agent(vis_env, agent, e)
-            vis_env.close()  # Ensure the environment is closed after visualization
+        # Evaluate in the background; results are printed whenever they arrive
+        if e % args.eval_every == 0:
+            evaluator.submit(e, agent.model.get_weights())
+        report(evaluator.poll())
 
         if e % 50 == 0:
             agent.save(f"cartpole-dqn-{e}.weights.h5")
+            if PROFILER.enabled:
+                PROFILER.export_json(f"cartpole-profile-{e}.json")
 
-    print("Training completed.")
\ No newline at end of file
+    report(evaluator.close())
+    print("Training completed.")
+    if args.watch:
+        vis_env = create_env(render_mode="human")
+        visualize_agent(vis_env, agent, EPISODES)
+        vis_env.close()
\ No newline at end of file
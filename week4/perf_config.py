@@ -0,0 +1,124 @@
+# perf_config.py
+# CPU training settings for TensorFlow: thread pools, XLA, bfloat16 and seeding.
+# configure() has to run before TensorFlow executes any op, so the benchmark below
+# measures every setting in a fresh process.
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+
+def configure(intra_op_threads=0, inter_op_threads=0, mixed_precision=False, seed=None,
+              deterministic=False):
+    """
+    Apply process-wide TensorFlow settings. XLA is enabled per model with
+    DQNAgent(jit_compile=True).
+    :param intra_op_threads: Threads used inside one op, 0 lets TensorFlow decide
+    :param inter_op_threads: Ops run in parallel, 0 lets TensorFlow decide
+    :param mixed_precision: Compute in bfloat16 with float32 weights
+    :param seed: Seed for Python, NumPy and TensorFlow
+    :param deterministic: Make TensorFlow ops deterministic (needs a seed; may be slower)
+    """
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+    import tensorflow as tf
+    import keras
+
+    tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+    keras.mixed_precision.set_global_policy('mixed_bfloat16' if mixed_precision else 'float32')
+    if seed is not None:
+        keras.utils.set_random_seed(seed)
+    if deterministic:
+        if seed is None:
+            raise ValueError("Deterministic ops need a seed")
+        tf.config.experimental.enable_op_determinism()
+
+def add_arguments(parser):
+    # Command line flags shared by the training scripts
+    parser.add_argument("--intra-op-threads", type=int, default=0)
+    parser.add_argument("--inter-op-threads", type=int, default=0)
+    parser.add_argument("--jit-compile", action="store_true", help="Compile the train step with XLA")
+    parser.add_argument("--bfloat16", action="store_true", help="bfloat16 mixed precision")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--deterministic", action="store_true")
+
+def configure_from_args(args):
+    configure(args.intra_op_threads, args.inter_op_threads, args.bfloat16, args.seed, args.deterministic)
+
+def measure_updates(updates=200, batch_size=32, jit_compile=False, state_size=4, action_size=2, seed=0):
+    """
+    Time DQNAgent.train_batch on random data in the already configured process.
+    :return: Updates per second
+    """
+    import numpy as np
+    from dqn_agent import DQNAgent
+
+    rng = np.random.default_rng(seed)
+    agent = DQNAgent(state_size, action_size, jit_compile=jit_compile)
+    batch = (rng.random((batch_size, state_size), dtype=np.float32),
+             rng.integers(0, action_size, batch_size),
+             rng.random(batch_size, dtype=np.float32),
+             rng.random((batch_size, state_size), dtype=np.float32),
+             np.zeros(batch_size, dtype=np.float32))
+    # The first calls trace and compile the step
+    for _ in range(5):
+        agent.train_batch(*batch)
+    start = time.perf_counter()
+    for _ in range(updates):
+        agent.train_batch(*batch)
+    return updates / (time.perf_counter() - start)
+
+def benchmark_settings(threads):
+    return [{"intra_op_threads": t, "inter_op_threads": 1 if t == 1 else 0,
+             "jit_compile": jit, "bfloat16": bf16}
+            for t, jit, bf16 in itertools.product(threads, (False, True), (False, True))]
+
+def run_benchmark(settings, updates=200, batch_size=32):
+    """
+    Measure every setting in its own process.
+    :return: List of settings with "updates_per_sec" added, fastest first
+    """
+    results = []
+    for setting in settings:
+        command = [sys.executable, os.path.abspath(__file__), "--measure", json.dumps(setting),
+                   "--updates", str(updates), "--batch-size", str(batch_size)]
+        output = subprocess.run(command, capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        result = dict(setting)
+        lines = output.stdout.strip().splitlines()
+        if output.returncode == 0 and lines:
+            result["updates_per_sec"] = float(lines[-1])
+        else:
+            result["error"] = output.stderr.strip().splitlines()[-1] if output.stderr.strip() else "failed"
+        results.append(result)
+    return sorted(results, key=lambda r: -r.get("updates_per_sec", 0))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TensorFlow CPU settings for DQN training")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--output", default=None, help="Write the results as JSON")
+    parser.add_argument("--measure", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        setting = json.loads(args.measure)
+        configure(setting["intra_op_threads"], setting["inter_op_threads"], setting["bfloat16"], seed=0)
+        print(measure_updates(args.updates, args.batch_size, setting["jit_compile"]))
+        return
+
+    results = run_benchmark(benchmark_settings(sorted(set(args.threads))), args.updates, args.batch_size)
+    print(f"{'intra':>5} {'inter':>5} {'xla':>5} {'bf16':>5} {'updates/s':>10}")
+    for r in results:
+        speed = f"{r['updates_per_sec']:10.1f}" if "updates_per_sec" in r else f"  {r['error']}"
+        print(f"{r['intra_op_threads']:>5} {r['inter_op_threads']:>5} {str(r['jit_compile']):>5} "
+              f"{str(r['bfloat16']):>5} {speed}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# replay_buffer.py
+import numpy as np
+
+class ReplayBuffer:
+    def __init__(self, capacity, state_size, n_step=1, frame_stack=1, gamma=0.95, seed=None,
+                 action_size=None):
+        """
+        Replay memory with n-step returns and frame stacking. Every step is stored once,
+        in preallocated ring arrays; stacked states and n-step returns are built from
+        indices when a batch is sampled, so no state is ever stored twice.
+        :param capacity: Number of steps kept
+        :param state_size: Size of one (unstacked) state
+        :param n_step: Number of rewards summed before bootstrapping
+        :param frame_stack: Number of consecutive states that make one network input
+        :param gamma: Discount rate for the n-step return
+        :param action_size: Number of actions, to also store a legal-move mask per step
+        """
+        self.capacity = capacity
+        self.state_size = state_size
+        self.n_step = n_step
+        self.frame_stack = frame_stack
+        self.gamma = gamma
+        self.rng = np.random.default_rng(seed)
+        self.states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.masks = None if action_size is None else np.ones((capacity, action_size), dtype=bool)
+        self.episodes = np.zeros(capacity, dtype=np.int64)
+        # Step number held by every slot, -1 when empty; tells overwritten slots apart
+        self.steps = np.full(capacity, -1, dtype=np.int64)
+        self.total = 0
+        self.episode = 0
+        self.discounts = gamma ** np.arange(n_step, dtype=np.float32)
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def add(self, state, action, reward, done, mask=None):
+        """
+        Store one step. The next state is not stored: it is the state of the following
+        step, so every episode has to end with done=True.
+        :param mask: Legal actions in state, all allowed if None
+        """
+        slot = self.total % self.capacity
+        self.states[slot] = np.ravel(state)
+        self.actions[slot] = action
+        self.rewards[slot] = reward
+        self.dones[slot] = done
+        self.episodes[slot] = self.episode
+        self.steps[slot] = self.total
+        if self.masks is not None:
+            self.masks[slot] = True if mask is None else mask
+        self.total += 1
+        if done:
+            self.episode += 1
+
+    def _written(self, steps):
+        return (steps >= 0) & (self.steps[steps % self.capacity] == steps)
+
+    def _stack(self, steps):
+        """
+        :param steps: (batch,) step numbers
+        :return: (batch, frame_stack * state_size) stacked states, oldest first; frames
+                 from before the start of the episode repeat its first state
+        """
+        frames = np.empty((len(steps), self.frame_stack), dtype=np.int64)
+        frames[:, -1] = steps
+        episode = self.episodes[steps % self.capacity]
+        for back in range(1, self.frame_stack):
+            previous = steps - back
+            same = self._written(previous) & (self.episodes[previous % self.capacity] == episode)
+            frames[:, -1 - back] = np.where(same, previous, frames[:, -back])
+        return self.states[frames % self.capacity].reshape(len(steps), -1)
+
+    def stack_current(self, state):
+        """
+        Stacked network input for the state an action is about to be chosen in,
+        using the states stored so far in the current episode.
+        :return: Array of shape (1, frame_stack * state_size)
+        """
+        if self.frame_stack == 1:
+            return np.reshape(state, (1, -1))
+        frames = [np.ravel(state)]
+        step = self.total - 1
+        while len(frames) < self.frame_stack:
+            if self._written(np.array([step]))[0] and self.episodes[step % self.capacity] == self.episode:
+                frames.insert(0, self.states[step % self.capacity])
+                step -= 1
+            else:
+                frames.insert(0, frames[0])
+        return np.concatenate(frames)[None, :].astype(np.float32)
+
+    def _returns(self, steps):
+        """
+        :return: (returns, bootstrap, valid) for transitions starting at steps; bootstrap
+                 is False when the episode ends within n steps
+        """
+        ahead = steps[:, None] + np.arange(self.n_step + 1)
+        written = self._written(ahead)
+        slots = ahead % self.capacity
+        dones = self.dones[slots[:, :-1]] & written[:, :-1]
+        # A reward counts while no earlier step of the window ended the episode
+        running = np.ones_like(dones)
+        running[:, 1:] = ~np.cumsum(dones, axis=1)[:, :-1].astype(bool)
+        returns = (self.rewards[slots[:, :-1]] * self.discounts * running).sum(axis=1)
+        bootstrap = ~dones.any(axis=1)
+        valid = (written[:, :-1] | ~running).all(axis=1) & (written[:, -1] | ~bootstrap)
+        return returns, bootstrap, valid
+
+    def sample(self, batch_size, with_masks=False):
+        """
+        :param with_masks: Also return the legal-move masks of the next states
+        :return: states, actions, n-step returns, states n steps later and dones, in the
+                 layout of DQNAgent.train_batch; bootstrap with gamma ** n_step
+        """
+        if len(self) == 0:
+            raise ValueError("The replay buffer is empty")
+        oldest = self.total - len(self)
+        steps = self.rng.integers(oldest, self.total, batch_size)
+        returns, bootstrap, valid = self._returns(steps)
+        # Redraw transitions whose n-step window is not fully stored yet
+        for _ in range(100):
+            if valid.all():
+                break
+            redraw = np.flatnonzero(~valid)
+            steps[redraw] = self.rng.integers(oldest, self.total, len(redraw))
+            returns[redraw], bootstrap[redraw], valid[redraw] = self._returns(steps[redraw])
+        else:
+            raise ValueError("Not enough complete transitions in the replay buffer")
+
+        next_steps = np.where(bootstrap, steps + self.n_step, steps)
+        batch = (self._stack(steps), self.actions[steps % self.capacity], returns,
+                 self._stack(next_steps), (~bootstrap).astype(np.float32))
+        if with_masks:
+            if self.masks is None:
+                raise ValueError("The buffer was created without action_size")
+            batch += (self.masks[next_steps % self.capacity],)
+        return batch
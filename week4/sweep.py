@@ -0,0 +1,194 @@
+# sweep.py
+# Hyperparameter sweep for DQNAgent on VecCartPole. Trials run in a pool of worker
+# processes, each with a fixed TensorFlow thread count (and optionally pinned to its own
+# cores), and are pruned with successive halving: every rung trains the surviving trials
+# with eta times more steps and keeps the best 1/eta. Every finished trial is appended
+# to a JSONL log, and a restarted sweep with the same log and seed skips what is in it.
+import argparse
+import json
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+SEARCH_SPACE = {
+    "gamma": [0.9, 0.95, 0.99],
+    "learning_rate": ("log", 1e-4, 1e-2),
+    "batch_size": [32, 64, 128],
+    "epsilon_decay": [0.99, 0.995, 0.999],
+    "epsilon_min": [0.01, 0.05],
+    "memory_size": [2000, 10000, 50000],
+}
+# Keys of a config passed on to the DQNAgent constructor
+AGENT_PARAMS = ("gamma", "learning_rate", "epsilon", "epsilon_decay", "epsilon_min", "memory_size")
+
+def sample_configs(count, space=None, seed=0):
+    """
+    :param space: Dict of name -> list of choices, or ("log", low, high) for a
+                  log-uniform float; SEARCH_SPACE by default
+    :return: List of count config dicts
+    """
+    space = SEARCH_SPACE if space is None else space
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(count):
+        config = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                _, low, high = values
+                config[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+            else:
+                config[name] = values[int(rng.integers(len(values)))]
+        configs.append(config)
+    return configs
+
+def train_trial(config, steps, seed=0, eval_episodes=50):
+    """
+    Train a DQNAgent for a number of environment steps, one update per step and a
+    target update per episode as in main.py, then evaluate it greedily.
+    :return: Mean evaluation score
+    """
+    import keras
+    from dqn_agent import DQNAgent
+    from evaluator import evaluate_policy
+    from vec_cart_pole import VecCartPole
+
+    keras.utils.set_random_seed(seed)
+    env = VecCartPole(1, seed=seed)
+    agent = DQNAgent(env.state_size, env.action_size,
+                     **{name: config[name] for name in AGENT_PARAMS if name in config})
+    batch_size = config.get("batch_size", 32)
+    state = env.reset()
+    for _ in range(steps):
+        action = agent.act_batch(state)
+        next_state, reward, terminated, truncated, _ = env.step(action)
+        done = bool(terminated[0] or truncated[0])
+        agent.remember(state[0], action[0], -10 if done else reward[0], None, done)
+        if done:
+            agent.update_target_model()
+        elif len(agent.memory) > batch_size:
+            agent.replay(batch_size)
+        state = next_state
+    return float(np.mean(evaluate_policy(agent.model.get_weights(), eval_episodes, seed=seed + 1)))
+
+def _timed(objective, config, steps, seed):
+    start = time.perf_counter()
+    score = objective(config, steps, seed)
+    return score, time.perf_counter() - start
+
+def _init_worker(threads, cores):
+    # Runs once per worker process, before TensorFlow executes any op
+    if cores is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores.get())
+    import perf_config
+    perf_config.configure(threads, 1)
+
+def make_pool(workers, threads=1, pin=False):
+    """
+    Process pool for trials; every worker uses threads TensorFlow threads.
+    :param pin: Pin every worker to its own threads CPUs (Linux only)
+    """
+    ctx = mp.get_context("spawn")
+    cores = None
+    if pin:
+        if not hasattr(os, "sched_getaffinity"):
+            raise RuntimeError("Pinning workers to CPUs needs os.sched_getaffinity (Linux only)")
+        available = sorted(os.sched_getaffinity(0))
+        cores = ctx.Queue()
+        for i in range(workers):
+            cores.put({available[(i * threads + j) % len(available)] for j in range(threads)})
+    return ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker,
+                               initargs=(threads, cores))
+
+def read_log(path):
+    """
+    :return: Dict of (trial, steps) -> log entry of every trial in a sweep log
+    """
+    entries = {}
+    if path is not None and os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    entries[(entry["trial"], entry["steps"])] = entry
+    return entries
+
+def successive_halving(configs, min_steps, eta=3, rungs=3, objective=train_trial, pool=None,
+                       log_path=None, seed=0):
+    """
+    Train all configs for min_steps, keep the best 1/eta, train those for eta times as
+    many steps (from scratch), and so on for rungs rounds.
+    :param objective: Callable (config, steps, seed) -> score, higher is better
+    :param pool: Executor for the trials; they run in this process if None
+    :param log_path: JSONL file every finished trial is appended to; trials already in
+                     it with the same config are not run again
+    :return: List of (trial, config, score at the last rung it reached), best first
+    """
+    done = read_log(log_path)
+    alive = list(range(len(configs)))
+    reached = {}
+    for rung in range(rungs):
+        steps = min_steps * eta ** rung
+        scores = {}
+        pending = []
+        for trial in alive:
+            entry = done.get((trial, steps))
+            if entry is not None and entry["config"] == configs[trial]:
+                scores[trial] = entry["score"]
+            else:
+                pending.append(trial)
+
+        if pool is None:
+            results = ((trial, _timed(objective, configs[trial], steps, seed + trial)) for trial in pending)
+        else:
+            futures = {pool.submit(_timed, objective, configs[trial], steps, seed + trial): trial
+                       for trial in pending}
+            results = ((futures[future], future.result()) for future in as_completed(futures))
+        for trial, (score, seconds) in results:
+            scores[trial] = score
+            if log_path is not None:
+                with open(log_path, "a") as f:
+                    f.write(json.dumps({"trial": trial, "rung": rung, "steps": steps, "score": score,
+                                        "seconds": round(seconds, 3), "config": configs[trial]}) + "\n")
+
+        alive = sorted(alive, key=lambda trial: -scores[trial])
+        for trial in alive:
+            reached[trial] = (rung, scores[trial])
+        if rung < rungs - 1:
+            alive = alive[:max(1, len(alive) // eta)]
+    # Trials that got further rank first
+    ranking = sorted(reached, key=lambda trial: (-reached[trial][0], -reached[trial][1]))
+    return [(trial, configs[trial], reached[trial][1]) for trial in ranking]
+
+def main():
+    parser = argparse.ArgumentParser(description="Successive-halving hyperparameter sweep for DQNAgent")
+    parser.add_argument("--trials", type=int, default=27)
+    parser.add_argument("--min-steps", type=int, default=2000, help="Environment steps per trial in the first rung")
+    parser.add_argument("--eta", type=int, default=3, help="Keep 1/eta of the trials per rung")
+    parser.add_argument("--rungs", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=1, help="TensorFlow threads per worker")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes, CPUs / threads by default")
+    parser.add_argument("--pin", action="store_true", help="Pin every worker to its own CPUs")
+    parser.add_argument("--log", default="sweep.jsonl")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    workers = args.workers or max(1, cpus // args.threads)
+    configs = sample_configs(args.trials, seed=args.seed)
+    total, alive = 0, args.trials
+    for rung in range(args.rungs):
+        total += alive * args.min_steps * args.eta ** rung
+        alive = max(1, alive // args.eta)
+    print(f"{args.trials} trials on {workers} workers, at most {total} environment steps")
+    start = time.perf_counter()
+    with make_pool(workers, args.threads, args.pin) as pool:
+        ranking = successive_halving(configs, args.min_steps, args.eta, args.rungs, pool=pool,
+                                     log_path=args.log, seed=args.seed)
+    print(f"Finished in {time.perf_counter() - start:.0f}s, results in {args.log}")
+    for trial, config, score in ranking[:5]:
+        print(f"trial {trial:3d} score {score:7.1f} {json.dumps(config)}")
+
+if __name__ == "__main__":
+    main()
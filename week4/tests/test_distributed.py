@@ -0,0 +1,74 @@
+import os
+import sys
+import queue
+import threading
+import multiprocessing as mp
+import numpy as np
+import pytest
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from distributed import SharedWeights, _pack, actor_epsilons, numpy_forward, replay_process, train
+
+def test_shared_weights_round_trip():
+    rng = np.random.default_rng(0)
+    weights = [rng.random((4, 3), dtype=np.float32), rng.random(3, dtype=np.float32),
+               rng.random((3, 2), dtype=np.float32), rng.random(2, dtype=np.float32)]
+    shared = SharedWeights([w.shape for w in weights])
+    assert shared.read()[0] == 0, "Nothing published yet"
+    shared.publish(weights)
+    version, read = shared.read()
+    assert version == 1
+    assert all(np.array_equal(a, b) for a, b in zip(weights, read)), "Weights should round-trip"
+    shared.publish([w * 2 for w in weights])
+    version, read = shared.read()
+    assert version == 2 and np.array_equal(read[0], weights[0] * 2)
+    state = rng.random((5, 4), dtype=np.float32)
+    assert np.allclose(numpy_forward(read, state), numpy_forward([w * 2 for w in weights], state))
+
+def test_actor_epsilons():
+    assert actor_epsilons(1) == [0.4]
+    epsilons = actor_epsilons(8)
+    assert len(epsilons) == 8
+    assert epsilons[0] == pytest.approx(0.4) and epsilons[-1] == pytest.approx(0.4 ** 8)
+    assert all(a > b for a, b in zip(epsilons, epsilons[1:])), "Exploration should decrease per actor"
+
+def test_replay_process_protocol():
+    transitions = queue.Queue()
+    learner_conn, sample_conn = mp.Pipe()
+    stop = threading.Event()
+    worker = threading.Thread(target=replay_process, args=(4, 100, transitions, sample_conn, stop))
+    worker.start()
+    try:
+        learner_conn.send(8)
+        assert learner_conn.recv() is None, "An empty memory should answer None"
+
+        outbox = [(np.full(4, i, dtype=np.float32), i % 2, float(i), np.full(4, i + 1, dtype=np.float32), i == 9)
+                  for i in range(10)]
+        transitions.put(_pack(outbox))
+        batch = None
+        for _ in range(100):
+            learner_conn.send(8)
+            batch = learner_conn.recv()
+            if batch is not None:
+                break
+        states, actions, rewards, next_states, dones = batch
+        assert states.shape == (8, 4) and next_states.shape == (8, 4) and actions.shape == (8,)
+        # Every sampled row is one of the stored transitions
+        assert (states[:, 0] == rewards).all() and (next_states[:, 0] == rewards + 1).all()
+        assert (actions == rewards.astype(np.int64) % 2).all()
+        assert (dones == (rewards == 9)).all()
+    finally:
+        learner_conn.send(None)
+        worker.join(timeout=5)
+    assert not worker.is_alive(), "None should stop the replay process"
+
+def test_train_smoke():
+    pytest.importorskip("tensorflow")
+    stats = {}
+    agent = train(num_actors=2, updates=60, batch_size=16, capacity=5000, broadcast_every=20,
+                  target_every=30, log_every=1000, stats=stats)
+    assert stats["updates"] == 60, "Training needs transitions from the actors"
+    assert stats["weights_version"] == 1 + 60 // 20, "Weights should be broadcast during training"
+    assert stats["episodes"] > 0, "Actors should report finished episodes"
+    assert len(agent.model.get_weights()) == 6
@@ -0,0 +1,49 @@
+import os
+import sys
+import numpy as np
+import pytest
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+pytest.importorskip("tensorflow")
+from dqn_agent import DQNAgent
+
+@pytest.fixture(scope="module")
+def agent():
+    return DQNAgent(4, 3)
+
+def test_masked_act(agent):
+    state = np.random.rand(1, 4)
+    mask = np.array([False, True, False])
+    for epsilon in (1.0, 0.0):
+        agent.epsilon = epsilon
+        assert all(agent.act(state, mask) == 1 for _ in range(20)), "Illegal action chosen"
+
+def test_masked_act_batch(agent):
+    states = np.random.rand(64, 4).astype(np.float32)
+    masks = np.random.rand(64, 3) < 0.5
+    masks[np.arange(64), np.random.randint(0, 3, 64)] = True
+    for epsilon in (1.0, 0.0):
+        agent.epsilon = epsilon
+        actions = agent.act_batch(states, masks)
+        assert masks[np.arange(64), actions].all(), "Illegal action chosen"
+    agent.epsilon = 0.0
+    q_values = agent.model(states, training=False).numpy()
+    assert (agent.act_batch(states) == q_values.argmax(axis=1)).all()
+
+def test_masked_target(agent):
+    states = np.random.rand(8, 4).astype(np.float32)
+    next_states = np.random.rand(8, 4).astype(np.float32)
+    actions = np.zeros(8, dtype=np.int64)
+    rewards = np.zeros(8, dtype=np.float32)
+    dones = np.zeros(8, dtype=np.float32)
+    masks = np.zeros((8, 3), dtype=bool)
+    masks[:, 2] = True
+    agent.update_target_model()
+    before = agent.model(states, training=False).numpy()[:, 0]
+    # Targets are gamma * Q_target(next, 2); fitting towards them moves Q(s, 0) accordingly
+    target = agent.gamma * agent.target_model(next_states, training=False).numpy()[:, 2]
+    for _ in range(300):
+        agent.train_batch(states, actions, rewards, next_states, dones, next_masks=masks)
+    after = agent.model(states, training=False).numpy()[:, 0]
+    assert np.abs(after - target).mean() < np.abs(before - target).mean() / 2
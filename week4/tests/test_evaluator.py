@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+import numpy as np
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from evaluator import Evaluator, evaluate_policy, summarize
+
+def balancing_weights():
+    # Push towards the side the pole is falling to: hidden units relu(s) and relu(-s)
+    # with s = theta + theta_dot; output 0 (left) gets relu(-s), output 1 (right) relu(s)
+    signal = np.array([[0, 0], [0, 0], [1, -1], [1, -1]], dtype=np.float32)
+    return [signal, np.zeros(2, dtype=np.float32),
+            np.array([[0, 1], [1, 0]], dtype=np.float32), np.zeros(2, dtype=np.float32)]
+
+def left_weights():
+    return [np.zeros((4, 2), dtype=np.float32), np.zeros(2, dtype=np.float32),
+            np.zeros((2, 2), dtype=np.float32), np.array([1, 0], dtype=np.float32)]
+
+def test_evaluate_policy():
+    good = evaluate_policy(balancing_weights(), episodes=32, max_steps=200)
+    bad = evaluate_policy(left_weights(), episodes=32, max_steps=200)
+    assert good.shape == (32,) and (good <= 200).all()
+    assert bad.max() < 20, "Always pushing left should fail quickly"
+    assert good.mean() > 5 * bad.mean(), "Balancing policy should last much longer"
+    assert np.array_equal(good, evaluate_policy(balancing_weights(), episodes=32, max_steps=200)), \
+        "Evaluation with the same seed should be reproducible"
+
+def test_summarize():
+    result = summarize(3, np.arange(1, 101))
+    assert result["tag"] == 3 and result["mean"] == 50.5 and result["min"] == 1 and result["max"] == 100
+
+def test_background_evaluator():
+    evaluator = Evaluator(episodes=16, max_steps=100)
+    start = time.perf_counter()
+    evaluator.submit(0, left_weights())
+    evaluator.submit(1, balancing_weights())
+    assert time.perf_counter() - start < 0.5, "submit should not wait for the evaluation"
+    results = []
+    deadline = time.time() + 60
+    while not results and time.time() < deadline:
+        results += evaluator.poll()
+        time.sleep(0.05)
+    results += evaluator.close()
+    assert results, "No evaluation results arrived"
+    assert results[-1]["tag"] == 1, "The newest snapshot should always be evaluated"
+    assert not evaluator.process.is_alive()
+
+def test_close_evaluates_queued_snapshot():
+    evaluator = Evaluator(episodes=4, max_steps=50)
+    evaluator.submit("final", balancing_weights())
+    results = evaluator.close(timeout=60)
+    assert [r["tag"] for r in results] == ["final"], "The last snapshot should be evaluated before stopping"
@@ -0,0 +1,84 @@
+import os
+import sys
+import numpy as np
+import pytest
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from replay_buffer import ReplayBuffer
+
+def fill(buffer, episode_lengths):
+    # State of step t is [t, -t]; reward of step t is t
+    t = 0
+    for length in episode_lengths:
+        for i in range(length):
+            buffer.add([t, -t], t % 2, float(t), i == length - 1)
+            t += 1
+    return t
+
+def reference_return(t, lengths, n, gamma):
+    ends = np.cumsum(lengths) - 1
+    end = ends[np.searchsorted(ends, t)]
+    steps = range(t, min(t + n, end + 1))
+    total = sum(gamma ** (s - t) * s for s in steps)
+    return total, t + n > end
+
+def test_n_step_returns():
+    lengths = [5, 3, 9, 2, 7]
+    buffer = ReplayBuffer(100, 2, n_step=3, gamma=0.5, seed=0)
+    fill(buffer, lengths)
+    states, actions, returns, next_states, dones = buffer.sample(200)
+    for state, action, ret, next_state, done in zip(states, actions, returns, next_states, dones):
+        t = int(state[0])
+        expected, ended = reference_return(t, lengths, 3, 0.5)
+        assert ret == pytest.approx(expected), "Wrong n-step return"
+        assert bool(done) == ended, "Done flag should mark episodes that end within n steps"
+        assert action == t % 2, "Action does not match its state"
+        if not ended:
+            assert next_state[0] == t + 3, "Next state should be n steps ahead"
+
+def test_frame_stack_repeats_first_state():
+    buffer = ReplayBuffer(100, 2, frame_stack=3, seed=0)
+    fill(buffer, [4, 4])
+    stacked = buffer._stack(np.array([0, 1, 2, 4, 5]))
+    assert stacked.shape == (5, 6), "Stacked states should be flat"
+    assert stacked[:, ::2].tolist() == [[0, 0, 0], [0, 0, 1], [0, 1, 2], [4, 4, 4], [4, 4, 5]], \
+        "Frames should not cross episode boundaries"
+
+def test_stack_current():
+    buffer = ReplayBuffer(100, 2, frame_stack=3)
+    fill(buffer, [4])
+    assert buffer.stack_current([10, -10])[0, ::2].tolist() == [10, 10, 10], "New episode should repeat the state"
+    buffer.add([10, -10], 0, 0.0, False)
+    assert buffer.stack_current([11, -11])[0, ::2].tolist() == [10, 10, 11], "Current episode states should be used"
+
+def test_ring_overwrites_oldest():
+    buffer = ReplayBuffer(16, 2, n_step=2, frame_stack=2, seed=1)
+    total = fill(buffer, [10] * 5)
+    assert len(buffer) == 16 and buffer.states.shape == (16, 2), "Storage should not grow"
+    states, _, _, next_states, dones = buffer.sample(500)
+    assert (states[:, 2] >= total - 16).all(), "Overwritten steps were sampled"
+    assert (states[:, 0] >= total - 17).all(), "Stacked frames from overwritten slots"
+    assert (next_states[dones == 0, 2] < total).all(), "Next states must already be stored"
+
+def test_incomplete_window_not_sampled():
+    buffer = ReplayBuffer(100, 2, n_step=4, seed=0)
+    for t in range(6):
+        buffer.add([t, -t], 0, 1.0, False)
+    states, _, returns, _, _ = buffer.sample(100)
+    assert (states[:, 0] <= 1).all(), "Transitions without n stored steps ahead were sampled"
+    assert np.allclose(returns, 1 + 0.95 + 0.95 ** 2 + 0.95 ** 3), "Wrong return"
+
+def test_next_state_masks():
+    buffer = ReplayBuffer(100, 2, n_step=2, seed=0, action_size=3)
+    fill(buffer, [6])
+    # Overwrite with masks that encode the step number: action t % 3 is illegal
+    for t in range(6):
+        buffer.masks[t] = np.arange(3) != t % 3
+    states, _, _, next_states, dones, next_masks = buffer.sample(50, with_masks=True)
+    assert next_masks.shape == (50, 3)
+    for next_state, done, mask in zip(next_states, dones, next_masks):
+        if not done:
+            assert mask.tolist() == (np.arange(3) != int(next_state[0]) % 3).tolist()
+    with pytest.raises(ValueError):
+        ReplayBuffer(10, 2).sample(1, with_masks=True)
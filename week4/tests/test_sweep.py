@@ -0,0 +1,53 @@
+import os
+import sys
+import json
+import pytest
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from sweep import SEARCH_SPACE, make_pool, sample_configs, successive_halving, train_trial
+
+def test_sample_configs():
+    configs = sample_configs(20, seed=3)
+    assert configs == sample_configs(20, seed=3), "Same seed should give the same configs"
+    for config in configs:
+        assert 1e-4 <= config["learning_rate"] <= 1e-2
+        assert config["gamma"] in SEARCH_SPACE["gamma"]
+        assert config["memory_size"] in SEARCH_SPACE["memory_size"]
+
+class Objective:
+    # Score is the config's "quality" minus a penalty that shrinks with more steps
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, config, steps, seed):
+        self.calls.append((config["quality"], steps))
+        return config["quality"] - 100 / steps
+
+def test_successive_halving_keeps_the_best(tmp_path):
+    configs = [{"quality": q} for q in (3, 8, 1, 9, 5, 7, 2, 6, 4)]
+    objective = Objective()
+    log = str(tmp_path / "sweep.jsonl")
+    ranking = successive_halving(configs, 10, eta=3, rungs=3, objective=objective, log_path=log)
+    assert [configs[trial]["quality"] for trial, _, _ in ranking[:3]] == [9, 8, 7]
+    assert ranking[0][2] == pytest.approx(9 - 100 / 90)
+    assert sorted(steps for _, steps in objective.calls) == [10] * 9 + [30] * 3 + [90]
+    with open(log) as f:
+        entries = [json.loads(line) for line in f]
+    assert len(entries) == 13 and {e["rung"] for e in entries} == {0, 1, 2}
+
+    # A restarted sweep reads the finished trials from the log
+    again = Objective()
+    assert successive_halving(configs, 10, eta=3, rungs=3, objective=again, log_path=log) == ranking
+    assert again.calls == []
+
+def test_train_trial():
+    pytest.importorskip("tensorflow")
+    config = dict(sample_configs(1)[0], batch_size=8)
+    score = train_trial(config, 50, eval_episodes=5)
+    assert score >= 1
+
+def test_pin_needs_affinity(monkeypatch):
+    monkeypatch.delattr(os, "sched_getaffinity", raising=False)
+    with pytest.raises(RuntimeError, match="sched_getaffinity"):
+        make_pool(2, pin=True)
@@ -0,0 +1,37 @@
+import os
+import sys
+import numpy as np
+import pytest
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from train_profiler import PROFILER, Profiler
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler(enabled=False)
+    with profiler.timer("inference"):
+        pass
+    assert profiler.snapshot() == {"timers": {}}, "Disabled profiler should not record"
+
+def test_agent_timers():
+    pytest.importorskip("tensorflow")
+    from dqn_agent import DQNAgent
+
+    agent = DQNAgent(4, 2)
+    for _ in range(40):
+        agent.remember(np.random.rand(4), np.random.randint(2), 1.0, None, False)
+    enabled = PROFILER.enabled
+    PROFILER.enabled = True
+    PROFILER.reset()
+    try:
+        agent.epsilon = 0.0
+        agent.act(np.random.rand(1, 4))
+        agent.act_batch(np.random.rand(8, 4))
+        agent.replay(16)
+        timers = PROFILER.snapshot()["timers"]
+    finally:
+        PROFILER.enabled = enabled
+        PROFILER.reset()
+    assert timers["inference"]["count"] == 2, "act and act_batch should both be timed"
+    assert timers["replay_sample"]["count"] == 1, "Replay sampling not timed"
+    assert timers["gradient_step"]["count"] == 1, "Gradient step not timed"
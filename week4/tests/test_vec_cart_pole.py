@@ -0,0 +1,54 @@
+import os
+import sys
+import numpy as np
+import pytest
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from vec_cart_pole import VecCartPole
+
+def test_matches_gym():
+    gym = pytest.importorskip("gym")
+    rng = np.random.default_rng(0)
+    for episode in range(20):
+        env = gym.make('CartPole-v1')
+        observation, _ = env.reset(seed=episode)
+        vec_env = VecCartPole(1)
+        vec_env.state[0] = env.unwrapped.state
+        done = False
+        while not done:
+            action = int(rng.integers(2)) if episode % 2 else int(observation[2] > 0)
+            observation, reward, terminated, truncated, _ = env.step(action)
+            vec_observation, vec_reward, vec_terminated, vec_truncated, info = vec_env.step(np.array([action]))
+            if terminated or truncated:
+                vec_observation = info["final_observation"]
+            np.testing.assert_allclose(vec_observation[0], observation, rtol=1e-6, atol=1e-6)
+            assert vec_reward[0] == reward
+            assert (vec_terminated[0], vec_truncated[0]) == (terminated, truncated), "Termination differs from gym"
+            done = terminated or truncated
+        env.close()
+
+def test_auto_reset():
+    env = VecCartPole(64, max_steps=50, seed=0)
+    observations = env.reset()
+    assert observations.shape == (64, 4) and observations.dtype == np.float32
+    assert (np.abs(observations) <= 0.05).all(), "Reset states out of range"
+    finished = 0
+    for _ in range(200):
+        observations, _, terminated, truncated, info = env.step(np.zeros(64, dtype=np.int64))
+        done = terminated | truncated
+        finished += done.sum()
+        if done.any():
+            assert (env.steps[info["done_ids"]] == 0).all(), "Finished environments should restart"
+            assert (np.abs(observations[done]) <= 0.05).all(), "Restarted environments should show the reset state"
+    assert finished >= 64 * 2, "Pushing left should end episodes quickly"
+    assert (env.steps < 50).all()
+
+def test_truncation():
+    env = VecCartPole(3, max_steps=5, seed=0)
+    env.reset()
+    for _ in range(4):
+        _, _, _, truncated, _ = env.step(np.arange(3) % 2)
+        assert not truncated.any()
+    _, _, terminated, truncated, _ = env.step(np.arange(3) % 2)
+    assert truncated.all() and not terminated.any(), "Episodes should be truncated at max_steps"
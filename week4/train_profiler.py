@@ -0,0 +1,108 @@
+# train_profiler.py
+# Per-phase timers for the training loops (environment step, inference, replay sampling,
+# gradient step). The Tron game in week5 has its own profiler module with counters and reports.
+import json
+import os
+import time
+from array import array
+
+class RollingHistogram:
+    def __init__(self, window=1024):
+        """
+        Keep the most recent samples of one timer in a fixed-size ring.
+        :param window: Number of samples kept for the percentiles
+        """
+        self.samples = array('d', bytes(8 * window))
+        self.window = window
+        self.position = 0
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value):
+        self.samples[self.position] = value
+        self.position = (self.position + 1) % self.window
+        self.count += 1
+        self.total += value
+
+    def percentile(self, q):
+        """
+        :param q: Percentile between 0 and 100
+        :return: Value at that percentile over the current window, 0.0 if empty
+        """
+        size = min(self.count, self.window)
+        if size == 0:
+            return 0.0
+        ordered = sorted(self.samples[:size])
+        return ordered[min(size - 1, int(q / 100 * size))]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.add(time.perf_counter() - self.start)
+        return False
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class Profiler:
+    def __init__(self, enabled=False, window=1024):
+        """
+        Per-phase timers with fixed memory per phase.
+        :param enabled: When False, timer() does no work
+        :param window: Number of recent samples kept per timer
+        """
+        self.enabled = enabled
+        self.window = window
+        self.histograms = {}
+
+    def timer(self, name):
+        """
+        Context manager that records the wall time of its block under name.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = RollingHistogram(self.window)
+        return _Timer(histogram)
+
+    def reset(self):
+        self.histograms.clear()
+
+    def snapshot(self):
+        """
+        :return: Dict with per-timer summaries (seconds)
+        """
+        return {"timers": {name: hist.summary() for name, hist in self.histograms.items()}}
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+# Shared instance used by the training loops; set TRON_PROFILE=1 to turn it on
+PROFILER = Profiler(enabled=os.environ.get("TRON_PROFILE") == "1")
@@ -0,0 +1,77 @@
+# vec_cart_pole.py
+# CartPole-v1 dynamics in NumPy for many environments at once. Constants, equations
+# (Euler integration), termination and reset ranges follow gym's CartPoleEnv, and the
+# 500 step limit follows the TimeLimit wrapper of CartPole-v1.
+import numpy as np
+
+GRAVITY = 9.8
+MASS_CART = 1.0
+MASS_POLE = 0.1
+TOTAL_MASS = MASS_CART + MASS_POLE
+LENGTH = 0.5  # half the pole's length
+POLE_MASS_LENGTH = MASS_POLE * LENGTH
+FORCE_MAG = 10.0
+TAU = 0.02  # seconds between state updates
+THETA_THRESHOLD = 12 * 2 * np.pi / 360
+X_THRESHOLD = 2.4
+
+class VecCartPole:
+    def __init__(self, num_envs, max_steps=500, seed=None):
+        """
+        :param num_envs: Number of environments stepped together
+        :param max_steps: Episode length after which an episode is truncated
+        :param seed: Seed for the reset states
+        """
+        self.num_envs = num_envs
+        self.max_steps = max_steps
+        self.state_size = 4
+        self.action_size = 2
+        self.rng = np.random.default_rng(seed)
+        # float64 like gym; observations are returned as float32
+        self.state = np.zeros((num_envs, 4))
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+
+    def reset(self, env_ids=None):
+        """
+        :param env_ids: Environments to reset, all by default
+        :return: (num_envs, 4) float32 observations
+        """
+        if env_ids is None:
+            env_ids = np.arange(self.num_envs)
+        self.state[env_ids] = self.rng.uniform(-0.05, 0.05, (len(env_ids), 4))
+        self.steps[env_ids] = 0
+        return self.state.astype(np.float32)
+
+    def step(self, actions):
+        """
+        Advance every environment by one step; finished ones are reset right away.
+        :param actions: (num_envs,) actions, 1 pushes right and 0 pushes left
+        :return: observations, rewards, terminated, truncated and an info dict whose
+                 "final_observation" holds the last observation of every finished episode
+        """
+        x, x_dot, theta, theta_dot = self.state.T
+        force = np.where(np.asarray(actions) == 1, FORCE_MAG, -FORCE_MAG)
+        cos_theta = np.cos(theta)
+        sin_theta = np.sin(theta)
+        temp = (force + POLE_MASS_LENGTH * theta_dot ** 2 * sin_theta) / TOTAL_MASS
+        theta_acc = (GRAVITY * sin_theta - cos_theta * temp) / (
+            LENGTH * (4.0 / 3.0 - MASS_POLE * cos_theta ** 2 / TOTAL_MASS))
+        x_acc = temp - POLE_MASS_LENGTH * theta_acc * cos_theta / TOTAL_MASS
+
+        self.state = np.stack([x + TAU * x_dot, x_dot + TAU * x_acc,
+                               theta + TAU * theta_dot, theta_dot + TAU * theta_acc], axis=1)
+        self.steps += 1
+
+        x, theta = self.state[:, 0], self.state[:, 2]
+        terminated = (x < -X_THRESHOLD) | (x > X_THRESHOLD) | (theta < -THETA_THRESHOLD) | (theta > THETA_THRESHOLD)
+        truncated = self.steps >= self.max_steps
+        rewards = np.ones(self.num_envs, dtype=np.float32)
+        observations = self.state.astype(np.float32)
+
+        info = {}
+        done_ids = np.flatnonzero(terminated | truncated)
+        if len(done_ids):
+            info["final_observation"] = observations[done_ids]
+            info["done_ids"] = done_ids
+            observations = self.reset(done_ids)
+        return observations, rewards, terminated, truncated, info
@@ -0,0 +1,81 @@
+import argparse
+import asyncio
+from game_board import GameBoard
+from match_server import DIRECTIONS, END, MOVE, MSG_END, MSG_START, MSG_STATE, START, STATE
+from mock_ai import MockAI
+
+class BotClient:
+    def __init__(self, ai):
+        """
+        Local client for the match server that plays with any object providing get_direction().
+        The client mirrors the board, so AIs can read self.board, self.position and
+        self.opponent (for example through PolicyAI's observe callback).
+        :param ai: AI object that provides directions
+        """
+        self.ai = ai
+        self.board = None
+        self.player_id = None
+        self.position = None
+        self.opponent = None
+        self.results = []
+
+    async def connect(self, host="127.0.0.1", port=8765, path=None):
+        if path is not None:
+            self.reader, self.writer = await asyncio.open_unix_connection(path)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(host, port)
+
+    async def play(self, games=1):
+        """
+        Play games back to back on the open connection, then disconnect.
+        :return: List of result codes, one per game
+        """
+        try:
+            while len(self.results) < games:
+                msg_type = (await self.reader.readexactly(1))[0]
+                if msg_type == MSG_START:
+                    body = await self.reader.readexactly(START.size - 1)
+                    _, _, width, height, self.player_id, _ = START.unpack(bytes([msg_type]) + body)
+                    self.board = GameBoard(width, height)
+                elif msg_type == MSG_STATE:
+                    body = await self.reader.readexactly(STATE.size - 1)
+                    _, step, x1, y1, x2, y2 = STATE.unpack(bytes([msg_type]) + body)
+                    self._update_board(x1, y1, x2, y2)
+                    direction = self.ai.get_direction()
+                    self.writer.write(MOVE.pack(step, DIRECTIONS.index(list(direction))))
+                    await self.writer.drain()
+                elif msg_type == MSG_END:
+                    body = await self.reader.readexactly(END.size - 1)
+                    self.results.append(END.unpack(bytes([msg_type]) + body)[1])
+                else:
+                    raise ValueError(f"Unknown message type {msg_type}")
+        finally:
+            self.writer.close()
+        return self.results
+
+    def _update_board(self, x1, y1, x2, y2):
+        self.board.grid[y1][x1] = 1
+        self.board.grid[y2][x2] = 2
+        heads = {1: (x1, y1), 2: (x2, y2)}
+        self.position = heads[self.player_id]
+        self.opponent = heads[3 - self.player_id]
+
+async def run_bots(count, games, host, port, path):
+    bots = [BotClient(MockAI()) for _ in range(count)]
+    for bot in bots:
+        await bot.connect(host, port, path)
+    return await asyncio.gather(*(bot.play(games) for bot in bots))
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect MockAI bots to a running match server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None)
+    parser.add_argument("--bots", type=int, default=2)
+    parser.add_argument("--games", type=int, default=1)
+    args = parser.parse_args()
+    for i, results in enumerate(asyncio.run(run_bots(args.bots, args.games, args.host, args.port, args.unix))):
+        print(f"Bot {i}: {results}")
+
+if __name__ == "__main__":
+    main()
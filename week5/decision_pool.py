@@ -0,0 +1,83 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from profiler import RollingHistogram
+
+def _timed_call(ai):
+    start = time.perf_counter()
+    direction = ai.get_direction()
+    return direction, time.perf_counter() - start
+
+class DecisionPool:
+    def __init__(self, ais, time_budget=0.05, use_processes=False):
+        """
+        Ask several AIs for their moves in parallel with a hard per-move time budget.
+        :param ais: One AI object per player providing get_direction()
+        :param time_budget: Seconds every AI gets per move
+        :param use_processes: Run the AIs in a process pool instead of threads, for
+                              CPU-heavy bots; the AI objects are then pickled on
+                              every call, so they must not rely on state kept between moves
+        """
+        self.ais = ais
+        self.time_budget = time_budget
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.executor = executor_class(max_workers=len(ais))
+        # (future, step it was asked for) per AI, or None
+        self.pending = [None] * len(ais)
+        self.step = 0
+        self.latency = [RollingHistogram() for _ in ais]
+        self.timeouts = [0] * len(ais)
+        self.errors = [0] * len(ais)
+
+    def decide(self, players):
+        """
+        Get one direction per player, waiting at most time_budget.
+        An AI that misses the budget or raises keeps its player's current direction.
+        A late AI is not asked again until its answer arrives, so a stalled AI never
+        piles up work in the pool. A late answer was computed for an older board and
+        is dropped; the AI is asked again for the current step.
+        :param players: Player objects in the same order as the AIs
+        :return: List of directions as [dx, dy]
+        """
+        self.step += 1
+        for i, ai in enumerate(self.ais):
+            if self.pending[i] is not None and self.pending[i][0].done():
+                self._collect(i)
+            if self.pending[i] is None:
+                self.pending[i] = (self.executor.submit(_timed_call, ai), self.step)
+        wait([future for future, _ in self.pending], timeout=self.time_budget)
+
+        directions = []
+        for i, player in enumerate(players):
+            future, step = self.pending[i]
+            if not future.done():
+                self.timeouts[i] += 1
+                directions.append(player.direction)
+                continue
+            direction = self._collect(i)
+            if direction is None or step != self.step:
+                directions.append(player.direction)
+            else:
+                directions.append(direction)
+        return directions
+
+    def _collect(self, i):
+        # Runs on the game thread only, so the histograms need no lock
+        future, _ = self.pending[i]
+        self.pending[i] = None
+        if future.exception() is not None:
+            self.errors[i] += 1
+            return None
+        direction, seconds = future.result()
+        self.latency[i].add(seconds)
+        return direction
+
+    def latency_stats(self):
+        """
+        :return: One dict per AI with latency percentiles (seconds) and the timeout
+                 and error counts
+        """
+        return [dict(hist.summary(), timeouts=timeouts, errors=errors)
+                for hist, timeouts, errors in zip(self.latency, self.timeouts, self.errors)]
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
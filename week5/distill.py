@@ -0,0 +1,276 @@
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from policy_ai import PolicyAI, save_policy
+from search_state import SearchState, WIN, move_values, playable_moves
+from topology import Topology, direction_indices
+from vec_env import encode
+
+# Distillation of the paranoid search (search_state.paranoid) into a small policy
+# network: workers play games with the search and record, for both players in every
+# position, the observation of vec_env.encode, the search's move distribution (a
+# softmax over move values) and its value. The student is trained with NumPy on the
+# move distributions, with a tanh value head on the same hidden layers fitted to the
+# values, and saved in the PolicyAI format. The value head (with the shared layers)
+# is saved as a separate network in the same format.
+
+def start_state(width, height):
+    # Same start as VecTronEnv, start cells marked
+    topology = Topology(width, height)
+    heads = topology.index(np.array([width // 4, 3 * width // 4]), np.array([height // 2, height // 2]))
+    cells = topology.new_board()
+    cells[heads] = [1, 2]
+    return SearchState(topology, cells, heads, [3, 2])
+
+def observe(state, player, view=5):
+    """
+    :return: vec_env.encode observation of player in a SearchState
+    """
+    return encode(state.topology, state.cells[None, :], np.array([state.heads]),
+                  np.array([state.dirs]), player, view)[0]
+
+def teacher_targets(state, depth, player, temperature=2.0, value_scale=50.0):
+    """
+    :return: (move distribution over the four directions, value in [-1, 1], best move)
+    """
+    values = move_values(state, depth, player)
+    moves = np.array([move for move, _ in values])
+    scores = np.array([value for _, value in values], dtype=np.float64)
+    policy = np.zeros(4, dtype=np.float32)
+    weights = np.exp((scores - scores.max()) / temperature)
+    policy[moves] = weights / weights.sum()
+    best = scores.max()
+    value = np.sign(best) if abs(best) >= WIN else np.tanh(best / value_scale)
+    return policy, np.float32(value), int(moves[np.argmax(scores)])
+
+def generate_shard(path, games, width=40, height=30, depth=2, view=5, epsilon=0.1, seed=0, max_steps=400):
+    """
+    Play games with the search (plus epsilon random moves for variety) and save one shard.
+    :return: (path, number of samples)
+    """
+    rng = np.random.default_rng(seed)
+    observations, policies, values = [], [], []
+    for _ in range(games):
+        state = start_state(width, height)
+        for _ in range(max_steps):
+            chosen = []
+            for player in range(2):
+                policy, value, best = teacher_targets(state, depth, player)
+                observations.append(observe(state, player, view))
+                policies.append(policy)
+                values.append(value)
+                if rng.random() < epsilon:
+                    best = int(rng.choice(playable_moves(state, player)))
+                chosen.append(best)
+            if state.apply(*chosen):
+                break
+    np.savez_compressed(path, observations=np.array(observations, dtype=np.float32),
+                        policies=np.array(policies), values=np.array(values))
+    return path, len(values)
+
+def generate_dataset(output_dir, shards=8, games_per_shard=4, width=40, height=30, depth=2,
+                     view=5, workers=None, seed=0):
+    """
+    Generate shards in parallel worker processes.
+    :return: List of shard paths
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = [os.path.join(output_dir, f"shard-{i:04d}.npz") for i in range(shards)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(generate_shard, path, games_per_shard, width, height, depth, view,
+                               seed=seed + i)
+                   for i, path in enumerate(paths)]
+        return [future.result()[0] for future in futures]
+
+def load_shards(paths):
+    """
+    :return: (observations, policies, values) of all shards
+    """
+    parts = []
+    for path in paths:
+        with np.load(path) as data:
+            parts.append((data["observations"], data["policies"], data["values"]))
+    return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+
+def train_student(observations, policies, hidden=(64,), epochs=30, batch_size=256,
+                  learning_rate=1e-3, seed=0, values=None):
+    """
+    Fit a relu MLP to the move distributions with softmax cross-entropy and Adam.
+    :param values: Optional value targets in [-1, 1]; a tanh value head on the last
+                   hidden layer is then trained with them (squared error) as well
+    :return: (weights as [W0, b0, W1, b1, ...], activations, final training loss,
+             value head as [W, b] or None); the loss includes the value error
+    """
+    rng = np.random.default_rng(seed)
+    sizes = [observations.shape[1], *hidden, policies.shape[1]]
+    weights = []
+    for n_in, n_out in zip(sizes[:-1], sizes[1:]):
+        weights += [rng.normal(0, np.sqrt(2 / n_in), (n_in, n_out)).astype(np.float32),
+                    np.zeros(n_out, dtype=np.float32)]
+    value_head = None
+    if values is not None:
+        value_head = [rng.normal(0, np.sqrt(1 / sizes[-2]), (sizes[-2], 1)).astype(np.float32),
+                      np.zeros(1, dtype=np.float32)]
+    params = weights + (value_head or [])
+    moments = [np.zeros_like(w) for w in params]
+    squares = [np.zeros_like(w) for w in params]
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    step = 0
+    loss = 0.0
+    for _ in range(epochs):
+        order = rng.permutation(len(observations))
+        total = 0.0
+        for start in range(0, len(order), batch_size):
+            rows = order[start:start + batch_size]
+            x, target = observations[rows], policies[rows]
+            # Forward pass, keeping the input of every layer
+            inputs = [x]
+            for i in range(0, len(weights) - 2, 2):
+                inputs.append(np.maximum(inputs[-1] @ weights[i] + weights[i + 1], 0))
+            logits = inputs[-1] @ weights[-2] + weights[-1]
+            logits -= logits.max(axis=1, keepdims=True)
+            log_probs = logits - np.log(np.exp(logits).sum(axis=1, keepdims=True))
+            total += -(target * log_probs).sum()
+            if value_head is not None:
+                value = np.tanh(inputs[-1] @ value_head[0] + value_head[1])
+                error = value - values[rows, None]
+                total += (error ** 2).sum()
+                value_delta = 2 * error * (1 - value ** 2) / len(rows)
+
+            # Backward pass
+            delta = (np.exp(log_probs) - target) / len(rows)
+            gradients = [None] * len(weights)
+            for i in range(len(weights) - 2, -1, -2):
+                gradients[i] = inputs[i // 2].T @ delta
+                gradients[i + 1] = delta.sum(axis=0)
+                if i:
+                    delta = delta @ weights[i].T
+                    if value_head is not None and i == len(weights) - 2:
+                        # Both heads feed back into the last hidden layer
+                        delta += value_delta @ value_head[0].T
+                    delta *= inputs[i // 2] > 0
+            if value_head is not None:
+                gradients += [inputs[-1].T @ value_delta, value_delta.sum(axis=0)]
+            step += 1
+            for w, g, m, v in zip(params, gradients, moments, squares):
+                m *= beta1
+                m += (1 - beta1) * g
+                v *= beta2
+                v += (1 - beta2) * g * g
+                w -= learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + eps)
+        loss = total / len(observations)
+    activations = ["relu"] * len(hidden) + ["linear"]
+    return weights, activations, loss, value_head
+
+def distill(shard_paths, output, hidden=(64,), epochs=30, seed=0, value_output=None):
+    """
+    Train a student on saved shards and write it for PolicyAI.
+    :param value_output: Optional file for the value network (shared hidden layers
+                         and the tanh value head), in the same format
+    :return: Final training loss
+    """
+    observations, policies, values = load_shards(shard_paths)
+    weights, activations, loss, value_head = train_student(observations, policies, hidden, epochs,
+                                                           seed=seed, values=values)
+    save_policy(output, weights, activations)
+    if value_output is not None:
+        save_policy(value_output, weights[:-2] + value_head, activations[:-1] + ["tanh"])
+    return loss
+
+def game_observer(game_board, player, opponent, view=5):
+    """
+    Observation callable for PolicyAI(observe=...) in a week5 game, so a student can
+    play through the get_direction interface.
+    """
+    topology = Topology(game_board.width, game_board.height)
+
+    def observation():
+        cells = topology.board_from_grid(game_board.grid)
+        heads = topology.index(np.array([player.x, opponent.x]), np.array([player.y, opponent.y]))
+        cells[heads] = [player.player_id, opponent.player_id]
+        dirs = direction_indices([player.direction, opponent.direction])
+        return encode(topology, cells[None, :], heads[None, :], dirs[None, :], 0, view)[0]
+    return observation
+
+def student_policy(student, player=0, view=5):
+    """
+    Policy for play_match: the student's best move among playable_moves, so like the
+    search it never picks the reverse move.
+    :param student: PolicyAI
+    :return: Callable (state) -> direction index
+    """
+    def policy(state):
+        moves = playable_moves(state, player)
+        q_values = student.q_values(observe(state, player, view))[0]
+        return int(moves[int(np.argmax(q_values[moves]))])
+    return policy
+
+def play_match(policy, games, width=40, height=30, seed=0, max_steps=400):
+    """
+    Play policy (as player 1) against random non-suicidal moves.
+    :param policy: Callable (state) -> direction index for player 1
+    :return: (win rate, draw rate, mean seconds per decision)
+    """
+    rng = np.random.default_rng(seed)
+    wins = draws = decisions = 0
+    elapsed = 0.0
+    for _ in range(games):
+        state = start_state(width, height)
+        result = 0
+        for _ in range(max_steps):
+            start = time.perf_counter()
+            move = policy(state)
+            elapsed += time.perf_counter() - start
+            decisions += 1
+            result = state.apply(move, int(rng.choice(playable_moves(state, 1))))
+            if result:
+                break
+        wins += result == 1
+        draws += result == 3
+    return wins / games, draws / games, elapsed / decisions
+
+def benchmark(student_path, depth=2, games=20, width=40, height=30, view=5, seed=0):
+    """
+    Win rate against random moves and decision latency of the search and its student.
+    :return: Dict of name -> (win rate, draw rate, seconds per decision)
+    """
+    student = PolicyAI(student_path)
+    results = {
+        f"search depth {depth}": play_match(lambda s: teacher_targets(s, depth, 0)[2], games, width, height, seed),
+        "student": play_match(student_policy(student, 0, view), games, width, height, seed),
+    }
+    for name, (win_rate, draw_rate, latency) in results.items():
+        print(f"{name:>16}: win rate {win_rate:.2f}, draw rate {draw_rate:.2f}, {latency * 1e6:10.1f} us/move")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill the search bot into a small policy network")
+    parser.add_argument("--data-dir", default="distill_data")
+    parser.add_argument("--output", default="student.npz")
+    parser.add_argument("--value-output", default="student-value.npz", help="Where to write the value network")
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--games-per-shard", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--hidden", type=int, nargs="+", default=[64])
+    parser.add_argument("--epochs", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--skip-generate", action="store_true", help="Train on the shards already in --data-dir")
+    parser.add_argument("--benchmark-games", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.skip_generate:
+        paths = sorted(glob.glob(os.path.join(args.data_dir, "shard-*.npz")))
+    else:
+        start = time.perf_counter()
+        paths = generate_dataset(args.data_dir, args.shards, args.games_per_shard, depth=args.depth,
+                                 workers=args.workers)
+        print(f"Generated {len(paths)} shards in {time.perf_counter() - start:.1f}s")
+    loss = distill(paths, args.output, tuple(args.hidden), args.epochs, value_output=args.value_output)
+    print(f"Trained {args.output} and {args.value_output}, loss {loss:.3f}")
+    benchmark(args.output, args.depth, args.benchmark_games)
+
+if __name__ == "__main__":
+    main()
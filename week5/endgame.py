@@ -0,0 +1,221 @@
+import numpy as np
+from topology import Topology, DIRECTIONS
+
+# Once the two bikes can no longer reach each other, each one only has to survive as
+# long as possible in its own region: the player with the longer path wins. Small
+# regions are solved exactly with a memoized search over bitmasks of the free cells;
+# large ones use the checkerboard parity bound.
+
+class _SearchLimit(Exception):
+    pass
+
+def is_separated(topology, cells, head1, head2):
+    """
+    :param cells: Flat board with both heads marked as occupied
+    :return: True if no empty cell can be reached by both players
+    """
+    distance = topology.reachable(cells, head1)
+    return not (distance[topology.neighbors[head2]] > 0).any()
+
+def region(topology, cells, head):
+    """
+    :return: Flat indices of the empty cells reachable from head
+    """
+    return np.flatnonzero(topology.reachable(cells, head) > 0)
+
+def parity_bound(topology, region_cells, head):
+    """
+    Upper bound on the number of moves from head in a region. Every move changes
+    the colour of the checkerboard, so the path alternates between the two colours
+    starting with the one head is not on.
+    """
+    region_cells = np.asarray(region_cells)
+    if topology.wrap and (topology.width % 2 or topology.height % 2):
+        # An odd torus is not two-colourable
+        return len(region_cells)
+    x, y = topology.coords(region_cells)
+    hx, hy = topology.coords(head)
+    same = int(np.count_nonzero((x + y) % 2 == (hx + hy) % 2))
+    other = len(region_cells) - same
+    return 2 * min(same, other) + (1 if other > same else 0)
+
+def exact_longest_path(topology, cells, head, region_cells=None, max_nodes=20000):
+    """
+    Longest self-avoiding path from head over empty cells, by depth-first search
+    memoized on (cell, bitmask of the free cells it can still reach).
+    :param region_cells: Cells reachable from head, computed if not given
+    :param max_nodes: Search limit; ValueError is raised when it is hit
+    :return: Number of moves of the longest path
+    """
+    if region_cells is None:
+        region_cells = region(topology, cells, head)
+    local = {int(cell): i for i, cell in enumerate(region_cells)}
+    # Bitmask of the region neighbours of every region cell, and of the head
+    adjacent = [0] * (len(local) + 1)
+    for cell, i in local.items():
+        for n in topology.neighbors[cell]:
+            j = local.get(int(n))
+            if j is not None:
+                adjacent[i] |= 1 << j
+    start = len(local)
+    for n in topology.neighbors[head]:
+        j = local.get(int(n))
+        if j is not None:
+            adjacent[start] |= 1 << j
+
+    # Checkerboard colour of every local cell, for the parity bound of a component
+    x, y = topology.coords(np.append(np.asarray(region_cells, dtype=np.int64), head))
+    colour = ((x + y) % 2).tolist()
+    bipartite = not (topology.wrap and (topology.width % 2 or topology.height % 2))
+    odd_cells = sum(1 << i for i in range(len(local)) if colour[i])
+
+    memo = {}
+    nodes = [0]
+
+    def component(options, free):
+        # Free cells connected to the options, grown one layer of bits at a time
+        reached = options
+        frontier = options
+        while frontier:
+            grown = 0
+            while frontier:
+                bit = frontier & -frontier
+                grown |= adjacent[bit.bit_length() - 1]
+                frontier ^= bit
+            frontier = grown & free & ~reached
+            reached |= frontier
+        return reached
+
+    def longest(position, free):
+        options = adjacent[position] & free
+        if not options:
+            return 0
+        reach = component(options, free)
+        key = (position, reach)
+        if key in memo:
+            return memo[key]
+        nodes[0] += 1
+        if nodes[0] > max_nodes:
+            raise _SearchLimit()
+        bound = bin(reach).count("1")
+        # A path can end in only one dead end (a cell with a single way in)
+        dead_ends = 0
+        cells_left = reach
+        while cells_left:
+            bit = cells_left & -cells_left
+            cells_left ^= bit
+            ways_in = bin(adjacent[bit.bit_length() - 1] & reach).count("1") + (1 if options & bit else 0)
+            if ways_in < 2:
+                dead_ends += 1
+        if dead_ends > 1:
+            bound -= dead_ends - 1
+        if bipartite:
+            same = bin(reach & (odd_cells if colour[position] else ~odd_cells)).count("1")
+            other = bin(reach).count("1") - same
+            bound = min(bound, 2 * min(same, other) + (1 if other > same else 0))
+        moves = []
+        while options:
+            bit = options & -options
+            options ^= bit
+            moves.append(bit.bit_length() - 1)
+        # Cells with the fewest free neighbours first (Warnsdorff's rule) tend to give
+        # a path that meets the bound early
+        moves.sort(key=lambda n: bin(adjacent[n] & reach).count("1"))
+        best = 0
+        for n in moves:
+            best = max(best, 1 + longest(n, reach & ~(1 << n)))
+            if best == bound:
+                break
+        memo[key] = best
+        return best
+
+    try:
+        return longest(start, (1 << len(local)) - 1)
+    except _SearchLimit:
+        raise ValueError("Search limit reached") from None
+
+def longest_path(topology, cells, head, exact_limit=40, max_nodes=20000):
+    """
+    Number of moves a bike at head can make before it has to crash.
+    :param exact_limit: Regions up to this many cells are searched exactly
+    :param max_nodes: Search limit for the exact search
+    :return: (moves, exact); inexact values are the parity bound
+    """
+    region_cells = region(topology, cells, head)
+    if len(region_cells) <= exact_limit:
+        try:
+            return exact_longest_path(topology, cells, head, region_cells, max_nodes), True
+        except ValueError:
+            pass
+    return parity_bound(topology, region_cells, head), False
+
+def predict_result(topology, cells, head1, head2, exact_limit=40, max_nodes=20000):
+    """
+    :return: Result code (as update_game_state) of a separated position when both
+             players fill their regions as well as possible, or None if not separated
+    """
+    if not is_separated(topology, cells, head1, head2):
+        return None
+    moves1, _ = longest_path(topology, cells, head1, exact_limit, max_nodes)
+    moves2, _ = longest_path(topology, cells, head2, exact_limit, max_nodes)
+    if moves1 == moves2:
+        return 3
+    return 1 if moves1 > moves2 else 2
+
+def best_move(topology, cells, head, direction, exact_limit=40, max_nodes=20000):
+    """
+    Move that leaves the longest path. Ties go to the target cell with the fewest
+    free neighbours, which hugs walls and trails and wastes less space.
+    :param direction: Current direction index; reversing is not a move
+    :return: Direction index, the current one if every move crashes
+    """
+    best, best_key = direction, None
+    for d in range(4):
+        if (d >> 1) == (direction >> 1) and d != direction:
+            continue
+        target = topology.neighbors[head, d]
+        if cells[target] != 0:
+            continue
+        # Occupy the target while the rest of the path is searched
+        cells[target] = 1
+        moves, _ = longest_path(topology, cells, target, exact_limit, max_nodes)
+        open_sides = int(np.count_nonzero(cells[topology.neighbors[target]] == 0))
+        cells[target] = 0
+        key = (moves, -open_sides)
+        if best_key is None or key > best_key:
+            best, best_key = d, key
+    return best
+
+class EndgameAI:
+    def __init__(self, game_board, player, opponent, fallback=None, exact_limit=40, max_nodes=20000):
+        """
+        Play the endgame perfectly once the players are separated.
+        :param game_board: GameBoard of the game
+        :param player: Player controlled by this AI
+        :param opponent: The other Player
+        :param fallback: AI asked while the players are not separated; by default the
+                         longest-path move is played then too
+        :param exact_limit: Regions up to this many cells are searched exactly
+        :param max_nodes: Search limit per exact search, keeps moves within the time budget
+        """
+        self.game_board = game_board
+        self.player = player
+        self.opponent = opponent
+        self.fallback = fallback
+        self.exact_limit = exact_limit
+        self.max_nodes = max_nodes
+        self.topology = Topology(game_board.width, game_board.height)
+
+    def get_direction(self, *args):
+        topology = self.topology
+        cells = topology.board_from_grid(self.game_board.grid)
+        head = int(topology.index(self.player.x, self.player.y))
+        other = int(topology.index(self.opponent.x, self.opponent.y))
+        # Start cells are not written to the grid
+        cells[head] = self.player.player_id
+        cells[other] = self.opponent.player_id
+        if self.fallback is not None and not is_separated(topology, cells, head, other):
+            return self.fallback.get_direction(*args)
+        direction = int(np.flatnonzero((DIRECTIONS == self.player.direction).all(axis=1))[0])
+        return DIRECTIONS[best_move(topology, cells, head, direction,
+                                    self.exact_limit, self.max_nodes)].tolist()
@@ -37,4 +37,22 @@ class GameBoard:
         """
         if x < 0 or x >= self.width or y < 0 or y >= self.height:
             return True
-        return self.grid[y][x] != 0
\ No newline at end of file
+        return self.grid[y][x] != 0
+
+    def reset(self, players=None):
+        """
+        Clear the board for a new game.
+        :param players: Players of the last game; only the cells in their trails are
+                        cleared, so the cost follows the game length instead of the board
+                        area. Without players every cell is cleared.
+        """
+        if players is None:
+            zeros = [0] * self.width
+            for row in self.grid:
+                row[:] = zeros
+            return
+        grid = self.grid
+        for player in players:
+            trail = player.trail
+            for i in range(0, len(trail), 2):
+                grid[trail[i + 1]][trail[i]] = 0
@@ -0,0 +1,46 @@
+from game_board import GameBoard
+from player import Player
+
+class GamePool:
+    def __init__(self, width=40, height=30):
+        """
+        Reuse boards and players across games instead of rebuilding them.
+        :param width: Width of the pooled boards in grid cells
+        :param height: Height of the pooled boards in grid cells
+        """
+        self.width = width
+        self.height = height
+        self.start1 = (width // 4, height // 2)
+        self.start2 = (3 * width // 4, height // 2)
+        self.free = []
+        self.created = 0
+
+    def acquire(self, ai1, ai2):
+        """
+        Get a board and two players ready for a new game.
+        :param ai1: AI object for player 1
+        :param ai2: AI object for player 2
+        :return: (game_board, player1, player2), as used by update_game_state
+        """
+        if self.free:
+            game_board, player1, player2 = self.free.pop()
+            # Clear only the cells of the previous game before moving the bikes back
+            game_board.reset((player1, player2))
+            player1.reset(*self.start1)
+            player2.reset(*self.start2)
+        else:
+            game_board = GameBoard(self.width, self.height)
+            player1 = Player(*self.start1, (255, 0, 0), 1, None)
+            player2 = Player(*self.start2, (0, 0, 255), 2, None)
+            self.created += 1
+        player1.ai = ai1
+        player2.ai = ai2
+        return game_board, player1, player2
+
+    def release(self, game_board, player1, player2):
+        """
+        Return a finished game to the pool. Its board is cleared on the next acquire.
+        """
+        player1.ai = None
+        player2.ai = None
+        self.free.append((game_board, player1, player2))
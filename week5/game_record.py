@@ -0,0 +1,176 @@
+import random
+import numpy as np
+import kernels
+from game_board import GameBoard
+from mock_ai import MockAI
+from player import Player
+from state_hash import RollingHash, ZobristTable, first_divergence
+from topology import Topology, DIRECTIONS, RIGHT, LEFT, direction_indices
+from tron_game import update_game_state
+
+def game_rngs(seed, count=2):
+    """
+    Independent random streams for the players of one game, derived from the game seed,
+    so a game can be reproduced from its seed alone.
+    :return: List of random.Random, one per player
+    """
+    return [random.Random(int(child.generate_state(1)[0]))
+            for child in np.random.SeedSequence(seed).spawn(count)]
+
+class GameRecord:
+    def __init__(self, width, height, num_players=2):
+        """
+        Compact record of a game: the head of every player after every step.
+        The board at any step follows from the heads, so no frames are stored.
+        :param width: Width of the board in grid cells
+        :param height: Height of the board in grid cells
+        :param num_players: Number of players, ids are 1..num_players
+        """
+        self.width = width
+        self.height = height
+        self.num_players = num_players
+        self.heads = []
+        self.result = 0
+        # Direction index of every player after every step, the final step included
+        self.moves = []
+        # Rolling state hash (state_hash.RollingHash) of the start and of every step
+        self.hashes = []
+        self.seed = None
+
+    def append(self, heads):
+        """
+        :param heads: List of (x, y) per player, in player id order
+        """
+        self.heads.append([tuple(head) for head in heads])
+
+    def heads_array(self):
+        """
+        :return: (steps, players, 2) int16 array of head positions
+        """
+        return np.array(self.heads, dtype=np.int16).reshape(-1, self.num_players, 2)
+
+    def save(self, path):
+        np.savez_compressed(path, size=np.array([self.width, self.height, self.num_players]),
+                            heads=self.heads_array(), result=np.array(self.result),
+                            moves=np.array(self.moves, dtype=np.int8).reshape(-1, self.num_players),
+                            hashes=np.array(self.hashes, dtype=np.uint64),
+                            seed=np.array(-1 if self.seed is None else self.seed))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            width, height, num_players = (int(v) for v in data["size"])
+            record = cls(width, height, num_players)
+            record.heads = [[tuple(int(v) for v in head) for head in step] for step in data["heads"]]
+            record.result = int(data["result"])
+            # Records saved before moves and hashes were added have neither
+            if "moves" in data.files:
+                record.moves = [tuple(int(v) for v in step) for step in data["moves"]]
+                record.hashes = [int(v) for v in data["hashes"]]
+                seed = int(data["seed"])
+                record.seed = None if seed < 0 else seed
+        return record
+
+def _state(player1, player2):
+    heads = [(player1.x, player1.y), (player2.x, player2.y)]
+    dirs = tuple(int(d) for d in direction_indices([player1.direction, player2.direction]))
+    return heads, dirs
+
+def record_game(ai1, ai2, width=40, height=30, seed=None):
+    """
+    Play one game headless with the week5 rules and record it. Both AIs decide before
+    the collision check, as in tron_game.main.
+    :param ai1: AI object for player 1
+    :param ai2: AI object for player 2
+    :param seed: Game seed the AIs were built from, stored with the record
+    :return: GameRecord of the finished game
+    """
+    game_board = GameBoard(width, height)
+    player1 = Player(width // 4, height // 2, (255, 0, 0), 1, ai1)
+    player2 = Player(3 * width // 4, height // 2, (0, 0, 255), 2, ai2)
+    record = GameRecord(width, height)
+    record.seed = seed
+    heads, dirs = _state(player1, player2)
+    record.append(heads)
+    rolling = RollingHash(ZobristTable(width, height), heads, dirs)
+    record.hashes.append(rolling.value)
+    result = 0
+    while result == 0:
+        directions = [ai1.get_direction(), ai2.get_direction()]
+        result = update_game_state(player1, player2, game_board, directions)
+        heads, dirs = _state(player1, player2)
+        record.moves.append(dirs)
+        record.hashes.append(rolling.update(heads, dirs, result))
+        if result == 0:
+            record.append(heads)
+    record.result = result
+    return record
+
+def play_seeded_game(seed, width=40, height=30):
+    """
+    Record a game between two MockAIs that draw from the streams of game_rngs(seed).
+    The same seed always gives the same game.
+    """
+    ai1, ai2 = (MockAI(rng=rng) for rng in game_rngs(seed))
+    return record_game(ai1, ai2, width, height, seed)
+
+def replay(record, backend="python"):
+    """
+    Play the recorded moves again on one engine and hash every step.
+    :param backend: "python" (GameBoard and update_game_state), or "numpy" or "numba"
+                    for the kernels backend of that name
+    :return: (hashes, result)
+    """
+    start = record.heads[0]
+    rolling = RollingHash(ZobristTable(record.width, record.height), start, (RIGHT, LEFT))
+    hashes = [rolling.value]
+    result = 0
+    if backend == "python":
+        game_board = GameBoard(record.width, record.height)
+        player1 = Player(*start[0], (255, 0, 0), 1, None)
+        player2 = Player(*start[1], (0, 0, 255), 2, None)
+        for move1, move2 in record.moves:
+            directions = [DIRECTIONS[move1].tolist(), DIRECTIONS[move2].tolist()]
+            result = update_game_state(player1, player2, game_board, directions)
+            hashes.append(rolling.update(*_state(player1, player2), result))
+            if result:
+                break
+        return hashes, result
+
+    engines = {"numpy": kernels.NUMPY_BACKEND, "numba": kernels.NUMBA_BACKEND}
+    if engines.get(backend) is None:
+        raise ValueError(f"Backend {backend!r} is not available")
+    engine = engines[backend]
+    topology = Topology(record.width, record.height)
+    # Start cells stay empty, as on a fresh GameBoard
+    cells = topology.new_board()
+    heads = topology.index(np.array([start[0][0], start[1][0]]),
+                           np.array([start[0][1], start[1][1]])).astype(np.int64)
+    dirs = np.array([RIGHT, LEFT], dtype=np.int64)
+    requested = np.empty(2, dtype=np.int64)
+    for move in record.moves:
+        requested[:] = move
+        result = int(engine.step(cells, topology.neighbors, heads, dirs, requested))
+        xs, ys = topology.coords(heads)
+        hashes.append(rolling.update(list(zip(xs.tolist(), ys.tolist())), dirs.tolist(), result))
+        if result:
+            break
+    return hashes, result
+
+def verify_record(record, backend="python"):
+    """
+    Replay a record and compare its hashes step by step; the result is part of the
+    last hash.
+    :return: First step that differs, or None if the replay matches
+    """
+    if not record.hashes:
+        raise ValueError("The record has no state hashes")
+    hashes, _ = replay(record, backend)
+    return first_divergence(record.hashes, hashes)
+
+def compare_backends(record, backend_a="python", backend_b="numpy"):
+    """
+    Replay a record on two engines.
+    :return: First step at which their states differ, or None if they agree
+    """
+    return first_divergence(replay(record, backend_a)[0], replay(record, backend_b)[0])
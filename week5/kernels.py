@@ -0,0 +1,235 @@
+import types
+import numpy as np
+from topology import direction_indices
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Two-player kernels on the flat boards of topology.Topology:
+#   cells      flat int8 board (0 empty, player ids, -1 walls)
+#   neighbors  Topology.neighbors table
+#   heads      int64 array with the flat head index of player 1 and 2
+#   dirs       int64 array with the direction index of player 1 and 2
+#   requested  int64 array with the requested direction index per player, -1 to keep going
+# Results use the codes of update_game_state: 0 running, 1 player 1 wins, 2 player 2 wins, 3 draw.
+# The loop versions are compiled with numba when it is installed; otherwise the NumPy
+# versions below are used. Both give identical results.
+
+def _step_loop(cells, neighbors, heads, dirs, requested):
+    for p in range(2):
+        r = requested[p]
+        if r >= 0 and (r >> 1) != (dirs[p] >> 1):
+            dirs[p] = r
+    t1 = neighbors[heads[0], dirs[0]]
+    t2 = neighbors[heads[1], dirs[1]]
+    c1 = cells[t1] != 0
+    c2 = cells[t2] != 0
+    if t1 == t2 or (c1 and c2):
+        return 3
+    if c1:
+        return 2
+    if c2:
+        return 1
+    cells[t1] = 1
+    cells[t2] = 2
+    heads[0] = t1
+    heads[1] = t2
+    return 0
+
+def _batched_step_loop(cells, neighbors, heads, dirs, requested, results):
+    for b in range(cells.shape[0]):
+        if results[b] == 0:
+            results[b] = _step_kernel(cells[b], neighbors, heads[b], dirs[b], requested[b])
+
+def _territory_loop(cells, neighbors, heads):
+    size = cells.shape[0]
+    counts = np.zeros(2, dtype=np.int64)
+    dist = np.full((2, size), -1, dtype=np.int64)
+    queue = np.empty(size, dtype=np.int64)
+    for p in range(2):
+        dist[p, heads[p]] = 0
+        queue[0] = heads[p]
+        start, end = 0, 1
+        while start < end:
+            cell = queue[start]
+            start += 1
+            for d in range(4):
+                n = neighbors[cell, d]
+                if cells[n] == 0 and dist[p, n] < 0:
+                    dist[p, n] = dist[p, cell] + 1
+                    queue[end] = n
+                    end += 1
+    for cell in range(size):
+        d1 = dist[0, cell]
+        d2 = dist[1, cell]
+        if cells[cell] != 0:
+            continue
+        if d1 > 0 and (d2 < 0 or d1 < d2):
+            counts[0] += 1
+        elif d2 > 0 and (d1 < 0 or d2 < d1):
+            counts[1] += 1
+    return counts
+
+def _pick_loop(cells, neighbors, head, current, u):
+    # Uniform choice among the free cells that are not behind the bike
+    free = 0
+    for d in range(4):
+        if ((d >> 1) != (current >> 1) or d == current) and cells[neighbors[head, d]] == 0:
+            free += 1
+    if free == 0:
+        return -1
+    pick = int(u * free)
+    for d in range(4):
+        if ((d >> 1) != (current >> 1) or d == current) and cells[neighbors[head, d]] == 0:
+            if pick == 0:
+                return d
+            pick -= 1
+    return -1
+
+def _rollouts_loop(cells, neighbors, heads, dirs, choices):
+    n = choices.shape[1]
+    results = np.zeros(n, dtype=np.int64)
+    requested = np.empty(2, dtype=np.int64)
+    for i in range(n):
+        board = cells.copy()
+        h = heads.copy()
+        d = dirs.copy()
+        for s in range(choices.shape[0]):
+            for p in range(2):
+                requested[p] = _pick_kernel(board, neighbors, h[p], d[p], choices[s, i, p])
+            result = _step_kernel(board, neighbors, h, d, requested)
+            if result != 0:
+                results[i] = result
+                break
+    return results
+
+def _batched_step_numpy(cells, neighbors, heads, dirs, requested, results):
+    active = np.flatnonzero(results == 0)
+    current = dirs[active]
+    wanted = requested[active]
+    turn = (wanted >= 0) & ((wanted >> 1) != (current >> 1))
+    current[turn] = wanted[turn]
+    dirs[active] = current
+
+    target = neighbors[heads[active], current]
+    occupied = cells[active[:, None], target] != 0
+    outcome = np.zeros(len(active), dtype=np.int64)
+    outcome[occupied[:, 1]] = 1
+    outcome[occupied[:, 0]] = 2
+    outcome[occupied.all(axis=1) | (target[:, 0] == target[:, 1])] = 3
+    results[active] = outcome
+
+    moving = outcome == 0
+    rows = active[moving]
+    cells[rows, target[moving, 0]] = 1
+    cells[rows, target[moving, 1]] = 2
+    heads[rows] = target[moving]
+
+def _territory_numpy(cells, neighbors, heads):
+    size = cells.shape[0]
+    dist = np.full((2, size), -1, dtype=np.int64)
+    for p in range(2):
+        dist[p, heads[p]] = 0
+        frontier = np.array([heads[p]])
+        depth = 0
+        while len(frontier):
+            depth += 1
+            candidates = neighbors[frontier].ravel()
+            candidates = np.unique(candidates[(cells[candidates] == 0) & (dist[p, candidates] < 0)])
+            dist[p, candidates] = depth
+            frontier = candidates
+    d1, d2 = dist
+    empty = cells == 0
+    mine = empty & (d1 > 0) & ((d2 < 0) | (d1 < d2))
+    theirs = empty & (d2 > 0) & ((d1 < 0) | (d2 < d1))
+    return np.array([np.count_nonzero(mine), np.count_nonzero(theirs)], dtype=np.int64)
+
+def _rollouts_numpy(cells, neighbors, heads, dirs, choices):
+    # All rollouts advance together, one batched step per move
+    n = choices.shape[1]
+    boards = np.repeat(cells[None, :], n, axis=0)
+    h = np.repeat(heads[None, :], n, axis=0)
+    d = np.repeat(dirs[None, :], n, axis=0)
+    results = np.zeros(n, dtype=np.int64)
+    rows = np.arange(n)[:, None, None]
+    options = np.arange(4)
+    for s in range(choices.shape[0]):
+        if not (results == 0).any():
+            break
+        free = boards[rows, neighbors[h]] == 0                        # (n, 2, 4)
+        free &= ((options >> 1) != (d[..., None] >> 1)) | (options == d[..., None])
+        count = free.sum(axis=2)
+        pick = (choices[s] * count).astype(np.int64)
+        chosen = np.argmax(free.cumsum(axis=2) > pick[..., None], axis=2)
+        requested = np.where(count > 0, chosen, -1)
+        _batched_step_numpy(boards, neighbors, h, d, requested, results)
+    return results
+
+def _backend(name, step, batched_step, territory, rollouts):
+    return types.SimpleNamespace(name=name, step=step, batched_step=batched_step,
+                                 territory=territory, rollouts=rollouts)
+
+NUMPY_BACKEND = _backend("numpy", _step_loop, _batched_step_numpy, _territory_numpy, _rollouts_numpy)
+
+if numba is not None:
+    _step_kernel = numba.njit(cache=True)(_step_loop)
+    _pick_kernel = numba.njit(cache=True)(_pick_loop)
+    NUMBA_BACKEND = _backend("numba", _step_kernel,
+                             numba.njit(cache=True)(_batched_step_loop),
+                             numba.njit(cache=True)(_territory_loop),
+                             numba.njit(cache=True)(_rollouts_loop))
+    BACKEND = NUMBA_BACKEND
+else:
+    _step_kernel = _step_loop
+    _pick_kernel = _pick_loop
+    NUMBA_BACKEND = None
+    BACKEND = NUMPY_BACKEND
+
+def state_from_game(topology, game_board, player1, player2):
+    """
+    Convert a week5 game into kernel arrays.
+    :return: (cells, heads, dirs)
+    """
+    cells = topology.board_from_grid(game_board.grid)
+    heads = topology.index(np.array([player1.x, player2.x]), np.array([player1.y, player2.y]))
+    dirs = direction_indices([player1.direction, player2.direction])
+    return cells, heads.astype(np.int64), dirs.astype(np.int64)
+
+def step(cells, neighbors, heads, dirs, requested):
+    """
+    Advance one game by one move in place.
+    :return: Result code, as update_game_state
+    """
+    return int(BACKEND.step(cells, neighbors, heads, dirs, np.asarray(requested, dtype=np.int64)))
+
+def batched_step(cells, neighbors, heads, dirs, requested, results):
+    """
+    Advance every game whose result is still 0 by one move, in place.
+    :param cells: (games, board size) boards
+    :param heads: (games, 2) head indices
+    :param dirs: (games, 2) direction indices
+    :param requested: (games, 2) requested direction indices
+    :param results: (games,) result codes, updated for the games that end
+    """
+    BACKEND.batched_step(cells, neighbors, heads, dirs, requested, results)
+
+def territory(cells, neighbors, heads):
+    """
+    Count the empty cells each player reaches strictly before the other (Voronoi split).
+    :return: Array [cells for player 1, cells for player 2]
+    """
+    return BACKEND.territory(cells, neighbors, heads)
+
+def random_rollouts(cells, neighbors, heads, dirs, n, seed=0, max_steps=None):
+    """
+    Play n games to the end from the given position with random non-suicidal moves.
+    The random numbers are drawn up front, so every backend plays the same games.
+    :param max_steps: Move limit, by default enough to fill every empty cell
+    :return: Array with the result code of every rollout
+    """
+    if max_steps is None:
+        max_steps = int(np.count_nonzero(cells == 0)) // 2 + 2
+    choices = np.random.default_rng(seed).random((max_steps, n, 2))
+    return BACKEND.rollouts(cells, neighbors, heads, dirs, choices)
@@ -0,0 +1,234 @@
+import argparse
+import asyncio
+import itertools
+import struct
+from game_pool import GamePool
+from spectator import SpectatorHub
+from tron_game import update_game_state
+
+# Binary protocol, all little-endian:
+#   server -> bot  START  type=1, game id, board width, board height, player id, deadline in ms
+#   server -> bot  STATE  type=2, step, x1, y1, x2, y2 (heads of player 1 and 2)
+#   server -> bot  END    type=3, result (1: player 1 wins, 2: player 2 wins, 3: draw)
+#   bot -> server  MOVE   step the move is for, index into DIRECTIONS
+START = struct.Struct("<BIHHBH")
+STATE = struct.Struct("<BIHHHH")
+END = struct.Struct("<BB")
+MOVE = struct.Struct("<IB")
+MSG_START, MSG_STATE, MSG_END = 1, 2, 3
+
+# Same order as MockAI.directions
+DIRECTIONS = [[0, -1], [0, 1], [-1, 0], [1, 0]]
+
+class BotConnection:
+    def __init__(self, reader, writer, max_buffer=1 << 16):
+        """
+        One connected bot. A background task reads its moves so a late or missing
+        reply never blocks the game loop.
+        :param reader: asyncio StreamReader of the connection
+        :param writer: asyncio StreamWriter of the connection
+        :param max_buffer: Bytes the bot may have unsent; beyond that it is disconnected
+        """
+        self.reader = reader
+        self.writer = writer
+        self.max_buffer = max_buffer
+        self.expected_step = -1
+        self.move = None
+        self.received = asyncio.Event()
+        self.closed = False
+        self.reader_task = asyncio.ensure_future(self._read_moves())
+
+    async def _read_moves(self):
+        try:
+            while True:
+                step, action = MOVE.unpack(await self.reader.readexactly(MOVE.size))
+                # Moves for an old step arrived after their deadline and are dropped
+                if step == self.expected_step and action < len(DIRECTIONS):
+                    self.move = DIRECTIONS[action]
+                    self.received.set()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.closed = True
+            self.received.set()
+            self.writer.close()
+
+    def expect(self, step):
+        self.expected_step = step
+        self.move = None
+        self.received.clear()
+
+    async def wait_move(self, timeout):
+        """
+        :return: The requested direction, or None if the deadline passed
+        """
+        try:
+            await asyncio.wait_for(self.received.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.move
+
+    def send(self, data):
+        if self.closed:
+            return
+        if self.writer.transport.get_write_buffer_size() > self.max_buffer:
+            # A bot that stops reading is treated as disconnected and forfeits
+            self.closed = True
+            self.received.set()
+            self.reader_task.cancel()
+            self.writer.close()
+            return
+        self.writer.write(data)
+
+class MatchServer:
+    def __init__(self, width=40, height=30, move_timeout=0.1, spectators=None, max_buffer=1 << 16):
+        """
+        Host Tron games between remote bots, all in one event loop.
+        Bots are paired in connection order; after a game ends both are queued again.
+        :param width: Width of the board in grid cells
+        :param height: Height of the board in grid cells
+        :param move_timeout: Seconds a bot has to answer each STATE; on timeout
+                             the bike keeps its current direction
+        :param spectators: Optional spectator.SpectatorHub every game is published to
+        :param max_buffer: Bytes a bot may have unsent before it is disconnected
+        """
+        self.width = width
+        self.height = height
+        self.move_timeout = move_timeout
+        self.spectators = spectators
+        self.max_buffer = max_buffer
+        self.waiting = asyncio.Queue()
+        self.game_ids = itertools.count(1)
+        self.active_games = 0
+        self.game_tasks = set()
+        self.pool = GamePool(width, height)
+        self.results = {1: 0, 2: 0, 3: 0}
+        self.games_finished = asyncio.Condition()
+
+    async def start(self, host="127.0.0.1", port=0, path=None):
+        """
+        Start listening on TCP, or on a Unix socket when path is given.
+        :return: asyncio Server object
+        """
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle_connection, path)
+        else:
+            self.server = await asyncio.start_server(self._handle_connection, host, port)
+        self.matchmaker = asyncio.ensure_future(self._pair_bots())
+        return self.server
+
+    async def close(self):
+        self.matchmaker.cancel()
+        for task in list(self.game_tasks):
+            task.cancel()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def wait_for_games(self, count):
+        """
+        Wait until at least count games have finished.
+        """
+        async with self.games_finished:
+            await self.games_finished.wait_for(lambda: sum(self.results.values()) >= count)
+
+    async def _handle_connection(self, reader, writer):
+        await self.waiting.put(BotConnection(reader, writer, self.max_buffer))
+
+    async def _pair_bots(self):
+        while True:
+            first = await self.waiting.get()
+            second = await self.waiting.get()
+            if first.closed or second.closed:
+                # Keep whoever is still connected for the next pairing
+                for bot in (first, second):
+                    if not bot.closed:
+                        await self.waiting.put(bot)
+                continue
+            task = asyncio.ensure_future(self.run_game(first, second))
+            self.game_tasks.add(task)
+            task.add_done_callback(self.game_tasks.discard)
+
+    async def run_game(self, bot1, bot2):
+        """
+        Play one game between two connected bots with the week5 rules.
+        :return: Result code as returned by update_game_state, None if aborted
+        """
+        game_id = next(self.game_ids)
+        self.active_games += 1
+        board, player1, player2 = self.pool.acquire(None, None)
+        deadline_ms = int(self.move_timeout * 1000)
+        bot1.send(START.pack(MSG_START, game_id, self.width, self.height, 1, deadline_ms))
+        bot2.send(START.pack(MSG_START, game_id, self.width, self.height, 2, deadline_ms))
+
+        step = 0
+        result = 0
+        while result == 0:
+            state = STATE.pack(MSG_STATE, step, player1.x, player1.y, player2.x, player2.y)
+            for bot in (bot1, bot2):
+                bot.expect(step)
+                bot.send(state)
+            moves = await asyncio.gather(bot1.wait_move(self.move_timeout),
+                                         bot2.wait_move(self.move_timeout))
+            if bot1.closed or bot2.closed:
+                if step == 0:
+                    # Left before the first move (e.g. right after its previous game):
+                    # no game is recorded and the other bot goes back in the queue
+                    self.active_games -= 1
+                    self.pool.release(board, player1, player2)
+                    for bot in (bot1, bot2):
+                        if not bot.closed:
+                            await self.waiting.put(bot)
+                    return None
+                # A bot that disconnects mid-game forfeits
+                result = 3 if bot1.closed and bot2.closed else (2 if bot1.closed else 1)
+                if self.spectators is not None:
+                    self.spectators.publish(game_id, step, [(player1.x, player1.y), (player2.x, player2.y)],
+                                            result)
+                break
+            if step == 0 and self.spectators is not None:
+                self.spectators.start_game(game_id, self.width, self.height,
+                                           [(player1.x, player1.y), (player2.x, player2.y)])
+            directions = [move if move is not None else player.direction
+                          for player, move in zip((player1, player2), moves)]
+            result = update_game_state(player1, player2, board, directions)
+            step += 1
+            if self.spectators is not None:
+                self.spectators.publish(game_id, step, [(player1.x, player1.y), (player2.x, player2.y)], result)
+
+        for bot in (bot1, bot2):
+            bot.send(END.pack(MSG_END, result))
+        self.pool.release(board, player1, player2)
+        self.active_games -= 1
+        async with self.games_finished:
+            self.results[result] += 1
+            self.games_finished.notify_all()
+        for bot in (bot1, bot2):
+            if not bot.closed:
+                await self.waiting.put(bot)
+        return result
+
+async def serve(host, port, path, move_timeout, spectator_port=None, spectator_path=None):
+    hub = None
+    if spectator_port is not None or spectator_path is not None:
+        hub = SpectatorHub()
+        spectator_server = await hub.start(host, spectator_port or 0, spectator_path)
+        print(f"Spectator feed on {spectator_path or spectator_server.sockets[0].getsockname()}")
+    match_server = MatchServer(move_timeout=move_timeout, spectators=hub)
+    server = await match_server.start(host, port, path)
+    print(f"Match server listening on {path or server.sockets[0].getsockname()}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Tron match server for remote bots")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--timeout", type=float, default=0.1, help="Per-move deadline in seconds")
+    parser.add_argument("--spectator-port", type=int, default=None, help="Publish games to viewers on this port")
+    parser.add_argument("--spectator-unix", default=None, help="Publish games to viewers on this Unix socket")
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.unix, args.timeout, args.spectator_port, args.spectator_unix))
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
 import random
 
 class MockAI:
-    def __init__(self):
+    def __init__(self, seed=None, rng=None):
+        """
+        :param seed: Seed of this AI's own random stream
+        :param rng: random.Random to draw from instead, e.g. one stream of game_record.game_rngs
+        """
         self.directions = [[0, -1], [0, 1], [-1, 0], [1, 0]]
+        self.rng = rng if rng is not None else random.Random(seed)
 
     def get_direction(self, *args):
-        return random.choice(self.directions)
\ No newline at end of file
+        return self.rng.choice(self.directions)
@@ -0,0 +1,207 @@
+import argparse
+import colorsys
+from array import array
+import numpy as np
+import pygame
+from mock_ai import MockAI
+from topology import DIRECTIONS, Topology, direction_indices, is_turn
+
+MAX_PLAYERS = 16
+MAX_BOARD_SIZE = 1000
+
+class MultiTronGame:
+    def __init__(self, width, height, num_players, ais=None, start_positions=None, wrap=False):
+        """
+        Tron with any number of bikes, stepped in one vectorized pass over all heads.
+        :param width: Width of the board in grid cells
+        :param height: Height of the board in grid cells
+        :param num_players: Number of bikes, player ids are 1..num_players
+        :param ais: One AI object per player providing get_direction(), optional
+                    when directions are passed to step() directly
+        :param start_positions: Optional list of (x, y, [dx, dy]) per player,
+                                defaults to a ring around the board centre
+        :param wrap: Play on a torus instead of a walled board
+        """
+        if not 2 <= num_players <= MAX_PLAYERS:
+            raise ValueError(f"num_players must be between 2 and {MAX_PLAYERS}")
+        if not (0 < width <= MAX_BOARD_SIZE and 0 < height <= MAX_BOARD_SIZE):
+            raise ValueError(f"Board sides must be between 1 and {MAX_BOARD_SIZE}")
+        self.width = width
+        self.height = height
+        self.num_players = num_players
+        self.ais = ais
+        self.topology = Topology(width, height, wrap)
+        # Flat board with wall sentinels; self.board is the (height, width) playing area
+        self.cells = self.topology.new_board()
+        self.board = self.topology.interior(self.cells)
+        self.colors = player_colors(num_players)
+        # Flat indices of every cell written since the last reset
+        self.touched = array('q')
+        self.reset(start_positions)
+
+    @property
+    def x(self):
+        return self.topology.coords(self.heads)[0]
+
+    @property
+    def y(self):
+        return self.topology.coords(self.heads)[1]
+
+    @property
+    def direction(self):
+        """
+        (num_players, 2) array with the current direction vector of every bike.
+        """
+        return DIRECTIONS[self.dir_index]
+
+    def reset(self, start_positions=None):
+        """
+        Clear the board and put every bike back on its start cell.
+        Only the cells written during the last game are cleared, so the cost
+        follows the game length instead of the board area.
+        :param start_positions: Same as in __init__
+        """
+        if start_positions is None:
+            start_positions = ring_start_positions(self.width, self.height, self.num_players)
+        if len({(x, y) for x, y, _ in start_positions}) != self.num_players:
+            raise ValueError("Start positions must be distinct, one per player")
+        self.cells[np.frombuffer(self.touched, dtype=np.int64)] = 0
+        del self.touched[:]
+        self.heads = self.topology.index([x for x, _, _ in start_positions],
+                                         [y for _, y, _ in start_positions])
+        self.dir_index = direction_indices([d for _, _, d in start_positions])
+        self.alive = np.ones(self.num_players, dtype=bool)
+        self.ids = np.arange(1, self.num_players + 1, dtype=np.int8)
+        self.cells[self.heads] = self.ids
+        self.touched.extend(self.heads)
+        self.steps = 0
+
+    def step(self, directions=None):
+        """
+        Move every living bike one cell at the same time.
+        Bikes that leave the board, enter a trail or enter the same cell as
+        another bike crash and stay where they are.
+        :param directions: Optional (num_players, 2) array of requested directions;
+                           by default each living player's AI is asked
+        :return: Array with the ids of the players that crashed this step
+        """
+        idx = np.flatnonzero(self.alive)
+        if directions is None:
+            directions = np.zeros((self.num_players, 2), dtype=np.int64)
+            for i in idx:
+                directions[i] = self.ais[i].get_direction()
+        return self.step_indices(direction_indices(directions))
+
+    def step_indices(self, requested):
+        """
+        Same as step() with direction indices (see topology.DIRECTIONS) instead of vectors.
+        :param requested: Array with one direction index per player, -1 to keep going
+        :return: Array with the ids of the players that crashed this step
+        """
+        idx = np.flatnonzero(self.alive)
+        requested = np.asarray(requested)[idx]
+
+        # Same rule as Player.change_direction: only perpendicular turns are taken
+        current = self.dir_index[idx]
+        turn = (requested >= 0) & is_turn(current, requested)
+        current[turn] = requested[turn]
+        self.dir_index[idx] = current
+
+        # One table lookup per head; walls are sentinel cells, so one board
+        # lookup covers both leaving the board and hitting a trail
+        target = self.topology.neighbors[self.heads[idx], current]
+        crashed = self.cells[target] != 0
+
+        # Head-on conflicts: count bikes per target cell over the heads only, so the
+        # cost depends on the number of players and not on the board area
+        _, inverse, counts = np.unique(target, return_inverse=True, return_counts=True)
+        crashed |= counts[inverse] > 1
+
+        movers = idx[~crashed]
+        self.heads[movers] = target[~crashed]
+        self.cells[target[~crashed]] = self.ids[movers]
+        self.touched.extend(target[~crashed])
+        self.alive[idx[crashed]] = False
+        self.steps += 1
+        return self.ids[idx[crashed]]
+
+    def is_over(self):
+        return np.count_nonzero(self.alive) <= 1
+
+    def winner(self):
+        """
+        :return: Id of the last bike alive, 0 for a draw or while the game is running
+        """
+        alive = np.flatnonzero(self.alive)
+        return int(self.ids[alive[0]]) if len(alive) == 1 else 0
+
+    def draw(self, screen):
+        """
+        Draw the board scaled to the screen in one blit.
+        :param screen: Pygame screen object to draw on
+        """
+        palette = np.vstack([[50, 50, 50], self.colors]).astype(np.uint8)
+        surface = pygame.surfarray.make_surface(palette[self.board.T])
+        screen.blit(pygame.transform.scale(surface, screen.get_size()), (0, 0))
+
+def player_colors(num_players):
+    """
+    :return: (num_players, 3) array of evenly spaced, saturated RGB colors
+    """
+    return np.array([[int(255 * c) for c in colorsys.hsv_to_rgb(i / num_players, 0.9, 0.95)]
+                     for i in range(num_players)], dtype=np.uint8)
+
+def ring_start_positions(width, height, num_players):
+    """
+    Spread the bikes on an ellipse around the centre, each heading along the ring.
+    :return: List of (x, y, [dx, dy]) per player
+    """
+    positions = []
+    for i in range(num_players):
+        angle = 2 * np.pi * i / num_players
+        x = int(round((width - 1) / 2 + 0.35 * (width - 1) * np.cos(angle)))
+        y = int(round((height - 1) / 2 + 0.35 * (height - 1) * np.sin(angle)))
+        # Tangent of the ring, snapped to the closest axis direction
+        tx, ty = -np.sin(angle), np.cos(angle)
+        direction = [int(np.sign(tx)), 0] if abs(tx) >= abs(ty) else [0, int(np.sign(ty))]
+        positions.append((x, y, direction))
+    return positions
+
+def main():
+    """
+    Run an N-player game with MockAI bikes.
+    """
+    parser = argparse.ArgumentParser(description="Many-player Tron")
+    parser.add_argument("--width", type=int, default=200)
+    parser.add_argument("--height", type=int, default=150)
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--cell-size", type=int, default=4)
+    parser.add_argument("--wrap", action="store_true", help="Play on a torus without walls")
+    args = parser.parse_args()
+
+    game = MultiTronGame(args.width, args.height, args.players,
+                         [MockAI() for _ in range(args.players)], wrap=args.wrap)
+    pygame.init()
+    screen = pygame.display.set_mode((args.width * args.cell_size, args.height * args.cell_size))
+    pygame.display.set_caption("Tron Game")
+    clock = pygame.time.Clock()
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        if running:
+            game.step()
+            if game.is_over():
+                running = False
+                winner = game.winner()
+                print(f"Player {winner} wins!" if winner else "It's a draw!")
+        game.draw(screen)
+        pygame.display.flip()
+        clock.tick(30)
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
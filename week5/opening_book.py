@@ -0,0 +1,192 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from search_state import SearchState, paranoid, playable_moves
+from topology import Topology, DIRECTIONS, direction_indices
+
+# The book maps the moves played so far from the standard start to the best move of
+# each player. It is an open-addressing hash table (linear probing, key 0 = empty slot)
+# saved as a .npy file, so it can be memory-mapped and only the probed slots are read.
+# Settings live in a small JSON file next to it.
+
+SLOT_DTYPE = np.dtype([("key", "<u8"), ("move1", "i1"), ("move2", "i1")])
+_FNV_OFFSET = 0xcbf29ce484222325
+_FNV_PRIME = 0x100000001b3
+_MASK = (1 << 64) - 1
+
+# Standard start of tron_game.main
+STANDARD_START = {"width": 40, "height": 30, "starts": [[10, 15], [30, 15]], "dirs": [3, 2]}
+
+def history_key(moves):
+    """
+    64-bit FNV-1a hash of a move history, never 0.
+    :param moves: Sequence of (player 1 direction index, player 2 direction index) per ply
+    """
+    key = _FNV_OFFSET
+    for move1, move2 in moves:
+        key = ((key ^ (move1 * 4 + move2 + 1)) * _FNV_PRIME) & _MASK
+    return key or 1
+
+def start_state(settings):
+    topology = Topology(settings["width"], settings["height"])
+    (x1, y1), (x2, y2) = settings["starts"]
+    heads = topology.index(np.array([x1, x2]), np.array([y1, y2]))
+    # Start cells stay empty, as on a fresh GameBoard
+    return SearchState(topology, topology.new_board(), heads, settings["dirs"])
+
+def search_position(settings, moves, depth):
+    """
+    Best move of both players after a move history.
+    :return: (history, player 1 move, player 2 move)
+    """
+    state = start_state(settings)
+    for move1, move2 in moves:
+        state.apply(move1, move2)
+    _, move1 = paranoid(state, depth, 0)
+    _, move2 = paranoid(state, depth, 1)
+    return moves, move1, move2
+
+def book_positions(settings, plies):
+    """
+    :return: Every move history shorter than plies after which the game still runs
+    """
+    positions = [()]
+    layer = [()]
+    state = start_state(settings)
+    for _ in range(plies - 1):
+        next_layer = []
+        for moves in layer:
+            for move in moves:
+                state.apply(*move)
+            for move1 in playable_moves(state, 0):
+                for move2 in playable_moves(state, 1):
+                    if state.apply(move1, move2) == 0:
+                        next_layer.append(moves + ((move1, move2),))
+                    state.undo()
+            for _ in moves:
+                state.undo()
+        positions += next_layer
+        layer = next_layer
+    return positions
+
+def _search_batch(settings, histories, depth):
+    return [search_position(settings, moves, depth) for moves in histories]
+
+def generate_book(path, plies=3, depth=4, settings=None, workers=None, chunk=16):
+    """
+    Search every position of the first plies moves and write the book.
+    :param path: .npy file for the table; settings go to path + ".json"
+    :param plies: Book depth in moves from the start
+    :param depth: Search depth in moves for every book position
+    :param settings: Board size, start cells and start directions; the standard start by default
+    :param workers: Worker processes
+    :return: Number of positions in the book
+    """
+    settings = dict(settings or STANDARD_START)
+    positions = book_positions(settings, plies)
+    batches = [positions[i:i + chunk] for i in range(0, len(positions), chunk)]
+    capacity = 1 << max(4, (2 * len(positions) - 1).bit_length())
+    table = np.lib.format.open_memmap(path, mode="w+", dtype=SLOT_DTYPE, shape=(capacity,))
+    table["key"] = 0
+    mask = capacity - 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for results in pool.map(_search_batch, [settings] * len(batches), batches, [depth] * len(batches)):
+            for moves, move1, move2 in results:
+                key = history_key(moves)
+                slot = key & mask
+                while table["key"][slot] != 0:
+                    slot = (slot + 1) & mask
+                table[slot] = (key, move1, move2)
+    table.flush()
+    del table
+    with open(path + ".json", "w") as f:
+        json.dump(dict(settings, plies=plies, depth=depth, entries=len(positions)), f)
+    return len(positions)
+
+class OpeningBook:
+    def __init__(self, path):
+        """
+        Memory-map a book written by generate_book.
+        """
+        with open(path + ".json") as f:
+            self.settings = json.load(f)
+        self.plies = self.settings["plies"]
+        table = np.load(path, mmap_mode="r")
+        self.keys = table["key"]
+        self.moves1 = table["move1"]
+        self.moves2 = table["move2"]
+        self.mask = len(table) - 1
+
+    def lookup(self, moves):
+        """
+        :param moves: Move history from the start as (direction index, direction index) pairs
+        :return: (player 1 move, player 2 move), or None outside the book
+        """
+        if len(moves) >= self.plies:
+            return None
+        key = history_key(moves)
+        slot = key & self.mask
+        while True:
+            stored = int(self.keys[slot])
+            if stored == key:
+                return int(self.moves1[slot]), int(self.moves2[slot])
+            if stored == 0:
+                return None
+            slot = (slot + 1) & self.mask
+
+def trail_moves(player1, player2):
+    """
+    Move history of a game from the players' trails.
+    :return: List of (player 1 direction index, player 2 direction index)
+    """
+    trails = [np.frombuffer(p.trail, dtype=np.int16).reshape(-1, 2) for p in (player1, player2)]
+    plies = min(len(trails[0]), len(trails[1])) - 1
+    steps = [direction_indices(np.diff(trail[:plies + 1], axis=0)) for trail in trails]
+    return list(zip(steps[0].tolist(), steps[1].tolist()))
+
+class BookAI:
+    def __init__(self, book, player, opponent, fallback):
+        """
+        Play book moves while the game is in the book, then ask the fallback AI.
+        :param book: OpeningBook
+        :param player: Player controlled by this AI
+        :param opponent: The other Player
+        :param fallback: AI used outside the book
+        """
+        self.book = book
+        self.player = player
+        self.opponent = opponent
+        self.fallback = fallback
+        self.starts = [tuple(start) for start in book.settings["starts"]]
+
+    def get_direction(self, *args):
+        mine = (self.player.trail[0], self.player.trail[1])
+        theirs = (self.opponent.trail[0], self.opponent.trail[1])
+        if len(self.player.trail) // 2 <= self.book.plies and {mine, theirs} == set(self.starts):
+            index = self.starts.index(mine)
+            if index == 0:
+                moves = trail_moves(self.player, self.opponent)
+            else:
+                moves = trail_moves(self.opponent, self.player)
+            entry = self.book.lookup(moves)
+            if entry is not None and entry[index] >= 0:
+                return DIRECTIONS[entry[index]].tolist()
+        return self.fallback.get_direction(*args)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the opening book for the standard start")
+    parser.add_argument("--output", default="opening_book.npy")
+    parser.add_argument("--plies", type=int, default=3)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    entries = generate_book(args.output, args.plies, args.depth, workers=args.workers)
+    print(f"Wrote {entries} positions to {args.output} in {time.perf_counter() - start:.1f}s "
+          f"({os.path.getsize(args.output)} bytes)")
+
+if __name__ == "__main__":
+    main()
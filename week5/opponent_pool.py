@@ -0,0 +1,165 @@
+import hashlib
+import numpy as np
+from policy_ai import ACTIVATIONS, forward, load_policy
+from topology import relative_to_absolute
+from vec_env import RandomOpponent
+
+class OpponentPool:
+    def __init__(self, priority_power=2.0, seed=0):
+        """
+        Frozen policy snapshots for self-play. Snapshots are NumPy weights in the
+        PolicyAI layout and identical weights are stored once.
+        :param priority_power: Exponent p of the prioritized sampling weight
+                               (1 - learner win rate) ** p; 0 samples uniformly
+        :param seed: Seed of the sampling generator
+        """
+        self.priority_power = priority_power
+        self.rng = np.random.default_rng(seed)
+        self.snapshots = []
+        self.activations = []
+        self.keys = {}
+        self.wins = np.zeros(0)
+        self.games = np.zeros(0)
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def add(self, weights, activations):
+        """
+        Freeze a snapshot of a policy.
+        :param weights: Flat list [W0, b0, W1, b1, ...] as returned by model.get_weights()
+        :param activations: Activation name for each layer
+        :return: Id of the snapshot; the id of the existing copy if it was added before
+        """
+        arrays = [np.array(w, dtype=np.float32) for w in weights]
+        digest = hashlib.sha1()
+        for name in activations:
+            digest.update(name.encode())
+        for array in arrays:
+            digest.update(str(array.shape).encode())
+            digest.update(array.tobytes())
+        key = digest.hexdigest()
+        if key in self.keys:
+            return self.keys[key]
+
+        for array in arrays:
+            array.flags.writeable = False
+        snapshot_id = len(self.snapshots)
+        self.snapshots.append([(arrays[2 * i], arrays[2 * i + 1], ACTIVATIONS[name])
+                               for i, name in enumerate(activations)])
+        self.activations.append(list(activations))
+        self.keys[key] = snapshot_id
+        self.wins = np.append(self.wins, 0.0)
+        self.games = np.append(self.games, 0.0)
+        return snapshot_id
+
+    def add_file(self, path):
+        """
+        Add a policy saved by save_policy or DQNAgent.export_numpy.
+        :return: Id of the snapshot
+        """
+        layers = load_policy(path)
+        weights = [array for weights, bias, _ in layers for array in (weights, bias)]
+        return self.add(weights, [name for _, _, name in layers])
+
+    def win_rates(self):
+        """
+        :return: Learner win rate against every snapshot, with one win and one loss as prior
+        """
+        return (self.wins + 1) / (self.games + 2)
+
+    def sample(self, n):
+        """
+        Pick n opponents, preferring the snapshots the learner does worst against.
+        :return: Array of snapshot ids
+        """
+        if not self.snapshots:
+            raise ValueError("The opponent pool is empty")
+        weights = (1 - self.win_rates()) ** self.priority_power
+        return self.rng.choice(len(self.snapshots), size=n, p=weights / weights.sum())
+
+    def record(self, ids, scores):
+        """
+        Update the statistics of finished games.
+        :param ids: Snapshot id of every game
+        :param scores: Learner score of every game: 1 win, 0.5 draw, 0 loss
+        """
+        np.add.at(self.wins, ids, scores)
+        np.add.at(self.games, ids, 1)
+
+    def act(self, ids, observations):
+        """
+        Greedy actions of many opponents; all games that share a snapshot are
+        evaluated in one forward pass.
+        :param ids: Snapshot id per game
+        :param observations: (games, observation size) array
+        :return: Action index per game
+        """
+        actions = np.empty(len(ids), dtype=np.int64)
+        unique, inverse = np.unique(ids, return_inverse=True)
+        for group, snapshot_id in enumerate(unique):
+            rows = np.flatnonzero(inverse == group)
+            actions[rows] = np.argmax(forward(self.snapshots[snapshot_id], observations[rows]), axis=1)
+        return actions
+
+    def save(self, path):
+        arrays = {"wins": self.wins, "games": self.games}
+        for i, (layers, activations) in enumerate(zip(self.snapshots, self.activations)):
+            arrays[f"s{i}_activations"] = np.array(activations)
+            for j, (weights, bias, _) in enumerate(layers):
+                arrays[f"s{i}_W{j}"] = weights
+                arrays[f"s{i}_b{j}"] = bias
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path, priority_power=2.0, seed=0):
+        pool = cls(priority_power, seed)
+        with np.load(path, allow_pickle=False) as data:
+            for i in range(len(data["wins"])):
+                activations = [str(name) for name in data[f"s{i}_activations"]]
+                weights = []
+                for j in range(len(activations)):
+                    weights += [data[f"s{i}_W{j}"], data[f"s{i}_b{j}"]]
+                pool.add(weights, activations)
+            pool.wins = data["wins"].astype(np.float64)
+            pool.games = data["games"].astype(np.float64)
+        return pool
+
+class PoolOpponent:
+    def __init__(self, pool, num_envs, random_fraction=0.0, seed=0, relative=False):
+        """
+        VecTronEnv opponent that gives every game its own snapshot from the pool and
+        draws a new one when the game ends.
+        :param pool: OpponentPool with at least one snapshot
+        :param num_envs: Number of games in the environment
+        :param random_fraction: Share of games played against random moves instead of
+                                the pool; lower it over training as a curriculum
+        :param relative: The snapshots output relative actions (turn left, straight, turn right)
+        """
+        self.pool = pool
+        self.random_fraction = random_fraction
+        self.relative = relative
+        self.rng = np.random.default_rng(seed)
+        self.random = RandomOpponent(seed)
+        self.assigned = self._draw(num_envs)
+
+    def _draw(self, n):
+        # -1 marks a game against random moves
+        ids = self.pool.sample(n)
+        ids[self.rng.random(n) < self.random_fraction] = -1
+        return ids
+
+    def act(self, observations, dirs):
+        actions = self.random.act(observations, dirs)
+        rows = np.flatnonzero(self.assigned >= 0)
+        if len(rows):
+            chosen = self.pool.act(self.assigned[rows], observations[rows])
+            actions[rows] = relative_to_absolute(dirs[rows], chosen) if self.relative else chosen
+        return actions
+
+    def episode_end(self, env_ids, results):
+        ids = self.assigned[env_ids]
+        scores = np.select([results == 1, results == 3], [1.0, 0.5], 0.0)
+        from_pool = ids >= 0
+        self.pool.record(ids[from_pool], scores[from_pool])
+        self.assigned[env_ids] = self._draw(len(env_ids))
@@ -1,6 +1,11 @@
 import pygame
+from array import array
+from profiler import PROFILER
 
 class Player:
+    # No per-instance __dict__; the trail is a flat array of x, y pairs (4 bytes per cell)
+    __slots__ = ("x", "y", "color", "player_id", "direction", "trail", "ai")
+
     def __init__(self, x, y, color, player_id, ai):
         """
         Initialize the player.
@@ -15,18 +20,23 @@ class Player:
         self.color = color
         self.player_id = player_id
         self.direction = [1, 0] if player_id == 1 else [-1, 0]
-        self.trail = [(x, y)]
+        self.trail = array('h', (x, y))
         self.ai = ai
 
-    def move(self):
+    def move(self, direction=None):
         """
         Move the player based on their current direction.
+        :param direction: Direction decided elsewhere (e.g. by a DecisionPool);
+                          when None the AI is asked directly
         """
-        new_direction = self.ai.get_direction()
-        self.change_direction(new_direction)
+        if direction is None:
+            with PROFILER.timer("ai_decision"):
+                direction = self.ai.get_direction()
+        self.change_direction(direction)
         self.x += self.direction[0]
         self.y += self.direction[1]
-        self.trail.append((self.x, self.y))
+        self.trail.append(self.x)
+        self.trail.append(self.y)
 
     def change_direction(self, direction):
         """
@@ -41,9 +51,16 @@ class Player:
         Draw the player and their trail on the screen.
         :param screen: Pygame screen object to draw on
         """
-        for x, y in self.trail:
+        trail = self.trail
+        for i in range(0, len(trail), 2):
             pygame.draw.rect(screen, self.color, 
-                             (x * 20, y * 20, 20, 20))
+                             (trail[i] * 20, trail[i + 1] * 20, 20, 20))
+
+    def trail_cells(self):
+        """
+        :return: List of (x, y) tuples visited by the player, oldest first
+        """
+        return list(zip(self.trail[0::2], self.trail[1::2]))
 
     def reset(self, x, y):
         """
@@ -54,4 +71,7 @@ class Player:
         self.x = x
         self.y = y
         self.direction = [1, 0] if self.player_id == 1 else [-1, 0]
-        self.trail = [(x, y)]
\ No newline at end of file
+        # Reuse the existing buffer instead of allocating a new one
+        del self.trail[:]
+        self.trail.append(x)
+        self.trail.append(y)
\ No newline at end of file
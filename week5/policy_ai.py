@@ -0,0 +1,80 @@
+import numpy as np
+
+# Activations supported by the exporter; each one works in place on a float32 array
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0, out=x),
+    'tanh': lambda x: np.tanh(x, out=x),
+    'sigmoid': lambda x: np.divide(1, 1 + np.exp(-x, out=x), out=x),
+}
+
+def save_policy(path, weights, activations):
+    """
+    Save a policy in the same .npz layout as DQNAgent.export_numpy.
+    :param path: File to write
+    :param weights: Flat list [W0, b0, W1, b1, ...] as returned by model.get_weights()
+    :param activations: Activation name for each layer
+    """
+    arrays = {}
+    for i in range(len(weights) // 2):
+        arrays[f"W{i}"] = np.asarray(weights[2 * i], dtype=np.float32)
+        arrays[f"b{i}"] = np.asarray(weights[2 * i + 1], dtype=np.float32)
+    np.savez(path, activations=np.array(activations), **arrays)
+
+def load_policy(path):
+    """
+    Load a policy saved by save_policy or DQNAgent.export_numpy.
+    :param path: .npz file to read
+    :return: List of (weights, bias, activation name) per layer
+    """
+    with np.load(path, allow_pickle=False) as data:
+        activations = [str(name) for name in data["activations"]]
+        return [(np.ascontiguousarray(data[f"W{i}"], dtype=np.float32),
+                 np.ascontiguousarray(data[f"b{i}"], dtype=np.float32),
+                 name)
+                for i, name in enumerate(activations)]
+
+def forward(layers, state):
+    """
+    Forward pass of a loaded policy.
+    :param layers: List of (weights, bias, activation function)
+    :param state: Array of shape (state_size,) or (batch, state_size)
+    :return: Outputs of shape (batch, action_size)
+    """
+    x = np.asarray(state, dtype=np.float32).reshape(-1, layers[0][0].shape[0])
+    for weights, bias, activation in layers:
+        x = activation(x @ weights + bias)
+    return x
+
+class PolicyAI:
+    def __init__(self, weights_path, observe=None, directions=None):
+        """
+        Run a trained Q-network with NumPy only, no TensorFlow import needed.
+        :param weights_path: .npz file written by DQNAgent.export_numpy
+        :param observe: Optional callable returning the current state vector,
+                        used when get_direction is called without arguments
+        :param directions: Direction for each network output (defaults to MockAI's order)
+        """
+        self.layers = [(weights, bias, ACTIVATIONS[name])
+                       for weights, bias, name in load_policy(weights_path)]
+        self.directions = directions or [[0, -1], [0, 1], [-1, 0], [1, 0]]
+        self.observe = observe
+        if len(self.directions) != self.layers[-1][1].shape[0]:
+            raise ValueError("Number of directions does not match the network output size")
+
+    def q_values(self, state):
+        """
+        Forward pass for one state or a batch of states.
+        :param state: Array of shape (state_size,) or (batch, state_size)
+        :return: Q-values of shape (batch, action_size)
+        """
+        return forward(self.layers, state)
+
+    def get_direction(self, *args):
+        """
+        Pick the direction with the highest Q-value.
+        :param args: Optional state vector; falls back to self.observe()
+        :return: Direction as a list [dx, dy]
+        """
+        state = args[0] if args else self.observe()
+        return self.directions[int(np.argmax(self.q_values(state)[0]))]
@@ -0,0 +1,183 @@
+from array import array
+import numpy as np
+import kernels
+from kernels import state_from_game
+from topology import Topology
+
+# Fields of one undo entry: previous heads, previous directions and the result of the move
+_ENTRY = 5
+# Value of a won position for the searches below, larger than any territory difference
+WIN = 1_000_000
+
+class SearchState:
+    def __init__(self, topology, cells, heads, dirs, max_depth=4096):
+        """
+        Mutable two-player position for tree search. apply() plays one simultaneous move
+        in place with the rules of kernels.step and pushes a fixed-size entry on a
+        preallocated undo stack; undo() pops it in O(1). Nothing is allocated per node.
+        :param topology: Topology of the board
+        :param cells: Flat board as built by topology.new_board(), copied
+        :param heads: Flat head index of player 1 and 2
+        :param dirs: Direction index of player 1 and 2
+        :param max_depth: Capacity of the undo stack in moves
+        """
+        self.topology = topology
+        # Scalar reads and writes go through the bytearray (walls read as 255, still
+        # non-zero); cells is a NumPy view of the same memory for the kernels
+        self.board = bytearray(np.asarray(cells, dtype=np.int8).tobytes())
+        self.cells = np.frombuffer(self.board, dtype=np.int8)
+        self.neighbors = topology.neighbors.tolist()
+        self.h1, self.h2 = int(heads[0]), int(heads[1])
+        self.d1, self.d2 = int(dirs[0]), int(dirs[1])
+        self.result = 0
+        self.depth = 0
+        self.max_depth = max_depth
+        self.stack = array('q', bytes(8 * _ENTRY * max_depth))
+
+    @classmethod
+    def from_game(cls, game_board, player1, player2, topology=None, max_depth=4096):
+        """
+        Build a search state from a week5 GameBoard and its two Players.
+        """
+        if topology is None:
+            topology = Topology(game_board.width, game_board.height)
+        cells, heads, dirs = state_from_game(topology, game_board, player1, player2)
+        return cls(topology, cells, heads, dirs, max_depth)
+
+    @property
+    def heads(self):
+        return self.h1, self.h2
+
+    @property
+    def dirs(self):
+        return self.d1, self.d2
+
+    def moves(self, player):
+        """
+        :param player: 0 for player 1, 1 for player 2
+        :return: Directions that do not reverse and lead to an empty cell
+        """
+        head, current = (self.h1, self.d1) if player == 0 else (self.h2, self.d2)
+        targets = self.neighbors[head]
+        board = self.board
+        return [d for d in range(4)
+                if ((d >> 1) != (current >> 1) or d == current) and board[targets[d]] == 0]
+
+    def apply(self, requested1, requested2):
+        """
+        Move both players, as kernels.step; -1 keeps a player going straight.
+        :return: Result code, as update_game_state
+        """
+        if self.result:
+            raise ValueError("The game is already over")
+        if self.depth == self.max_depth:
+            raise IndexError("Undo stack is full")
+        stack = self.stack
+        sp = self.depth * _ENTRY
+        h1, h2, d1, d2 = self.h1, self.h2, self.d1, self.d2
+        stack[sp] = h1
+        stack[sp + 1] = h2
+        stack[sp + 2] = d1
+        stack[sp + 3] = d2
+
+        if requested1 >= 0 and (requested1 >> 1) != (d1 >> 1):
+            d1 = requested1
+        if requested2 >= 0 and (requested2 >> 1) != (d2 >> 1):
+            d2 = requested2
+        t1 = self.neighbors[h1][d1]
+        t2 = self.neighbors[h2][d2]
+        board = self.board
+        c1 = board[t1] != 0
+        c2 = board[t2] != 0
+        if t1 == t2 or (c1 and c2):
+            result = 3
+        elif c1:
+            result = 2
+        elif c2:
+            result = 1
+        else:
+            result = 0
+            board[t1] = 1
+            board[t2] = 2
+            self.h1, self.h2 = t1, t2
+        self.d1, self.d2 = d1, d2
+        stack[sp + 4] = result
+        self.result = result
+        self.depth += 1
+        return result
+
+    def undo(self):
+        """
+        Take back the last apply().
+        """
+        if self.depth == 0:
+            raise IndexError("Nothing to undo")
+        self.depth -= 1
+        stack = self.stack
+        sp = self.depth * _ENTRY
+        if stack[sp + 4] == 0:
+            # Only a move that did not end the game wrote its two head cells
+            self.board[self.h1] = 0
+            self.board[self.h2] = 0
+        self.h1 = stack[sp]
+        self.h2 = stack[sp + 1]
+        self.d1 = stack[sp + 2]
+        self.d2 = stack[sp + 3]
+        self.result = 0
+
+def playable_moves(state, player):
+    """
+    :return: state.moves(player), or the current direction when every move crashes
+    """
+    return state.moves(player) or [state.d1 if player == 0 else state.d2]
+
+def evaluate(state, player):
+    """
+    Static value for player: +-WIN or 0 for finished games, otherwise the difference
+    of the Voronoi territories (kernels.territory).
+    """
+    if state.result:
+        if state.result == 3:
+            return 0
+        return WIN if state.result == player + 1 else -WIN
+    counts = kernels.territory(state.cells, state.topology.neighbors, np.array(state.heads))
+    return int(counts[player] - counts[1 - player])
+
+def paranoid(state, depth, player):
+    """
+    Depth-limited search of the simultaneous-move game from player's side, assuming
+    the opponent answers knowing player's move (so the value is a lower bound).
+    :return: (value, best move of player, -1 at a leaf)
+    """
+    if state.result or depth == 0:
+        return evaluate(state, player), -1
+    best, best_move = None, -1
+    for mine in playable_moves(state, player):
+        worst = None
+        for theirs in playable_moves(state, 1 - player):
+            state.apply(*((mine, theirs) if player == 0 else (theirs, mine)))
+            value, _ = paranoid(state, depth - 1, player)
+            state.undo()
+            if worst is None or value < worst:
+                worst = value
+            if best is not None and worst <= best:
+                break  # This move cannot beat the best one any more
+        if best is None or worst > best:
+            best, best_move = worst, mine
+    return best, best_move
+
+def move_values(state, depth, player):
+    """
+    Paranoid value of every playable move of player, searched to depth moves.
+    :return: List of (direction index, value)
+    """
+    values = []
+    for mine in playable_moves(state, player):
+        worst = None
+        for theirs in playable_moves(state, 1 - player):
+            state.apply(*((mine, theirs) if player == 0 else (theirs, mine)))
+            value, _ = paranoid(state, depth - 1, player)
+            state.undo()
+            worst = value if worst is None else min(worst, value)
+        values.append((mine, worst))
+    return values
@@ -0,0 +1,234 @@
+import argparse
+import asyncio
+import struct
+from array import array
+
+# Spectator feed, all little-endian. Per step only what changed is sent:
+#   DELTA     type=1, game id, step, x1, y1, x2, y2 (heads after the step), result
+#   KEYFRAME  type=2, game id, step, width, height, result, length of trail 1 and 2 in
+#             cells, followed by both trails as int16 x, y pairs
+#   RESET     type=3, forget every game; keyframes of the running games follow
+# A viewer gets a KEYFRAME of every running game when it connects (and when a game
+# starts), then DELTAs. A result other than 0 ends the game; the heads did not move then.
+# A viewer too slow to keep up misses deltas and is resynced with RESET and keyframes.
+DELTA = struct.Struct("<BIIHHHHB")
+KEYFRAME = struct.Struct("<BIIHHBII")
+MSG_DELTA, MSG_KEYFRAME, MSG_RESET = 1, 2, 3
+
+class GameFeed:
+    def __init__(self, game_id, width, height, heads):
+        """
+        State of one published game, enough to build a keyframe at any step.
+        :param heads: (x, y) of player 1 and 2 at the start
+        """
+        self.game_id = game_id
+        self.width = width
+        self.height = height
+        self.step = 0
+        self.result = 0
+        self.trails = [array('h', head) for head in heads]
+
+    def advance(self, step, heads, result):
+        self.step = step
+        self.result = result
+        if result == 0:
+            for trail, head in zip(self.trails, heads):
+                trail.extend(head)
+
+    def keyframe(self):
+        header = KEYFRAME.pack(MSG_KEYFRAME, self.game_id, self.step, self.width, self.height,
+                               self.result, len(self.trails[0]) // 2, len(self.trails[1]) // 2)
+        return header + self.trails[0].tobytes() + self.trails[1].tobytes()
+
+class Viewer:
+    def __init__(self, writer):
+        self.writer = writer
+        # Set when deltas were dropped; the viewer resyncs with keyframes
+        self.behind = False
+
+class SpectatorHub:
+    def __init__(self, max_buffer=1 << 20):
+        """
+        Broadcast running games to any number of viewers on one event loop. The game
+        loop calls start_game() and publish(), which only queue bytes and never wait.
+        :param max_buffer: Bytes a viewer may have unsent; beyond that its deltas are
+                           dropped and it gets fresh keyframes once it has caught up
+        """
+        self.max_buffer = max_buffer
+        self.games = {}
+        self.viewers = set()
+
+    async def start(self, host="127.0.0.1", port=0, path=None):
+        """
+        Start listening for viewers on TCP, or on a Unix socket when path is given.
+        :return: asyncio Server object
+        """
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle_viewer, path)
+        else:
+            self.server = await asyncio.start_server(self._handle_viewer, host, port)
+        return self.server
+
+    async def close(self):
+        self.server.close()
+        for viewer in list(self.viewers):
+            viewer.writer.close()
+        await self.server.wait_closed()
+
+    async def _handle_viewer(self, reader, writer):
+        viewer = Viewer(writer)
+        for feed in self.games.values():
+            writer.write(feed.keyframe())
+        self.viewers.add(viewer)
+        try:
+            # Viewers do not send anything; reading only notices the disconnect
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.viewers.discard(viewer)
+            writer.close()
+
+    def start_game(self, game_id, width, height, heads):
+        """
+        :param heads: (x, y) of player 1 and 2 at the start
+        """
+        feed = GameFeed(game_id, width, height, heads)
+        self.games[game_id] = feed
+        self._broadcast(feed.keyframe())
+
+    def publish(self, game_id, step, heads, result):
+        """
+        Publish one step of a game started with start_game().
+        :param step: Number of steps played
+        :param heads: (x, y) of player 1 and 2 after the step
+        :param result: Result code of the step, as update_game_state
+        """
+        feed = self.games[game_id]
+        feed.advance(step, heads, result)
+        (x1, y1), (x2, y2) = heads
+        self._broadcast(DELTA.pack(MSG_DELTA, game_id, step, x1, y1, x2, y2, result))
+        if result:
+            del self.games[game_id]
+
+    def _broadcast(self, data):
+        for viewer in list(self.viewers):
+            transport = viewer.writer.transport
+            if transport.is_closing():
+                self.viewers.discard(viewer)
+            elif transport.get_write_buffer_size() > self.max_buffer:
+                viewer.behind = True
+            elif viewer.behind:
+                # The keyframes already contain this step
+                viewer.behind = False
+                viewer.writer.write(bytes([MSG_RESET]))
+                for feed in self.games.values():
+                    viewer.writer.write(feed.keyframe())
+            else:
+                viewer.writer.write(data)
+
+class GameView:
+    def __init__(self, width, height):
+        """
+        A viewer's copy of one game.
+        """
+        self.width = width
+        self.height = height
+        self.step = 0
+        self.result = 0
+        self.trails = [[], []]
+
+    @property
+    def heads(self):
+        return [trail[-1] for trail in self.trails]
+
+    def grid(self):
+        """
+        :return: Board as a GameBoard.grid (list of rows, player ids in trail cells)
+        """
+        grid = [[0] * self.width for _ in range(self.height)]
+        for player_id, trail in enumerate(self.trails, 1):
+            for x, y in trail:
+                grid[y][x] = player_id
+        return grid
+
+class SpectatorClient:
+    def __init__(self):
+        """
+        Follow every game of a SpectatorHub. Finished games move from games to results.
+        """
+        self.games = {}
+        self.results = {}
+
+    async def connect(self, host="127.0.0.1", port=8766, path=None):
+        if path is not None:
+            self.reader, self.writer = await asyncio.open_unix_connection(path)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(host, port)
+
+    def close(self):
+        self.writer.close()
+
+    async def read_message(self):
+        """
+        Read one message and apply it.
+        :return: (message type, game id)
+        """
+        msg_type = (await self.reader.readexactly(1))[0]
+        if msg_type == MSG_DELTA:
+            body = await self.reader.readexactly(DELTA.size - 1)
+            _, game_id, step, x1, y1, x2, y2, result = DELTA.unpack(bytes([msg_type]) + body)
+            view = self.games.get(game_id)
+            if view is None:
+                # Deltas of a game whose keyframe was never received are skipped
+                return msg_type, game_id
+            view.step = step
+            view.result = result
+            if result == 0:
+                view.trails[0].append((x1, y1))
+                view.trails[1].append((x2, y2))
+        elif msg_type == MSG_KEYFRAME:
+            body = await self.reader.readexactly(KEYFRAME.size - 1)
+            _, game_id, step, width, height, result, n1, n2 = KEYFRAME.unpack(bytes([msg_type]) + body)
+            view = GameView(width, height)
+            view.step = step
+            view.result = result
+            for i, n in enumerate((n1, n2)):
+                trail = array('h', await self.reader.readexactly(4 * n))
+                view.trails[i] = list(zip(trail[0::2], trail[1::2]))
+            self.games[game_id] = view
+        elif msg_type == MSG_RESET:
+            self.games.clear()
+            return msg_type, None
+        else:
+            raise ValueError(f"Unknown message type {msg_type}")
+        if view.result:
+            self.results[game_id] = self.games.pop(game_id).result
+        return msg_type, game_id
+
+async def watch(host, port, path, games):
+    client = SpectatorClient()
+    await client.connect(host, port, path)
+    try:
+        while games is None or len(client.results) < games:
+            _, game_id = await client.read_message()
+            if game_id in client.results:
+                print(f"Game {game_id}: result {client.results[game_id]} "
+                      f"({len(client.games)} games running)")
+    except asyncio.IncompleteReadError:
+        print("Spectator feed closed")
+    finally:
+        client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Follow the games of a match server's spectator feed")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--unix", default=None, help="Connect to this Unix socket path instead of TCP")
+    parser.add_argument("--games", type=int, default=None, help="Stop after this many finished games")
+    args = parser.parse_args()
+    asyncio.run(watch(args.host, args.port, args.unix, args.games))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import numpy as np
+
+# Rolling hash of a two-player game. The board part is a Zobrist hash: every (player,
+# cell) pair has a random 64-bit key and entering a cell XORs its key in, so a move
+# costs two XORs whatever the board size. Heads, directions and the result are mixed
+# in per step, and every step hash is chained onto the previous one, so two games
+# that differ at some step differ at every later step too. That makes the first
+# divergence of two hash sequences findable by bisection.
+
+_MASK = (1 << 64) - 1
+
+def _mix(x):
+    # splitmix64 finalizer
+    x = ((x ^ (x >> 30)) * 0xbf58476d1ce4e5b9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94d049bb133111eb) & _MASK
+    return x ^ (x >> 31)
+
+class ZobristTable:
+    def __init__(self, width, height, seed=0):
+        """
+        Random keys for every cell, head position, direction and result.
+        :param width: Width of the board in grid cells
+        :param height: Height of the board in grid cells
+        :param seed: Seed of the keys; hashes are only comparable for equal seeds
+        """
+        self.width = width
+        self.height = height
+        rng = np.random.default_rng(seed)
+        draw = lambda *shape: rng.integers(0, 1 << 63, shape, dtype=np.uint64).tolist()
+        # Python ints, so a move is a few list lookups and XORs
+        self.cells = draw(2, width * height)
+        self.heads = draw(2, width * height)
+        self.dirs = draw(2, 4)
+        self.results = draw(4)
+
+class RollingHash:
+    def __init__(self, table, heads, dirs):
+        """
+        :param table: ZobristTable of the board size
+        :param heads: (x, y) of player 1 and 2 at the start
+        :param dirs: Direction index of player 1 and 2 at the start
+        """
+        self.table = table
+        self.board = 0
+        self.value = 0
+        self.value = self._chain(heads, dirs, 0)
+
+    def _chain(self, heads, dirs, result):
+        table = self.table
+        (x1, y1), (x2, y2) = heads
+        w = table.width
+        state = (self.board ^ table.heads[0][y1 * w + x1] ^ table.heads[1][y2 * w + x2]
+                 ^ table.dirs[0][dirs[0]] ^ table.dirs[1][dirs[1]] ^ table.results[result])
+        return _mix(self.value ^ state)
+
+    def update(self, heads, dirs, result):
+        """
+        Hash the position after one move.
+        :param heads: (x, y) of player 1 and 2 after the move
+        :param dirs: Direction index of player 1 and 2 after the move
+        :param result: Result code of the move; 0 means both heads entered new cells
+        :return: New hash value
+        """
+        if result == 0:
+            (x1, y1), (x2, y2) = heads
+            w = self.table.width
+            self.board ^= self.table.cells[0][y1 * w + x1] ^ self.table.cells[1][y2 * w + x2]
+        self.value = self._chain(heads, dirs, result)
+        return self.value
+
+def first_divergence(hashes_a, hashes_b):
+    """
+    First step at which two chained hash sequences differ, by bisection.
+    :return: Step index, or None if the sequences are equal
+    """
+    n = min(len(hashes_a), len(hashes_b))
+    if n == 0 or hashes_a[n - 1] == hashes_b[n - 1]:
+        return None if len(hashes_a) == len(hashes_b) else n
+    # Hashes agree before lo and differ at hi
+    lo, hi = 0, n - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if hashes_a[mid] == hashes_b[mid]:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
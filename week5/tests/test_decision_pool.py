@@ -0,0 +1,107 @@
+import os
+import sys
+import threading
+import time
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from decision_pool import DecisionPool
+from game_board import GameBoard
+from player import Player
+from tron_game import update_game_state
+
+class FixedAI:
+    def __init__(self, direction, delay=0.0):
+        self.direction = direction
+        self.delay = delay
+        self.calls = 0
+
+    def get_direction(self, *args):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.direction
+
+def make_players(ai1, ai2):
+    return [Player(10, 15, (255, 0, 0), 1, ai1), Player(30, 15, (0, 0, 255), 2, ai2)]
+
+class BarrierAI:
+    # Answers only once the other AI has been asked too, so it needs both to run at once
+    def __init__(self, direction, barrier):
+        self.direction = direction
+        self.barrier = barrier
+
+    def get_direction(self, *args):
+        self.barrier.wait()
+        return self.direction
+
+class BrokenAI:
+    def get_direction(self, *args):
+        raise RuntimeError("boom")
+
+def test_ais_are_asked_in_parallel():
+    barrier = threading.Barrier(2, timeout=5)
+    ai1, ai2 = BarrierAI([0, -1], barrier), BarrierAI([0, 1], barrier)
+    pool = DecisionPool([ai1, ai2], time_budget=5)
+    directions = pool.decide(make_players(ai1, ai2))
+    pool.close()
+    assert not barrier.broken, "AIs should be asked at the same time"
+    assert directions == [[0, -1], [0, 1]], "Directions should come from the AIs"
+
+def test_failing_ai_keeps_current_direction():
+    broken, fixed = BrokenAI(), FixedAI([0, 1])
+    pool = DecisionPool([broken, fixed], time_budget=1)
+    players = make_players(broken, fixed)
+    assert pool.decide(players) == [[1, 0], [0, 1]], "Failing AI should keep its current direction"
+    assert pool.decide(players) == [[1, 0], [0, 1]], "Failing AI should be asked again"
+    stats = pool.latency_stats()
+    pool.close()
+    assert stats[0]["errors"] == 2 and stats[0]["timeouts"] == 0
+    assert stats[1]["errors"] == 0
+
+def test_slow_ai_falls_back_to_current_direction():
+    fast, slow = FixedAI([0, -1]), FixedAI([0, 1], delay=0.2)
+    pool = DecisionPool([fast, slow], time_budget=0.02)
+    players = make_players(fast, slow)
+    assert pool.decide(players) == [[0, -1], [-1, 0]], "Slow AI should keep its current direction"
+    assert pool.decide(players) == [[0, -1], [-1, 0]], "Still-running AI should fall back again"
+    assert slow.calls == 1, "Busy AI should not be asked again before it answers"
+    time.sleep(0.25)
+    assert pool.decide(players)[1] == [-1, 0], "Late answer is for an older board and must be dropped"
+    assert slow.calls == 2, "AI should be asked again for the current step"
+    stats = pool.latency_stats()
+    pool.close()
+    assert stats[1]["timeouts"] == 3, "Missed budgets should be counted"
+    assert stats[1]["p50"] >= 0.2, "Latency of the slow AI should be recorded"
+    assert stats[0]["count"] == 3, "Every answer of the fast AI should be recorded"
+
+class GatedAI:
+    # Blocks until released, then answers with the next direction of its list
+    def __init__(self, directions):
+        self.directions = list(directions)
+        self.release = threading.Event()
+
+    def get_direction(self, *args):
+        self.release.wait(5)
+        return self.directions.pop(0)
+
+def test_late_answer_is_not_applied():
+    fast, gated = FixedAI([0, -1]), GatedAI([[0, 1], [0, -1]])
+    pool = DecisionPool([fast, gated], time_budget=0.02)
+    players = make_players(fast, gated)
+    assert pool.decide(players)[1] == [-1, 0], "Blocked AI should keep its current direction"
+    gated.release.set()
+    time.sleep(0.05)
+    direction = pool.decide(players)[1]
+    pool.close()
+    assert direction == [0, -1], "Answer for the earlier step should be replaced by a fresh one"
+    assert gated.directions == [], "AI should be asked again for the current step"
+
+def test_update_game_state_with_directions():
+    board = GameBoard(40, 30)
+    player1, player2 = make_players(FixedAI([1, 0]), FixedAI([-1, 0]))
+    # Player 2 turns up before the collision check, so the move is safe
+    board.grid[15][29] = 1
+    assert update_game_state(player1, player2, board, [[1, 0], [0, -1]]) == 0, "Turn should avoid the trail"
+    assert (player2.x, player2.y) == (30, 14), "Player 2 should move up"
+    assert board.grid[14][30] == 2, "Board should record the new head"
+    assert player1.ai.calls == 0, "AIs should not be asked when directions are given"
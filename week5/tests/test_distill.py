@@ -0,0 +1,85 @@
+import os
+import sys
+import numpy as np
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from distill import (distill, game_observer, generate_shard, load_shards, observe, play_match,
+                     start_state, student_policy, teacher_targets, train_student)
+from game_board import GameBoard
+from player import Player
+from policy_ai import PolicyAI, forward, load_policy, ACTIVATIONS
+from search_state import playable_moves
+from topology import LEFT
+from vec_env import VecTronEnv
+
+def test_start_state_matches_vec_env():
+    env = VecTronEnv(1, 12, 8)
+    state = start_state(12, 8)
+    assert np.array_equal(state.cells, env.cells[0])
+    assert state.heads == tuple(env.heads[0])
+    assert np.array_equal(observe(state, 0), env.observe(0)[0])
+    assert np.array_equal(observe(state, 1), env.observe(1)[0])
+
+def test_teacher_targets_are_distributions_over_playable_moves():
+    state = start_state(12, 8)
+    policy, value, best = teacher_targets(state, 2, 0)
+    assert policy.shape == (4,)
+    assert np.isclose(policy.sum(), 1)
+    assert policy[LEFT] == 0  # reversing is not a move
+    assert best == int(np.argmax(policy))
+    assert -1 <= value <= 1
+
+def test_generate_shard_and_load(tmp_path):
+    path, count = generate_shard(str(tmp_path / "shard-0000.npz"), 1, 12, 8, depth=1, seed=3)
+    observations, policies, values = load_shards([path])
+    assert len(observations) == len(policies) == len(values) == count
+    assert count > 0 and count % 2 == 0
+    assert np.allclose(policies.sum(axis=1), 1)
+
+def test_train_student_fits_targets():
+    rng = np.random.default_rng(0)
+    observations = rng.random((256, 10)).astype(np.float32)
+    policies = np.eye(4, dtype=np.float32)[(observations[:, 0] > 0.5) * 2 + (observations[:, 1] > 0.5)]
+    weights, activations, loss, value_head = train_student(observations, policies, (16,), epochs=200,
+                                                           batch_size=64, learning_rate=1e-2)
+    assert activations == ["relu", "linear"]
+    assert [w.shape for w in weights] == [(10, 16), (16,), (16, 4), (4,)]
+    assert value_head is None
+    assert loss < 0.2
+
+def test_train_student_fits_values():
+    rng = np.random.default_rng(0)
+    observations = rng.random((256, 10)).astype(np.float32)
+    policies = np.full((256, 4), 0.25, dtype=np.float32)
+    values = np.tanh(2 * observations[:, 0] - 1).astype(np.float32)
+    weights, _, _, value_head = train_student(observations, policies, (16,), epochs=200, batch_size=64,
+                                              learning_rate=1e-2, values=values)
+    assert [w.shape for w in value_head] == [(16, 1), (1,)]
+    hidden = np.maximum(observations @ weights[0] + weights[1], 0)
+    predicted = np.tanh(hidden @ value_head[0] + value_head[1])[:, 0]
+    assert np.mean((predicted - values) ** 2) < 0.01
+
+def test_student_plays(tmp_path):
+    path, _ = generate_shard(str(tmp_path / "shard-0000.npz"), 1, 12, 8, depth=1)
+    output = str(tmp_path / "student.npz")
+    value_output = str(tmp_path / "student-value.npz")
+    distill([path], output, hidden=(8,), epochs=2, value_output=value_output)
+    student = PolicyAI(output)
+    policy = student_policy(student)
+    state = start_state(12, 8)
+    assert policy(state) in playable_moves(state, 0), "Student should never reverse"
+    win_rate, draw_rate, latency = play_match(policy, 2, 12, 8)
+    assert 0 <= win_rate + draw_rate <= 1
+    assert latency > 0
+
+    value_layers = [(w, b, ACTIVATIONS[name]) for w, b, name in load_policy(value_output)]
+    value = forward(value_layers, observe(state, 0))
+    assert value.shape == (1, 1) and -1 <= value[0, 0] <= 1
+
+    board = GameBoard(12, 8)
+    player = Player(3, 4, (0, 0, 255), 1, None)
+    opponent = Player(9, 4, (255, 0, 0), 2, None)
+    observation = game_observer(board, player, opponent)
+    assert np.array_equal(observation(), observe(start_state(12, 8), 0))
+    assert PolicyAI(output, observe=observation).get_direction() in ([0, -1], [0, 1], [-1, 0], [1, 0])
@@ -0,0 +1,111 @@
+import os
+import sys
+import random
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from endgame import (EndgameAI, best_move, exact_longest_path, is_separated, longest_path,
+                     parity_bound, predict_result, region)
+from game_board import GameBoard
+from player import Player
+from topology import Topology, UP, DOWN, RIGHT
+
+def board_from_rows(rows):
+    """
+    '#' wall or trail, '1'/'2' heads, '.' empty.
+    :return: (topology, cells, head of player 1, head of player 2)
+    """
+    topology = Topology(len(rows[0]), len(rows))
+    grid = [[0 if c == '.' else 1 for c in row] for row in rows]
+    cells = topology.board_from_grid(grid)
+    heads = {}
+    for y, row in enumerate(rows):
+        for x, c in enumerate(row):
+            if c in "12":
+                heads[c] = int(topology.index(x, y))
+    return topology, cells, heads.get("1"), heads.get("2")
+
+def brute_force(topology, cells, cell):
+    best = 0
+    for n in topology.neighbors[cell]:
+        if cells[n] == 0:
+            cells[n] = 1
+            best = max(best, 1 + brute_force(topology, cells, n))
+            cells[n] = 0
+    return best
+
+def test_open_rectangle_is_filled():
+    topology, cells, head, _ = board_from_rows(["1...",
+                                                "....",
+                                                "....",
+                                                "...."])
+    assert exact_longest_path(topology, cells, head) == 15
+
+def test_exact_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(40):
+        rows = ["".join(rng.choice("..#") for _ in range(5)) for _ in range(4)]
+        rows[0] = "1" + rows[0][1:]
+        topology, cells, head, _ = board_from_rows(rows)
+        expected = brute_force(topology, cells.copy(), head)
+        assert exact_longest_path(topology, cells, head) == expected, rows
+        assert parity_bound(topology, region(topology, cells, head), head) >= expected
+
+def test_parity_bound():
+    # From a corner of a 3x2 room the colours alternate other, same, other, ...
+    topology, cells, head, _ = board_from_rows(["1..",
+                                                "..."])
+    cells_left = region(topology, cells, head)
+    assert parity_bound(topology, cells_left, head) == 5
+    # Two cells of the head's colour and none of the other: no move is possible
+    topology, cells, head, _ = board_from_rows([".#.",
+                                                "#1#",
+                                                "###"])
+    assert parity_bound(topology, region(topology, cells, head), head) == 0
+
+def test_separation_and_prediction():
+    topology, cells, head1, head2 = board_from_rows(["1..#...",
+                                                     "...#..2",
+                                                     "...#..."])
+    assert is_separated(topology, cells, head1, head2)
+    assert predict_result(topology, cells, head1, head2) == 1, "Player 1 has the larger region"
+    topology, cells, head1, head2 = board_from_rows(["1......",
+                                                     "...#..2"])
+    assert not is_separated(topology, cells, head1, head2)
+    assert predict_result(topology, cells, head1, head2) is None
+
+def test_large_region_uses_bound():
+    topology = Topology(30, 30)
+    cells = topology.new_board()
+    head = int(topology.index(0, 0))
+    cells[head] = 1
+    moves, exact = longest_path(topology, cells, head, exact_limit=40)
+    assert not exact and moves == 30 * 30 - 1
+
+def test_best_move_avoids_pocket():
+    topology, cells, head, _ = board_from_rows(["#.####",
+                                                "#1....",
+                                                "#.....",
+                                                "######"])
+    # Up enters a dead end of one cell, right and down keep the whole room
+    assert best_move(topology, cells, head, RIGHT) in (RIGHT, DOWN)
+    assert best_move(topology, cells, head, UP) != UP
+
+def test_endgame_ai_fills_its_region():
+    board = GameBoard(7, 3)
+    for y in range(3):
+        board.grid[y][3] = 1
+    player1 = Player(0, 0, (255, 0, 0), 1, None)
+    player2 = Player(6, 1, (0, 0, 255), 2, None)
+    player1.ai = EndgameAI(board, player1, player2)
+    moves = 0
+    while True:
+        direction = player1.ai.get_direction()
+        player1.change_direction(direction)
+        x, y = player1.x + player1.direction[0], player1.y + player1.direction[1]
+        if board.is_collision(x, y) or (x, y) == (0, 0):
+            break
+        player1.move(direction)
+        board.grid[y][x] = 1
+        moves += 1
+    assert moves == 8, "The 3x3 region minus the start cell should be filled completely"
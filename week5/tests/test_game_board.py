@@ -0,0 +1,56 @@
+import os
+import sys
+import pygame
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from game_board import GameBoard
+from player import Player
+
+class FixedAI:
+    def __init__(self, direction):
+        self.direction = direction
+
+    def get_direction(self, *args):
+        return self.direction
+
+def test_game_board_initialization():
+    board = GameBoard(20, 15)
+    assert (board.width, board.height) == (20, 15), "Board size not set correctly"
+    assert all(cell == 0 for row in board.grid for cell in row), "Grid should be initialized with all zeros"
+
+def test_draw():
+    pygame.init()
+    screen = pygame.Surface((400, 300))
+    board = GameBoard(20, 15)
+    board.grid[5][5] = 1
+    board.grid[10][10] = 2
+    board.draw(screen)
+    assert screen.get_at((100, 100)) == pygame.Color(200, 0, 0), "Player 1 cell not drawn correctly"
+    assert screen.get_at((200, 200)) == pygame.Color(0, 0, 200), "Player 2 cell not drawn correctly"
+    assert screen.get_at((0, 0)) == pygame.Color(50, 50, 50), "Empty cell not drawn correctly"
+
+def test_is_collision():
+    board = GameBoard(20, 15)
+    assert board.is_collision(-1, 0), "Should detect collision on left boundary"
+    assert board.is_collision(0, 15), "Should detect collision on bottom boundary"
+    assert not board.is_collision(10, 7), "Should not detect collision inside the board"
+    board.grid[5][5] = 1
+    assert board.is_collision(5, 5), "Should detect collision with player trail"
+
+def test_reset_from_trails():
+    board = GameBoard(20, 15)
+    player = Player(2, 2, (255, 0, 0), 1, FixedAI([1, 0]))
+    for _ in range(5):
+        player.move()
+        board.grid[player.y][player.x] = player.player_id
+    rows = board.grid
+    board.reset([player])
+    assert board.grid is rows, "Reset should reuse the grid"
+    assert all(cell == 0 for row in board.grid for cell in row), "Trail cells should be cleared"
+
+def test_full_reset():
+    board = GameBoard(20, 15)
+    board.grid[3][4] = 2
+    board.reset()
+    assert all(cell == 0 for row in board.grid for cell in row), "Full reset should clear every cell"
@@ -0,0 +1,35 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from game_pool import GamePool
+from mock_ai import MockAI
+from tron_game import update_game_state
+
+def play(board, player1, player2):
+    result = 0
+    while result == 0:
+        result = update_game_state(player1, player2, board)
+    return result
+
+def test_pool_reuses_games():
+    pool = GamePool(40, 30)
+    ai1, ai2 = MockAI(), MockAI()
+    game = pool.acquire(ai1, ai2)
+    play(*game)
+    pool.release(*game)
+    board, player1, player2 = pool.acquire(ai1, ai2)
+    assert board is game[0] and player1 is game[1], "Released objects should be reused"
+    assert pool.created == 1, "No new game should be created"
+    assert all(cell == 0 for row in board.grid for cell in row), "Board should be cleared"
+    assert (player1.x, player1.y, player2.x, player2.y) == (10, 15, 30, 15), "Players should be back at the start"
+    assert player1.trail_cells() == [(10, 15)], "Trail should be reset"
+    assert player1.ai is ai1 and player2.ai is ai2, "AIs should be attached"
+
+def test_pool_grows_when_empty():
+    pool = GamePool(40, 30)
+    first = pool.acquire(MockAI(), MockAI())
+    second = pool.acquire(MockAI(), MockAI())
+    assert first[0] is not second[0], "Games in use should not be shared"
+    assert pool.created == 2, "Pool should create games on demand"
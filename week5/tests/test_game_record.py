@@ -0,0 +1,62 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import pytest
+import kernels
+from game_record import (GameRecord, compare_backends, game_rngs, play_seeded_game, record_game,
+                         replay, verify_record)
+from mock_ai import MockAI
+
+class FixedAI:
+    def __init__(self, direction):
+        self.direction = direction
+
+    def get_direction(self, *args):
+        return self.direction
+
+def test_record_game():
+    record = record_game(FixedAI([0, -1]), FixedAI([0, 1]), 40, 30)
+    assert record.heads[0] == [(10, 15), (30, 15)], "First entry should be the start positions"
+    assert record.heads[-1] == [(10, 1), (30, 29)], "Last entry should be the final heads"
+    assert len(record.heads) == 15, "One entry per completed step plus the start"
+    assert record.result == 1, "Player 2 reaches the bottom wall first"
+
+def test_save_and_load(tmp_path):
+    record = record_game(MockAI(), MockAI())
+    path = str(tmp_path / "game.npz")
+    record.save(path)
+    loaded = GameRecord.load(path)
+    assert (loaded.width, loaded.height, loaded.num_players) == (40, 30, 2), "Board size not restored"
+    assert loaded.heads == record.heads, "Heads not restored"
+    assert loaded.result == record.result, "Result not restored"
+    assert loaded.moves == record.moves, "Moves not restored"
+    assert loaded.hashes == record.hashes, "Hashes not restored"
+    assert loaded.seed is None
+
+def test_seeded_games_repeat():
+    first, again, other = play_seeded_game(7), play_seeded_game(7), play_seeded_game(8)
+    assert first.seed == 7
+    assert first.moves == again.moves and first.hashes == again.hashes
+    assert first.hashes != other.hashes
+    streams = game_rngs(7)
+    assert streams[0].random() != streams[1].random(), "Players should get independent streams"
+
+@pytest.mark.parametrize("backend", ["python", "numpy", "numba"])
+def test_verify_record(backend):
+    if backend == "numba" and kernels.NUMBA_BACKEND is None:
+        pytest.skip("numba is not installed")
+    for seed in range(20):
+        record = play_seeded_game(seed, 12, 8)
+        assert len(record.hashes) == len(record.moves) + 1
+        assert verify_record(record, backend) is None
+        assert replay(record, backend)[1] == record.result
+
+def test_divergence_is_found():
+    record = record_game(FixedAI([0, -1]), FixedAI([0, 1]), 40, 30)
+    assert compare_backends(record, "python", "numpy") is None
+    # Change one move in the middle: the replay differs from that step on
+    record.moves[5] = (3, record.moves[5][1])
+    assert verify_record(record) == 6
+    assert verify_record(record, "numpy") == 6
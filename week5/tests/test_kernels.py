@@ -0,0 +1,111 @@
+import os
+import sys
+import random
+import numpy as np
+import pytest
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import kernels
+from game_board import GameBoard
+from player import Player
+from topology import Topology, DIRECTIONS
+from tron_game import update_game_state
+
+BACKENDS = [b for b in (kernels.NUMPY_BACKEND, kernels.NUMBA_BACKEND) if b is not None]
+
+def new_game(width=12, height=10):
+    board = GameBoard(width, height)
+    return board, Player(width // 4, height // 2, (255, 0, 0), 1, None), \
+        Player(3 * width // 4, height // 2, (0, 0, 255), 2, None)
+
+def random_games(count, seed=0, width=12, height=10):
+    """
+    Reference games played with update_game_state: (states before each move, moves, results).
+    """
+    rng = random.Random(seed)
+    topology = Topology(width, height)
+    for _ in range(count):
+        board, player1, player2 = new_game(width, height)
+        result = 0
+        while result == 0:
+            state = kernels.state_from_game(topology, board, player1, player2)
+            moves = [rng.randrange(4), rng.randrange(4)]
+            result = update_game_state(player1, player2, board,
+                                       [list(DIRECTIONS[moves[0]]), list(DIRECTIONS[moves[1]])])
+            after = kernels.state_from_game(topology, board, player1, player2)
+            yield topology, state, moves, result, after
+
+@pytest.mark.parametrize("backend", BACKENDS, ids=lambda b: b.name)
+def test_step_matches_reference_rules(backend):
+    for topology, (cells, heads, dirs), moves, result, (cells_after, heads_after, dirs_after) in random_games(30):
+        got = backend.step(cells, topology.neighbors, heads, dirs, np.array(moves, dtype=np.int64))
+        assert got == result, "Result code differs from update_game_state"
+        if result == 0:
+            assert (cells == cells_after).all(), "Board differs from the reference"
+            assert (heads == heads_after).all(), "Heads differ from the reference"
+        assert (dirs == dirs_after).all(), "Directions differ from the reference"
+
+@pytest.mark.parametrize("backend", BACKENDS, ids=lambda b: b.name)
+def test_batched_step_matches_single_step(backend):
+    samples = list(random_games(10, seed=1))[:64]
+    topology = samples[0][0]
+    cells = np.stack([s[1][0] for s in samples])
+    heads = np.stack([s[1][1] for s in samples])
+    dirs = np.stack([s[1][2] for s in samples])
+    requested = np.array([s[2] for s in samples], dtype=np.int64)
+    results = np.zeros(len(samples), dtype=np.int64)
+    results[0] = 3  # finished games must not move
+    frozen = cells[0].copy()
+    backend.batched_step(cells, topology.neighbors, heads, dirs, requested, results)
+    assert (cells[0] == frozen).all(), "Finished games should be left alone"
+    assert list(results[1:]) == [s[3] for s in samples[1:]], "Batched results differ from the reference"
+
+@pytest.mark.parametrize("backend", BACKENDS, ids=lambda b: b.name)
+def test_territory_matches_bfs(backend):
+    for topology, (cells, heads, _), _, _, _ in list(random_games(5, seed=2))[::7]:
+        d1 = topology.reachable(cells, heads[0])
+        d2 = topology.reachable(cells, heads[1])
+        empty = cells == 0
+        expected = [np.count_nonzero(empty & (d1 > 0) & ((d2 < 0) | (d1 < d2))),
+                    np.count_nonzero(empty & (d2 > 0) & ((d1 < 0) | (d2 < d1)))]
+        assert list(backend.territory(cells, topology.neighbors, heads)) == expected, "Territory split differs"
+
+def test_rollouts_identical_across_backends():
+    topology = Topology(15, 12)
+    board, player1, player2 = new_game(15, 12)
+    cells, heads, dirs = kernels.state_from_game(topology, board, player1, player2)
+    choices = np.random.default_rng(3).random((100, 200, 2))
+    results = [b.rollouts(cells, topology.neighbors, heads, dirs, choices) for b in BACKENDS]
+    assert set(results[0]) <= {1, 2, 3}, "Every rollout should finish"
+    for other in results[1:]:
+        assert (other == results[0]).all(), "Backends should play the same rollouts"
+
+def test_rollout_matches_reference_game():
+    topology = Topology(10, 8)
+    board, player1, player2 = new_game(10, 8)
+    cells, heads, dirs = kernels.state_from_game(topology, board, player1, player2)
+    choices = np.random.default_rng(4).random((60, 1, 2))
+    expected = kernels.NUMPY_BACKEND.rollouts(cells, topology.neighbors, heads, dirs, choices)[0]
+
+    # Same move choice written against the list-based engine
+    result = 0
+    for s in range(60):
+        directions = []
+        for p, player in enumerate((player1, player2)):
+            options = [list(d) for d in DIRECTIONS
+                       if [-d[0], -d[1]] != player.direction and not board.is_collision(player.x + d[0], player.y + d[1])]
+            directions.append(options[int(choices[s, 0, p] * len(options))] if options else player.direction)
+        result = update_game_state(player1, player2, board, directions)
+        if result:
+            break
+    assert result == expected, "Rollout kernel should follow the reference rules"
+
+def test_public_wrappers():
+    topology = Topology(12, 10)
+    board, player1, player2 = new_game()
+    cells, heads, dirs = kernels.state_from_game(topology, board, player1, player2)
+    assert kernels.step(cells.copy(), topology.neighbors, heads.copy(), dirs.copy(), [-1, -1]) == 0
+    assert sum(kernels.territory(cells, topology.neighbors, heads)) > 0, "Territory should be split"
+    results = kernels.random_rollouts(cells, topology.neighbors, heads, dirs, 50)
+    assert len(results) == 50 and set(results) <= {1, 2, 3}, "Rollouts should all finish"
@@ -0,0 +1,128 @@
+import os
+import sys
+import asyncio
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from match_server import BotConnection, MatchServer, START, STATE, END, MSG_END
+from bot_client import BotClient
+from mock_ai import MockAI
+
+class FixedAI:
+    def __init__(self, direction):
+        self.direction = direction
+
+    def get_direction(self, *args):
+        return self.direction
+
+async def start_server(**kwargs):
+    match_server = MatchServer(**kwargs)
+    server = await match_server.start("127.0.0.1", 0)
+    return match_server, server.sockets[0].getsockname()[1]
+
+def test_two_bots_play_a_game():
+    async def scenario():
+        match_server, port = await start_server(move_timeout=1.0)
+        bots = [BotClient(MockAI()), BotClient(MockAI())]
+        for bot in bots:
+            await bot.connect(port=port)
+        results = await asyncio.gather(*(bot.play(1) for bot in bots))
+        await match_server.close()
+        return match_server, bots, results
+
+    match_server, bots, results = asyncio.run(scenario())
+    assert results[0] == results[1] and results[0][0] in (1, 2, 3), "Both bots should see the same result"
+    assert sorted(bot.player_id for bot in bots) == [1, 2], "Bots should get different player ids"
+    assert sum(match_server.results.values()) == 1, "Server should record one game"
+
+def test_silent_bot_keeps_direction():
+    async def scenario():
+        match_server, port = await start_server(move_timeout=0.02)
+        # Raw connection that never answers: its bike keeps driving right
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await asyncio.sleep(0.05)
+        bot = BotClient(FixedAI([0, -1]))
+        await bot.connect(port=port)
+        results = await bot.play(1)
+        start = START.unpack(await reader.readexactly(START.size))
+        heads = []
+        while True:
+            msg_type = (await reader.readexactly(1))[0]
+            if msg_type == MSG_END:
+                await reader.readexactly(END.size - 1)
+                break
+            heads.append(STATE.unpack(bytes([msg_type]) + await reader.readexactly(STATE.size - 1)))
+        writer.close()
+        await match_server.close()
+        return start, heads, results
+
+    start, heads, results = asyncio.run(scenario())
+    assert start[4] == 1, "First connection should be player 1"
+    assert [h[2] for h in heads] == list(range(10, 10 + len(heads))), "Silent bike should go straight"
+    assert results == [1], "Player 2 drives into the top wall and loses"
+
+def test_many_concurrent_games():
+    async def scenario():
+        match_server, port = await start_server(move_timeout=1.0)
+        bots = [BotClient(MockAI()) for _ in range(40)]
+        for bot in bots:
+            await bot.connect(port=port)
+        results = await asyncio.gather(*(bot.play(2) for bot in bots))
+        await match_server.wait_for_games(40)
+        await match_server.close()
+        return match_server, results
+
+    match_server, results = asyncio.run(scenario())
+    assert all(len(r) == 2 for r in results), "Every bot should finish two games"
+    assert sum(match_server.results.values()) == 40, "Server should record every game once"
+
+def test_unix_socket(tmp_path):
+    async def scenario():
+        match_server = MatchServer(move_timeout=1.0)
+        path = str(tmp_path / "tron.sock")
+        await match_server.start(path=path)
+        bots = [BotClient(MockAI()), BotClient(MockAI())]
+        for bot in bots:
+            await bot.connect(path=path)
+        results = await asyncio.gather(*(bot.play(1) for bot in bots))
+        await match_server.close()
+        return results
+
+    results = asyncio.run(scenario())
+    assert results[0] == results[1], "Both bots should see the same result over a Unix socket"
+
+class FakeTransport:
+    def __init__(self):
+        self.buffered = 0
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+class FakeWriter:
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.sent = []
+        self.closed = False
+
+    def write(self, data):
+        self.sent.append(data)
+
+    def close(self):
+        self.closed = True
+
+def test_bot_that_stops_reading_is_dropped():
+    async def scenario():
+        writer = FakeWriter()
+        bot = BotConnection(asyncio.StreamReader(), writer, max_buffer=100)
+        bot.expect(0)
+        bot.send(b"state")
+        writer.transport.buffered = 1000
+        bot.send(b"state")
+        move = await bot.wait_move(1.0)
+        await asyncio.sleep(0)
+        return bot, writer, move
+
+    bot, writer, move = asyncio.run(scenario())
+    assert writer.sent == [b"state"], "Nothing should be queued past max_buffer"
+    assert bot.closed and writer.closed, "A bot with a full buffer should be disconnected"
+    assert move is None, "The game loop should not wait for a dropped bot"
@@ -0,0 +1,91 @@
+import os
+import sys
+import numpy as np
+import pytest
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from multi_game import MultiTronGame, ring_start_positions
+
+def straight(game):
+    return game.direction.copy()
+
+def test_ring_start_positions():
+    for players in (4, 8, 16):
+        positions = ring_start_positions(100, 80, players)
+        cells = [(x, y) for x, y, _ in positions]
+        assert len(set(cells)) == players, "Start cells should be distinct"
+        assert all(0 <= x < 100 and 0 <= y < 80 for x, y in cells), "Start cells should be on the board"
+        assert all(abs(dx) + abs(dy) == 1 for _, _, (dx, dy) in positions), "Directions should be unit steps"
+        game = MultiTronGame(100, 80, players)
+        assert np.count_nonzero(game.board) == players, "Every bike should occupy its start cell"
+        assert sorted(game.board[game.y, game.x]) == list(range(1, players + 1)), "Start cells should hold player ids"
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        MultiTronGame(40, 30, 17)
+    with pytest.raises(ValueError):
+        MultiTronGame(1001, 30, 4)
+
+def test_wall_collision():
+    game = MultiTronGame(10, 10, 2, start_positions=[(9, 0, [1, 0]), (0, 9, [0, -1])])
+    crashed = game.step(straight(game))
+    assert list(crashed) == [1], "Player 1 should crash into the right wall"
+    assert game.is_over() and game.winner() == 2, "Player 2 should win"
+
+def test_trail_collision():
+    game = MultiTronGame(10, 10, 2, start_positions=[(2, 5, [1, 0]), (4, 4, [0, 1])])
+    game.step(straight(game))
+    assert game.board[5, 3] == 1 and game.board[5, 4] == 2, "Both bikes should have moved"
+    crashed = game.step(straight(game))
+    assert list(crashed) == [1], "Player 1 should crash into player 2's trail"
+
+def test_head_on_conflicts():
+    starts = [(4, 5, [1, 0]), (6, 5, [-1, 0]), (5, 4, [0, 1]), (0, 0, [1, 0])]
+    game = MultiTronGame(10, 10, 4, start_positions=starts)
+    crashed = game.step(straight(game))
+    assert sorted(crashed) == [1, 2, 3], "All bikes entering the same cell should crash"
+    assert game.board[5, 5] == 0, "Contested cell should stay empty"
+    assert game.winner() == 4, "Uninvolved bike should win"
+
+def test_reversal_is_ignored():
+    game = MultiTronGame(10, 10, 2, start_positions=[(5, 5, [1, 0]), (0, 0, [0, 1])])
+    game.step(np.array([[-1, 0], [0, 1]]))
+    assert (game.x[0], game.y[0]) == (6, 5), "Reversing should keep the current direction"
+    game.step(np.array([[0, 1], [0, 1]]))
+    assert (game.x[0], game.y[0]) == (6, 6), "Perpendicular turns should be taken"
+
+def test_draw_when_all_crash():
+    game = MultiTronGame(3, 1, 2, start_positions=[(0, 0, [1, 0]), (2, 0, [-1, 0])])
+    game.step(straight(game))
+    assert game.is_over() and game.winner() == 0, "Simultaneous crash should be a draw"
+
+def test_ai_directions_used():
+    class FixedAI:
+        def get_direction(self, *args):
+            return [0, 1]
+    game = MultiTronGame(20, 20, 4, [FixedAI() for _ in range(4)])
+    game.step()
+    assert all(list(d) in ([0, 1], [0, -1]) for d in game.direction), "AI directions should be applied"
+
+def test_incremental_reset():
+    game = MultiTronGame(50, 50, 4)
+    while not game.is_over():
+        game.step(straight(game))
+    assert len(game.touched) == np.count_nonzero(game.board), "Every written cell should be tracked"
+    game.reset()
+    assert np.count_nonzero(game.board) == 4, "Only the start cells should remain"
+    assert game.alive.all() and game.steps == 0, "Bikes should be alive again"
+
+def test_wraparound_board():
+    game = MultiTronGame(5, 5, 2, start_positions=[(4, 0, [1, 0]), (2, 4, [0, 1])], wrap=True)
+    crashed = game.step(straight(game))
+    assert len(crashed) == 0, "Nobody should crash on a torus edge"
+    assert (game.x[0], game.y[0]) == (0, 0), "Player 1 should wrap to the left edge"
+    assert (game.x[1], game.y[1]) == (2, 0), "Player 2 should wrap to the top edge"
+    assert game.board[0, 0] == 1 and game.board[0, 2] == 2, "Wrapped cells should be marked"
+
+def test_step_indices():
+    game = MultiTronGame(10, 10, 2, start_positions=[(5, 5, [1, 0]), (0, 0, [0, 1])])
+    game.step_indices(np.array([-1, 1]))
+    assert (game.x[0], game.y[0]) == (6, 5), "-1 should keep the current direction"
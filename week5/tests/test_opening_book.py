@@ -0,0 +1,73 @@
+import os
+import sys
+import numpy as np
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from game_board import GameBoard
+from opening_book import (BookAI, OpeningBook, book_positions, generate_book, history_key,
+                          search_position, trail_moves)
+from player import Player
+from topology import DIRECTIONS, UP, DOWN, LEFT, RIGHT
+from tron_game import update_game_state
+
+SMALL = {"width": 10, "height": 8, "starts": [[2, 4], [7, 4]], "dirs": [RIGHT, LEFT]}
+
+class FixedAI:
+    def __init__(self, direction):
+        self.direction = direction
+        self.calls = 0
+
+    def get_direction(self, *args):
+        self.calls += 1
+        return self.direction
+
+def test_history_key():
+    assert history_key([]) != history_key([(UP, UP)])
+    assert history_key([(UP, DOWN)]) != history_key([(DOWN, UP)])
+    assert history_key([(UP, DOWN), (LEFT, UP)]) == history_key(((UP, DOWN), (LEFT, UP)))
+
+def test_book_positions():
+    positions = book_positions(SMALL, 3)
+    assert positions[0] == () and len(positions) == 1 + 9 + 81
+    assert len(set(positions)) == len(positions)
+
+def test_search_avoids_wall():
+    # Player 1 one cell from the top wall heading up must turn
+    settings = {"width": 10, "height": 8, "starts": [[2, 0], [7, 4]], "dirs": [UP, LEFT]}
+    _, move1, _ = search_position(settings, (), 2)
+    assert move1 in (LEFT, RIGHT)
+
+def test_generate_and_lookup(tmp_path):
+    path = str(tmp_path / "book.npy")
+    entries = generate_book(path, plies=2, depth=1, settings=SMALL, workers=2)
+    assert entries == 10
+    book = OpeningBook(path)
+    assert isinstance(book.keys, np.memmap), "The table should be memory-mapped"
+    for moves in book_positions(SMALL, 2):
+        _, move1, move2 = search_position(SMALL, moves, 1)
+        assert book.lookup(moves) == (move1, move2)
+    assert book.lookup([(UP, UP), (UP, UP)]) is None, "Positions beyond the book depth"
+    assert book.lookup([(LEFT, UP)]) is None, "Histories that were never played"
+
+def test_book_ai(tmp_path):
+    path = str(tmp_path / "book.npy")
+    generate_book(path, plies=3, depth=1, settings=SMALL, workers=1)
+    book = OpeningBook(path)
+    board = GameBoard(SMALL["width"], SMALL["height"])
+    player1 = Player(2, 4, (255, 0, 0), 1, None)
+    player2 = Player(7, 4, (0, 0, 255), 2, None)
+    fallback1, fallback2 = FixedAI([1, 0]), FixedAI([-1, 0])
+    player1.ai = BookAI(book, player1, player2, fallback1)
+    player2.ai = BookAI(book, player2, player1, fallback2)
+    for ply in range(4):
+        moves = trail_moves(player1, player2)
+        assert len(moves) == ply
+        expected = book.lookup(moves)
+        directions = [player1.ai.get_direction(), player2.ai.get_direction()]
+        if ply == 3:
+            assert fallback1.calls == 1 and fallback2.calls == 1, "Outside the book the fallback decides"
+            break
+        assert directions == [DIRECTIONS[expected[0]].tolist(), DIRECTIONS[expected[1]].tolist()]
+        assert fallback1.calls == 0 and fallback2.calls == 0
+        assert update_game_state(player1, player2, board, directions) == 0
@@ -0,0 +1,79 @@
+import os
+import sys
+import numpy as np
+import pytest
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from opponent_pool import OpponentPool, PoolOpponent
+from policy_ai import PolicyAI, save_policy
+from vec_env import VecTronEnv, observation_size
+
+def random_weights(seed, inputs=6, outputs=4):
+    rng = np.random.default_rng(seed)
+    return [rng.normal(size=(inputs, 8)), rng.normal(size=8),
+            rng.normal(size=(8, outputs)), rng.normal(size=outputs)]
+
+def test_add_deduplicates():
+    pool = OpponentPool()
+    first = pool.add(random_weights(0), ["relu", "linear"])
+    second = pool.add(random_weights(1), ["relu", "linear"])
+    again = pool.add(random_weights(0), ["relu", "linear"])
+    assert first != second, "Different weights should get different ids"
+    assert again == first and len(pool) == 2, "Identical weights should be stored once"
+
+def test_snapshots_are_frozen():
+    weights = random_weights(0)
+    pool = OpponentPool()
+    pool.add(weights, ["relu", "linear"])
+    weights[0][:] = 0
+    assert pool.snapshots[0][0][0].any(), "Snapshot should not share memory with the learner"
+    with pytest.raises(ValueError):
+        pool.snapshots[0][0][0][0, 0] = 1
+
+def test_sampling_prefers_hard_opponents():
+    pool = OpponentPool(seed=0)
+    easy = pool.add(random_weights(0), ["relu", "linear"])
+    hard = pool.add(random_weights(1), ["relu", "linear"])
+    pool.record(np.array([easy] * 50 + [hard] * 50), np.array([1.0] * 50 + [0.0] * 50))
+    ids = pool.sample(1000)
+    assert np.count_nonzero(ids == hard) > 900, "Opponents the learner loses to should dominate"
+
+def test_act_matches_policy_ai(tmp_path):
+    pool = OpponentPool()
+    paths = []
+    for seed in range(3):
+        path = tmp_path / f"policy{seed}.npz"
+        save_policy(path, random_weights(seed), ["relu", "linear"])
+        assert pool.add_file(path) == seed
+        paths.append(path)
+    observations = np.random.default_rng(5).normal(size=(30, 6)).astype(np.float32)
+    ids = np.arange(30) % 3
+    actions = pool.act(ids, observations)
+    for i in range(30):
+        expected = np.argmax(PolicyAI(paths[ids[i]]).q_values(observations[i])[0])
+        assert actions[i] == expected, "Batched evaluation differs from PolicyAI"
+
+def test_save_load(tmp_path):
+    pool = OpponentPool()
+    pool.add(random_weights(0), ["relu", "linear"])
+    pool.add(random_weights(1), ["tanh", "linear"])
+    pool.record(np.array([0, 1, 1]), np.array([1.0, 0.5, 0.0]))
+    pool.save(tmp_path / "pool.npz")
+    loaded = OpponentPool.load(tmp_path / "pool.npz")
+    assert len(loaded) == 2 and loaded.activations == pool.activations, "Snapshots not restored"
+    assert np.array_equal(loaded.win_rates(), pool.win_rates()), "Statistics not restored"
+
+def test_pool_opponent_in_env():
+    size = observation_size()
+    pool = OpponentPool(seed=0)
+    for seed in range(4):
+        pool.add(random_weights(seed, inputs=size), ["relu", "linear"])
+    opponent = PoolOpponent(pool, 16, random_fraction=0.25)
+    env = VecTronEnv(16, 20, 10, opponent=opponent)
+    env.reset()
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        env.step(rng.integers(0, 4, 16))
+    assert pool.games.sum() > 0, "Finished games should be recorded in the pool"
+    assert (opponent.assigned < len(pool)).all(), "Assigned ids out of range"
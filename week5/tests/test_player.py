@@ -0,0 +1,54 @@
+import os
+import sys
+import pygame
+import pytest
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from player import Player
+from mock_ai import MockAI
+
+class FixedAI:
+    def __init__(self, direction):
+        self.direction = direction
+
+    def get_direction(self, *args):
+        return self.direction
+
+def test_player_initialization():
+    player = Player(10, 15, (255, 0, 0), 1, MockAI())
+    assert (player.x, player.y) == (10, 15), "Initial position not set correctly"
+    assert player.direction == [1, 0], "Player 1 should start moving right"
+    assert player.trail_cells() == [(10, 15)], "Trail should start at the initial position"
+
+def test_move_records_trail():
+    player = Player(5, 5, (255, 0, 0), 1, FixedAI([0, 1]))
+    player.move()
+    player.move()
+    assert (player.x, player.y) == (5, 7), "Player should follow the AI direction"
+    assert player.trail_cells() == [(5, 5), (5, 6), (5, 7)], "Trail should record every cell"
+    assert player.trail.itemsize * len(player.trail) == 12, "Trail should use 4 bytes per cell"
+
+def test_no_instance_dict():
+    player = Player(0, 0, (255, 0, 0), 1, MockAI())
+    with pytest.raises(AttributeError):
+        player.score = 1
+
+def test_reset_reuses_trail():
+    player = Player(5, 5, (255, 0, 0), 2, FixedAI([0, 1]))
+    trail = player.trail
+    player.move()
+    player.reset(30, 15)
+    assert player.trail is trail, "Reset should reuse the trail buffer"
+    assert player.trail_cells() == [(30, 15)], "Trail should be cleared to the new position"
+    assert player.direction == [-1, 0], "Player 2 should start moving left"
+
+def test_draw():
+    pygame.init()
+    screen = pygame.Surface((200, 200))
+    player = Player(1, 1, (255, 0, 0), 1, FixedAI([1, 0]))
+    player.move()
+    player.draw(screen)
+    assert screen.get_at((25, 25)) == pygame.Color(255, 0, 0), "Start cell not drawn"
+    assert screen.get_at((45, 25)) == pygame.Color(255, 0, 0), "Trail cell not drawn"
+    assert screen.get_at((65, 25)) == pygame.Color(0, 0, 0), "Unvisited cell should stay empty"
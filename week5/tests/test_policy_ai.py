@@ -0,0 +1,47 @@
+import os
+import sys
+import numpy as np
+import pytest
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from policy_ai import PolicyAI, save_policy, load_policy
+
+@pytest.fixture
+def weights_file(tmp_path):
+    rng = np.random.default_rng(0)
+    weights = [rng.normal(size=(6, 8)), rng.normal(size=8),
+               rng.normal(size=(8, 4)), rng.normal(size=4)]
+    path = tmp_path / "policy.npz"
+    save_policy(path, weights, ["relu", "linear"])
+    return path, weights
+
+def test_load_policy(weights_file):
+    path, weights = weights_file
+    layers = load_policy(path)
+    assert [name for _, _, name in layers] == ["relu", "linear"], "Activations not restored"
+    assert layers[0][0].dtype == np.float32, "Weights should be stored as float32"
+    assert layers[1][0].shape == (8, 4), "Layer shapes not preserved"
+
+def test_q_values_match_reference(weights_file):
+    path, weights = weights_file
+    ai = PolicyAI(path)
+    state = np.arange(6, dtype=np.float32) / 6
+    hidden = np.maximum(state @ weights[0] + weights[1], 0)
+    expected = hidden @ weights[2] + weights[3]
+    assert np.allclose(ai.q_values(state)[0], expected, atol=1e-5), "Forward pass differs from reference"
+    batch = np.stack([state, -state])
+    assert ai.q_values(batch).shape == (2, 4), "Batch forward pass has wrong shape"
+
+def test_get_direction(weights_file):
+    path, _ = weights_file
+    state = np.ones(6)
+    ai = PolicyAI(path, observe=lambda: state)
+    expected = ai.directions[int(np.argmax(ai.q_values(state)))]
+    assert ai.get_direction(state) == expected, "Direction should follow the best Q-value"
+    assert ai.get_direction() == expected, "get_direction() should use the observe callback"
+
+def test_direction_count_mismatch(weights_file):
+    path, _ = weights_file
+    with pytest.raises(ValueError):
+        PolicyAI(path, directions=[[0, 1], [1, 0]])
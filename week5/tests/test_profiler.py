@@ -0,0 +1,76 @@
+import os
+import sys
+import csv
+import json
+import time
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from game_board import GameBoard
+from player import Player
+from profiler import PROFILER, Profiler, RollingHistogram
+from tron_game import update_game_state
+
+def test_histogram_percentiles():
+    hist = RollingHistogram(window=100)
+    for value in range(1, 101):
+        hist.add(float(value))
+    assert hist.percentile(50) == 51.0, "p50 should be the middle sample"
+    assert hist.percentile(99) == 100.0, "p99 should be near the largest sample"
+    assert hist.summary()["mean"] == 50.5, "Mean should cover all samples"
+
+def test_histogram_fixed_memory():
+    hist = RollingHistogram(window=10)
+    for value in range(1000):
+        hist.add(float(value))
+    assert len(hist.samples) == 10, "Ring should never grow"
+    assert hist.count == 1000, "Count should include every sample"
+    assert hist.percentile(0) == 990.0, "Only the most recent samples should be kept"
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler(enabled=False)
+    with profiler.timer("render"):
+        pass
+    profiler.count("frames")
+    assert profiler.snapshot() == {"timers": {}, "counters": {}}, "Disabled profiler should not record"
+
+def test_enabled_profiler_export(tmp_path):
+    profiler = Profiler(enabled=True, window=8)
+    for _ in range(3):
+        with profiler.timer("state_update"):
+            pass
+    profiler.count("frames", 3)
+    snapshot = profiler.snapshot()
+    assert snapshot["timers"]["state_update"]["count"] == 3, "Timer samples not recorded"
+    assert snapshot["counters"]["frames"] == 3, "Counter not recorded"
+
+    profiler.export_json(tmp_path / "profile.json")
+    with open(tmp_path / "profile.json") as f:
+        assert json.load(f) == snapshot, "JSON export should match the snapshot"
+    profiler.export_csv(tmp_path / "profile.csv")
+    with open(tmp_path / "profile.csv") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["name", "count", "mean", "p50", "p95", "p99"], "CSV header missing"
+    assert [row[0] for row in rows[1:]] == ["state_update", "frames"], "CSV rows missing"
+
+class SlowAI:
+    def get_direction(self, *args):
+        time.sleep(0.05)
+        return [0, 1]
+
+def test_state_update_excludes_ai_time():
+    board = GameBoard(10, 10)
+    player1 = Player(2, 4, (255, 0, 0), 1, SlowAI())
+    player2 = Player(7, 4, (0, 0, 255), 2, SlowAI())
+    enabled = PROFILER.enabled
+    PROFILER.enabled = True
+    PROFILER.reset()
+    try:
+        assert update_game_state(player1, player2, board) == 0
+        timers = PROFILER.snapshot()["timers"]
+    finally:
+        PROFILER.enabled = enabled
+        PROFILER.reset()
+    assert timers["ai_decision"]["count"] == 2, "Each AI call should be one ai_decision sample"
+    assert timers["ai_decision"]["mean"] >= 0.05, "AI calls should be timed as ai_decision"
+    assert timers["state_update"]["mean"] < 0.05, "state_update should not include the AIs"
@@ -0,0 +1,91 @@
+import os
+import sys
+import random
+import numpy as np
+import pytest
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import kernels
+from game_board import GameBoard
+from player import Player
+from search_state import SearchState
+from topology import Topology
+
+def start_state(width=12, height=10, max_depth=4096):
+    board = GameBoard(width, height)
+    player1 = Player(width // 4, height // 2, (255, 0, 0), 1, None)
+    player2 = Player(3 * width // 4, height // 2, (0, 0, 255), 2, None)
+    return SearchState.from_game(board, player1, player2, max_depth=max_depth)
+
+def snapshot(state):
+    return state.cells.copy(), state.heads, state.dirs, state.result
+
+def test_apply_matches_kernel_step():
+    rng = random.Random(0)
+    for _ in range(30):
+        state = start_state()
+        cells = state.cells.copy()
+        heads = np.array(state.heads, dtype=np.int64)
+        dirs = np.array(state.dirs, dtype=np.int64)
+        result = 0
+        while result == 0:
+            moves = [rng.randrange(-1, 4), rng.randrange(-1, 4)]
+            result = state.apply(*moves)
+            assert result == kernels.step(cells, state.topology.neighbors, heads, dirs, moves), \
+                "Result differs from kernels.step"
+            assert (state.cells == cells).all(), "Board differs from kernels.step"
+            assert state.heads == tuple(heads) and state.dirs == tuple(dirs), "Heads or directions differ"
+
+def test_undo_restores_every_position():
+    rng = random.Random(1)
+    state = start_state()
+    history = [snapshot(state)]
+    while state.result == 0:
+        state.apply(rng.randrange(4), rng.randrange(4))
+        history.append(snapshot(state))
+    while state.depth:
+        history.pop()
+        state.undo()
+        cells, heads, dirs, result = history[-1]
+        assert (state.cells == cells).all() and state.heads == heads and state.dirs == dirs
+        assert state.result == result == 0
+
+def test_moves():
+    state = start_state()
+    # Player 1 heads right: up, down and right are open, left would be a reversal
+    assert state.moves(0) == [0, 1, 3]
+    assert state.moves(1) == [0, 1, 2]
+
+def count_leaves(state, depth):
+    if depth == 0 or state.result:
+        return 1
+    total = 0
+    for m1 in state.moves(0) or [state.d1]:
+        for m2 in state.moves(1) or [state.d2]:
+            state.apply(m1, m2)
+            total += count_leaves(state, depth - 1)
+            state.undo()
+    return total
+
+def test_search_leaves_board_unchanged():
+    state = start_state(8, 6)
+    before = snapshot(state)
+    assert count_leaves(state, 4) > 100
+    after = snapshot(state)
+    assert (before[0] == after[0]).all() and before[1:] == after[1:], "Search should leave the state as it was"
+
+def test_errors():
+    state = start_state(max_depth=2)
+    with pytest.raises(IndexError):
+        state.undo()
+    state.apply(-1, -1)
+    state.apply(-1, -1)
+    with pytest.raises(IndexError):
+        state.apply(-1, -1)
+    topology = Topology(4, 1)
+    cells = topology.new_board()
+    finished = SearchState(topology, cells, topology.index(np.array([0, 3]), np.array([0, 0])), [2, 3])
+    assert finished.apply(-1, -1) == 3
+    with pytest.raises(ValueError):
+        finished.apply(-1, -1)
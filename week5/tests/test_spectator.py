@@ -0,0 +1,108 @@
+import os
+import sys
+import asyncio
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from bot_client import BotClient
+from match_server import MatchServer
+from mock_ai import MockAI
+from spectator import DELTA, MSG_DELTA, MSG_KEYFRAME, MSG_RESET, SpectatorClient, SpectatorHub, Viewer
+
+async def wait_for_viewers(hub, count):
+    while len(hub.viewers) < count:
+        await asyncio.sleep(0.01)
+
+async def read_until(client, condition):
+    while not condition():
+        await client.read_message()
+
+def test_late_viewer_gets_keyframe(tmp_path):
+    path = str(tmp_path / "spectators.sock")
+    trail1 = [(2, 4), (3, 4), (4, 4), (5, 4), (6, 4)]
+    trail2 = [(7, 4), (7, 5), (7, 6), (7, 7), (7, 8)]
+
+    async def scenario():
+        hub = SpectatorHub()
+        await hub.start(path=path)
+        early, late = SpectatorClient(), SpectatorClient()
+        await early.connect(path=path)
+        await wait_for_viewers(hub, 1)
+        hub.start_game(5, 10, 10, [trail1[0], trail2[0]])
+        for step in (1, 2):
+            hub.publish(5, step, [trail1[step], trail2[step]], 0)
+        await late.connect(path=path)
+        await wait_for_viewers(hub, 2)
+        await read_until(late, lambda: 5 in late.games)
+        joined = [list(trail) for trail in late.games[5].trails]
+        for step in (3, 4):
+            hub.publish(5, step, [trail1[step], trail2[step]], 0)
+        hub.publish(5, 5, [trail1[4], trail2[4]], 1)
+        for client in (early, late):
+            await read_until(client, lambda: 5 in client.results)
+            client.close()
+        await hub.close()
+        return early, late, joined
+
+    early, late, joined = asyncio.run(scenario())
+    assert joined == [trail1[:3], trail2[:3]], "Keyframe should hold the trails so far"
+    assert early.results == late.results == {5: 1}
+    assert not early.games and not late.games, "Finished games should be dropped"
+
+def test_match_server_publishes_games():
+    async def scenario():
+        hub = SpectatorHub()
+        hub_server = await hub.start("127.0.0.1", 0)
+        viewer = SpectatorClient()
+        await viewer.connect(port=hub_server.sockets[0].getsockname()[1])
+        await wait_for_viewers(hub, 1)
+        match_server = MatchServer(move_timeout=1.0, spectators=hub)
+        server = await match_server.start("127.0.0.1", 0)
+        bots = [BotClient(MockAI(seed)) for seed in range(4)]
+        for bot in bots:
+            await bot.connect(port=server.sockets[0].getsockname()[1])
+        results = await asyncio.gather(*(bot.play(1) for bot in bots))
+        await read_until(viewer, lambda: len(viewer.results) == 2)
+        viewer.close()
+        await match_server.close()
+        await hub.close()
+        return results, viewer.results
+
+    results, seen = asyncio.run(scenario())
+    assert len(seen) == 2, "The viewer should see both games end"
+    # Both bots of a game get its result
+    assert sorted(result[0] for result in results) == sorted(2 * list(seen.values()))
+
+class FakeTransport:
+    def __init__(self):
+        self.buffered = 0
+
+    def is_closing(self):
+        return False
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+class FakeWriter:
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.sent = []
+
+    def write(self, data):
+        self.sent.append(data)
+
+def test_slow_viewer_is_resynced():
+    hub = SpectatorHub(max_buffer=100)
+    viewer = Viewer(FakeWriter())
+    hub.viewers.add(viewer)
+    hub.start_game(1, 10, 10, [(2, 4), (7, 4)])
+    hub.publish(1, 1, [(3, 4), (6, 4)], 0)
+    viewer.writer.transport.buffered = 1000
+    hub.publish(1, 2, [(4, 4), (5, 4)], 0)
+    assert viewer.behind and len(viewer.writer.sent) == 2, "Deltas should be dropped while behind"
+    viewer.writer.transport.buffered = 0
+    hub.publish(1, 3, [(4, 5), (5, 5)], 0)
+    types = [data[0] for data in viewer.writer.sent]
+    assert types == [MSG_KEYFRAME, MSG_DELTA, MSG_RESET, MSG_KEYFRAME]
+    assert len(viewer.writer.sent[1]) == DELTA.size
+    assert not viewer.behind
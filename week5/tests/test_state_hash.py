@@ -0,0 +1,30 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from state_hash import RollingHash, ZobristTable, first_divergence
+from topology import UP, DOWN, LEFT, RIGHT
+
+def test_equal_states_hash_equal():
+    table = ZobristTable(10, 8)
+    a = RollingHash(table, [(2, 4), (7, 4)], (RIGHT, LEFT))
+    b = RollingHash(table, [(2, 4), (7, 4)], (RIGHT, LEFT))
+    assert a.value == b.value
+    assert a.update([(3, 4), (6, 4)], (RIGHT, LEFT), 0) == b.update([(3, 4), (6, 4)], (RIGHT, LEFT), 0)
+    assert a.update([(3, 3), (6, 4)], (UP, LEFT), 0) != b.update([(3, 5), (6, 4)], (DOWN, LEFT), 0)
+
+def test_result_changes_hash():
+    table = ZobristTable(10, 8)
+    a = RollingHash(table, [(2, 4), (7, 4)], (RIGHT, LEFT))
+    b = RollingHash(table, [(2, 4), (7, 4)], (RIGHT, LEFT))
+    assert a.update([(2, 4), (7, 4)], (RIGHT, LEFT), 1) != b.update([(2, 4), (7, 4)], (RIGHT, LEFT), 3)
+
+def test_first_divergence():
+    a = list(range(100))
+    assert first_divergence(a, list(a)) is None
+    for step in (0, 1, 37, 99):
+        b = a[:step] + [-1] * (100 - step)
+        assert first_divergence(a, b) == step
+    assert first_divergence(a, a[:60]) == 60
+    assert first_divergence([], []) is None
@@ -0,0 +1,68 @@
+import os
+import sys
+import numpy as np
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from topology import Topology, DIRECTIONS, UP, DOWN, LEFT, RIGHT, WALL, direction_indices, is_turn
+from game_board import GameBoard
+
+def test_sentinel_walls():
+    topology = Topology(4, 3)
+    board = topology.new_board()
+    assert board.shape == (6 * 5,), "Board should have a one-cell border"
+    assert (topology.interior(board) == 0).all(), "Playing area should start empty"
+    assert np.count_nonzero(board == WALL) == 6 * 5 - 4 * 3, "Border should be walls"
+
+def test_neighbors_match_directions():
+    topology = Topology(10, 8)
+    cell = topology.index(3, 4)
+    for d, (dx, dy) in enumerate(DIRECTIONS):
+        assert topology.neighbors[cell, d] == topology.index(3 + dx, 4 + dy), "Neighbour table wrong"
+    corner = topology.index(0, 0)
+    board = topology.new_board()
+    assert board[topology.neighbors[corner, UP]] == WALL, "Leaving the board should hit a wall"
+    assert board[topology.neighbors[corner, LEFT]] == WALL, "Leaving the board should hit a wall"
+
+def test_wraparound():
+    topology = Topology(10, 8, wrap=True)
+    board = topology.new_board()
+    assert not (board == WALL).any(), "Torus boards have no walls"
+    assert topology.neighbors[topology.index(9, 0), RIGHT] == topology.index(0, 0), "Should wrap horizontally"
+    assert topology.neighbors[topology.index(2, 0), UP] == topology.index(2, 7), "Should wrap vertically"
+
+def test_coords_round_trip():
+    topology = Topology(7, 5)
+    xs, ys = np.meshgrid(np.arange(7), np.arange(5))
+    x, y = topology.coords(topology.index(xs, ys))
+    assert (x == xs).all() and (y == ys).all(), "index and coords should be inverses"
+
+def test_board_from_grid_and_flood_fill():
+    game_board = GameBoard(5, 5)
+    for y in range(5):
+        game_board.grid[y][2] = 1
+    topology = Topology(5, 5)
+    board = topology.board_from_grid(game_board.grid)
+    assert topology.flood_fill(board, topology.index(0, 0)) == 9, "Left region has 10 cells minus the start"
+    distance = topology.reachable(board, topology.index(0, 0))
+    assert distance[topology.index(1, 4)] == 5, "BFS distance should be the Manhattan path length"
+    assert distance[topology.index(4, 4)] == -1, "Cells behind the wall should be unreachable"
+
+def test_direction_helpers():
+    assert list(direction_indices(DIRECTIONS)) == [UP, DOWN, LEFT, RIGHT], "Vectors should map to indices"
+    assert direction_indices([1, 1]) == -1, "Diagonals are not directions"
+    assert direction_indices([[2, 1], [0, 2], [-2, 0]]).tolist() == [-1, -1, -1], "Longer steps are not directions"
+    assert is_turn(UP, LEFT) and not is_turn(UP, DOWN) and not is_turn(RIGHT, RIGHT), "Only perpendicular moves turn"
+
+def test_relative_actions():
+    from topology import relative_to_absolute, TURN_LEFT, STRAIGHT, TURN_RIGHT
+    current = np.array([UP, DOWN, LEFT, RIGHT])
+    assert (relative_to_absolute(current, STRAIGHT) == current).all()
+    assert relative_to_absolute(current, TURN_LEFT).tolist() == [LEFT, RIGHT, DOWN, UP]
+    assert relative_to_absolute(current, TURN_RIGHT).tolist() == [RIGHT, LEFT, UP, DOWN]
+    for d in range(4):
+        for action in (TURN_LEFT, TURN_RIGHT):
+            dx, dy = DIRECTIONS[d]
+            tx, ty = DIRECTIONS[relative_to_absolute(d, action)]
+            # z of the cross product is negative for a left turn with y pointing down
+            assert (dx * ty - dy * tx) == (-1 if action == TURN_LEFT else 1)
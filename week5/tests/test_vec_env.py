@@ -0,0 +1,75 @@
+import os
+import sys
+import numpy as np
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from vec_env import VecTronEnv, RandomOpponent, observation_size
+
+def test_reset_shapes():
+    env = VecTronEnv(8, 20, 10)
+    observations = env.reset()
+    assert observations.shape == (8, observation_size()), "Wrong observation shape"
+    assert (env.cells[:, env.start_heads] == [1, 2]).all(), "Start cells should be marked"
+
+def test_random_opponent_never_reverses():
+    opponent = RandomOpponent(0)
+    dirs = np.repeat(np.arange(4), 50)
+    actions = opponent.act(None, dirs)
+    assert (((actions >> 1) != (dirs >> 1)) | (actions == dirs)).all(), "Opponent reversed direction"
+
+class StraightOpponent:
+    def act(self, observations, dirs):
+        return dirs
+
+def test_straight_run_hits_wall():
+    env = VecTronEnv(2, 20, 10, opponent=StraightOpponent())
+    env.reset()
+    # Player 1 starts at y=5; going up it is on the top row after 5 moves and hits the wall on the 6th
+    for _ in range(5):
+        _, _, dones, _ = env.step(np.zeros(2, dtype=np.int64))
+        assert not dones.any(), "Games ended too early"
+    _, rewards, dones, info = env.step(np.zeros(2, dtype=np.int64))
+    assert dones.all() and (info["results"] == 2).all(), "Player 1 should hit the wall"
+    assert (rewards == -1).all(), "Losing should give a reward of -1"
+    assert (env.results == 0).all() and (env.episode_steps == 0).all(), "Finished games should reset"
+
+def test_episode_end_called():
+    calls = []
+    class Opponent(RandomOpponent):
+        def episode_end(self, env_ids, results):
+            calls.append((env_ids.copy(), results.copy()))
+    env = VecTronEnv(4, 20, 10, opponent=Opponent(0))
+    env.reset()
+    for _ in range(200):
+        env.step(np.full(4, 3, dtype=np.int64))
+    finished = np.concatenate([ids for ids, _ in calls])
+    assert set(finished) == {0, 1, 2, 3}, "Every game should have finished at least once"
+    assert all(((results >= 1) & (results <= 3)).all() for _, results in calls), "Bad result codes"
+
+def test_action_masks():
+    env = VecTronEnv(2, 20, 10, opponent=StraightOpponent())
+    env.reset()
+    masks = env.action_masks(0)
+    # Heading right: reversing (left) is masked, the other three are open
+    assert masks.tolist() == [[True, True, False, True]] * 2
+    for _ in range(5):
+        env.step(np.zeros(2, dtype=np.int64))
+    # On the top row heading up: up is the wall and down a reversal
+    assert env.action_masks(0).tolist() == [[False, False, True, True]] * 2
+
+def test_relative_actions():
+    env = VecTronEnv(2, 20, 10, opponent=StraightOpponent(), relative=True)
+    assert env.action_size == 3
+    env.reset()
+    assert env.action_masks(0).tolist() == [[True, True, True]] * 2
+    # Turn left from heading right: heading up; keep going straight to the top row
+    env.step(np.zeros(2, dtype=np.int64))
+    for _ in range(4):
+        env.step(np.ones(2, dtype=np.int64))
+    assert (env.dirs[:, 0] == 0).all()
+    # The wall is straight ahead; left and right are open
+    assert env.action_masks(0).tolist() == [[True, False, True]] * 2
+    _, rewards, dones, info = env.step(np.ones(2, dtype=np.int64))
+    assert dones.all() and (rewards == -1).all()
+    assert info["action_mask"].shape == (2, 3)
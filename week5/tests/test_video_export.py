@@ -0,0 +1,48 @@
+import os
+import sys
+import numpy as np
+import pytest
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from game_record import GameRecord, record_game
+from mock_ai import MockAI
+from video_export import export_video, export_videos, find_ffmpeg, palette, record_frames, render_frame
+
+def has_ffmpeg():
+    try:
+        find_ffmpeg()
+        return True
+    except RuntimeError:
+        return False
+
+def test_render_frame():
+    board = np.array([[0, 1], [2, 0]])
+    frame = render_frame(board, 3, palette(2))
+    assert frame.shape == (6, 6, 3), "Frame should be upscaled by the cell size"
+    assert tuple(frame[0, 0]) == (50, 50, 50), "Empty cell color wrong"
+    assert tuple(frame[1, 4]) == (255, 0, 0), "Player 1 color wrong"
+    assert tuple(frame[5, 0]) == (0, 0, 255), "Player 2 color wrong"
+
+def test_record_frames_match_full_render():
+    record = GameRecord(5, 4)
+    record.append([(0, 0), (4, 3)])
+    record.append([(1, 0), (3, 3)])
+    frames = [frame.copy() for frame in record_frames(record, cell_size=2)]
+    board = np.zeros((4, 5), dtype=np.int64)
+    board[0, 0] = board[0, 1] = 1
+    board[3, 4] = board[3, 3] = 2
+    assert len(frames) == 2, "One frame per recorded step"
+    assert (frames[-1] == render_frame(board, 2, palette(2))).all(), "Incremental frames should match a full render"
+
+@pytest.mark.skipif(not has_ffmpeg(), reason="ffmpeg is not available")
+def test_export_videos(tmp_path):
+    paths = []
+    for i in range(2):
+        path = str(tmp_path / f"game{i}.npz")
+        record_game(MockAI(), MockAI()).save(path)
+        paths.append(path)
+    outputs = export_videos(paths, str(tmp_path / "videos"), fmt="gif", cell_size=4, workers=2)
+    assert all(os.path.getsize(p) > 0 for p in outputs), "Every game should produce a video"
+    mp4 = export_video(paths[0], str(tmp_path / "game0.mp4"), cell_size=5)
+    assert os.path.getsize(mp4) > 0, "MP4 export should produce a file"
@@ -0,0 +1,144 @@
+import numpy as np
+
+# Same order as MockAI.directions
+DIRECTIONS = np.array([[0, -1], [0, 1], [-1, 0], [1, 0]])
+UP, DOWN, LEFT, RIGHT = range(4)
+OPPOSITE = np.array([DOWN, UP, RIGHT, LEFT])
+WALL = -1
+
+# Relative actions: turn left, go straight, turn right (y grows downwards on screen).
+# RELATIVE[direction, action] is the resulting direction index.
+TURN_LEFT, STRAIGHT, TURN_RIGHT = range(3)
+RELATIVE = np.array([[LEFT, UP, RIGHT],
+                     [RIGHT, DOWN, LEFT],
+                     [DOWN, LEFT, UP],
+                     [UP, RIGHT, DOWN]])
+
+# Maps (dy + 1) * 3 + (dx + 1) to a direction index, -1 for anything that is not a unit step
+_VECTOR_TO_INDEX = np.full(9, -1)
+for _i, (_dx, _dy) in enumerate(DIRECTIONS):
+    _VECTOR_TO_INDEX[(_dy + 1) * 3 + (_dx + 1)] = _i
+
+class Topology:
+    def __init__(self, width, height, wrap=False):
+        """
+        Precomputed board layout: a flat board with a ring of sentinel wall cells
+        and a table with the neighbour of every cell in every direction.
+        :param width: Width of the playing area in grid cells
+        :param height: Height of the playing area in grid cells
+        :param wrap: Torus board; moving off one edge enters on the opposite side
+        """
+        self.width = width
+        self.height = height
+        self.wrap = wrap
+        self.pad = 0 if wrap else 1
+        self.stride = width + 2 * self.pad
+        self.rows = height + 2 * self.pad
+        self.size = self.stride * self.rows
+
+        # neighbors[cell, d] is the flat index reached from cell by moving in direction d
+        ys, xs = np.divmod(np.arange(self.size), self.stride)
+        self.neighbors = np.empty((self.size, 4), dtype=np.int64)
+        for d, (dx, dy) in enumerate(DIRECTIONS):
+            nx, ny = xs + dx, ys + dy
+            if wrap:
+                nx %= self.stride
+                ny %= self.rows
+            else:
+                # Only sentinel cells step outside the array; they are walls anyway
+                nx = np.clip(nx, 0, self.stride - 1)
+                ny = np.clip(ny, 0, self.rows - 1)
+            self.neighbors[:, d] = ny * self.stride + nx
+
+    def new_board(self):
+        """
+        :return: Flat int8 board with empty cells and, unless wrapping, wall sentinels
+        """
+        board = np.zeros(self.size, dtype=np.int8)
+        if not self.wrap:
+            view = board.reshape(self.rows, self.stride)
+            view[0, :] = view[-1, :] = WALL
+            view[:, 0] = view[:, -1] = WALL
+        return board
+
+    def interior(self, board):
+        """
+        :return: (height, width) view of the playing area of a flat board
+        """
+        view = board.reshape(self.rows, self.stride)
+        if self.pad:
+            return view[1:-1, 1:-1]
+        return view
+
+    def index(self, x, y):
+        """
+        :return: Flat board index of the playing area coordinates (x, y), arrays work too
+        """
+        return (np.asarray(y) + self.pad) * self.stride + (np.asarray(x) + self.pad)
+
+    def coords(self, index):
+        """
+        :return: (x, y) playing area coordinates of a flat board index
+        """
+        y, x = np.divmod(index, self.stride)
+        return x - self.pad, y - self.pad
+
+    def board_from_grid(self, grid):
+        """
+        Copy a GameBoard.grid (list of rows) into a flat board.
+        """
+        board = self.new_board()
+        self.interior(board)[:] = np.asarray(grid, dtype=np.int8)
+        return board
+
+    def reachable(self, board, start):
+        """
+        Breadth-first search over empty cells, one vectorized frontier per layer.
+        :param board: Flat board
+        :param start: Flat index to start from; the start cell itself may be occupied
+        :return: Array with the BFS distance of every cell, -1 where unreachable
+        """
+        distance = np.full(self.size, -1, dtype=np.int64)
+        distance[start] = 0
+        frontier = np.array([start])
+        depth = 0
+        while len(frontier):
+            depth += 1
+            candidates = self.neighbors[frontier].ravel()
+            candidates = candidates[(board[candidates] == 0) & (distance[candidates] < 0)]
+            frontier = np.unique(candidates)
+            distance[frontier] = depth
+        return distance
+
+    def flood_fill(self, board, start):
+        """
+        :return: Number of empty cells reachable from start
+        """
+        return int(np.count_nonzero(self.reachable(board, start) > 0))
+
+def direction_indices(vectors):
+    """
+    Convert [dx, dy] direction vectors to direction indices.
+    :param vectors: Array of shape (n, 2) or (2,)
+    :return: Direction indices, -1 for vectors that are not a unit step
+    """
+    vectors = np.asarray(vectors, dtype=np.int64)
+    # Components outside -1..1 would index past the table or wrap around in it
+    valid = (np.abs(vectors) <= 1).all(axis=-1)
+    clipped = np.clip(vectors, -1, 1)
+    return np.where(valid, _VECTOR_TO_INDEX[(clipped[..., 1] + 1) * 3 + (clipped[..., 0] + 1)], -1)
+
+def relative_to_absolute(current, actions):
+    """
+    :param current: Current direction indices
+    :param actions: Relative actions (TURN_LEFT, STRAIGHT, TURN_RIGHT)
+    :return: Direction indices to request
+    """
+    return RELATIVE[current, actions]
+
+def is_turn(current, requested):
+    """
+    Same rule as Player.change_direction: only perpendicular moves change direction.
+    Directions 0-1 are vertical and 2-3 horizontal, so this is an axis comparison.
+    """
+    return (np.asarray(current) >> 1) != (np.asarray(requested) >> 1)
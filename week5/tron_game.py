@@ -2,6 +2,8 @@ import pygame
 from game_board import GameBoard
 from player import Player
 from mock_ai import MockAI
+from decision_pool import DecisionPool
+from profiler import PROFILER
 
 def initialize_game():
     """
@@ -19,17 +21,23 @@ def handle_events() -> bool:
             return False
     return True
 
-def update_game_state(player1: Player, player2: Player, game_board: GameBoard) -> int:
+def update_game_state(player1: Player, player2: Player, game_board: GameBoard, directions=None) -> int:
+    # Directions decided ahead of time are applied before the collision check
+    if directions is not None:
+        player1.change_direction(directions[0])
+        player2.change_direction(directions[1])
+
     # Store the next positions
     next_x1, next_y1 = player1.x + player1.direction[0], player1.y + player1.direction[1]
     next_x2, next_y2 = player2.x + player2.direction[0], player2.y + player2.direction[1]
     
     # Check for collisions at the next positions
-    collision1 = game_board.is_collision(next_x1, next_y1)
-    collision2 = game_board.is_collision(next_x2, next_y2)
+    with PROFILER.timer("collision_check"):
+        collision1 = game_board.is_collision(next_x1, next_y1)
+        collision2 = game_board.is_collision(next_x2, next_y2)
     
-    # Check for head-on collision
-    head_on_collision = (next_x1, next_y1) == (next_x2, next_y2)
+        # Check for head-on collision
+        head_on_collision = (next_x1, next_y1) == (next_x2, next_y2)
     
     if head_on_collision:
         return 3  # It's a draw
@@ -40,13 +48,25 @@ def update_game_state(player1: Player, player2: Player, game_board: GameBoard) -
     elif collision2:
         return 1  # Player 1 wins (Player 2 loses)
     
+    # Without directions the AIs are asked now, both before either player moves;
+    # state_update then times only the position and grid update. One ai_decision
+    # sample per call, as in Player.move()
+    if directions is None:
+        directions = []
+        for player in (player1, player2):
+            with PROFILER.timer("ai_decision"):
+                directions.append(player.ai.get_direction())
+    else:
+        directions = [player1.direction, player2.direction]
+
     # If no collisions, update the positions
-    player1.move()
-    player2.move()
+    with PROFILER.timer("state_update"):
+        player1.move(directions[0])
+        player2.move(directions[1])
     
-    # Update the game board
-    game_board.grid[player1.y][player1.x] = player1.player_id
-    game_board.grid[player2.y][player2.x] = player2.player_id
+        # Update the game board
+        game_board.grid[player1.y][player1.x] = player1.player_id
+        game_board.grid[player2.y][player2.x] = player2.player_id
     
     return 0
 
@@ -74,13 +94,17 @@ def main():
     ai2 = MockAI()
     player1 = Player(10, 15, (255, 0, 0), 1, ai1)
     player2 = Player(30, 15, (0, 0, 255), 2, ai2)
+    decisions = DecisionPool([ai1, ai2], time_budget=0.05)
     clock = pygame.time.Clock()
 
     running = True
     while running:
-        running = handle_events()
+        with PROFILER.timer("input"):
+            running = handle_events()
         if running:
-            result = update_game_state(player1, player2, game_board)
+            with PROFILER.timer("ai_decision"):
+                directions = decisions.decide([player1, player2])
+            result = update_game_state(player1, player2, game_board, directions)
             if result != 0:
                 running = False
                 if result == 1:
@@ -89,10 +113,17 @@ def main():
                     print("Player 2 wins!")
                 else:
                     print("It's a draw!")
-        draw_game(screen, game_board, player1, player2)
+        with PROFILER.timer("render"):
+            draw_game(screen, game_board, player1, player2)
         clock.tick(10)
 
     pygame.quit()
+    decisions.close()
+    if PROFILER.enabled:
+        PROFILER.print_report()
+        for i, stats in enumerate(decisions.latency_stats(), 1):
+            print(f"AI {i}: p50={stats['p50'] * 1e3:.3f}ms p99={stats['p99'] * 1e3:.3f}ms "
+                  f"timeouts={stats['timeouts']} errors={stats['errors']}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
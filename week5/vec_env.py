@@ -0,0 +1,148 @@
+import numpy as np
+import kernels
+from topology import Topology, RELATIVE
+
+class RandomOpponent:
+    def __init__(self, seed=0):
+        """
+        Opponent for VecTronEnv that picks a random direction that is not a reversal.
+        """
+        self.rng = np.random.default_rng(seed)
+
+    def act(self, observations, dirs):
+        turn = self.rng.integers(0, 3, len(dirs))
+        # 0 keeps going, 1 and 2 are the two perpendicular directions
+        perpendicular = np.where(dirs < 2, 2, 0)
+        return np.where(turn == 0, dirs, perpendicular + turn - 1)
+
+def encode(topology, cells, heads, dirs, player, view=5):
+    """
+    Observation of one player in each game: the (2 * view + 1)^2 window around its head
+    (1 for walls and trails, 0 for empty), its direction one-hot and the offset to the
+    other head scaled by the board size.
+    :param cells: (games, board size) boards
+    :param heads: (games, 2) head indices
+    :param dirs: (games, 2) direction indices
+    :param player: 0 for player 1, 1 for player 2
+    :return: (games, observation size) float32 array
+    """
+    n = len(cells)
+    x, y = topology.coords(heads[:, player])
+    ox, oy = topology.coords(heads[:, 1 - player])
+    offsets = np.arange(-view, view + 1)
+    wx = x[:, None, None] + offsets[None, None, :]
+    wy = y[:, None, None] + offsets[None, :, None]
+    inside = (wx >= 0) & (wx < topology.width) & (wy >= 0) & (wy < topology.height)
+    index = topology.index(np.clip(wx, 0, topology.width - 1), np.clip(wy, 0, topology.height - 1))
+    window = np.where(inside, cells[np.arange(n)[:, None, None], index] != 0, True)
+
+    observation = np.zeros((n, window[0].size + 6), dtype=np.float32)
+    observation[:, :window[0].size] = window.reshape(n, -1)
+    observation[np.arange(n), window[0].size + dirs[:, player]] = 1
+    observation[:, -2] = (ox - x) / topology.width
+    observation[:, -1] = (oy - y) / topology.height
+    return observation
+
+def observation_size(view=5):
+    return (2 * view + 1) ** 2 + 6
+
+def legal_masks(topology, cells, heads, dirs, player, relative=False):
+    """
+    Moves that do not crash into a wall or trail right away.
+    :param relative: Masks over (turn left, straight, turn right) instead of the four directions
+    :return: (games, 3 or 4) bool array; a game without any safe move allows every move
+    """
+    n = len(cells)
+    current = dirs[:, player]
+    targets = RELATIVE[current] if relative else np.broadcast_to(np.arange(4), (n, 4))
+    masks = cells[np.arange(n)[:, None], topology.neighbors[heads[:, player][:, None], targets]] == 0
+    if not relative:
+        # A reversal is ignored by the engine, so it is the same move as going straight
+        masks &= ((targets >> 1) != (current[:, None] >> 1)) | (targets == current[:, None])
+    masks[~masks.any(axis=1)] = True
+    return masks
+
+class VecTronEnv:
+    def __init__(self, num_envs, width=40, height=30, opponent=None, view=5, relative=False):
+        """
+        Many two-player games stepped together with kernels.batched_step. The learner
+        is player 1; player 2 is driven by the opponent object.
+        :param num_envs: Number of games
+        :param width: Width of the board in grid cells
+        :param height: Height of the board in grid cells
+        :param opponent: Object with act(observations, dirs) returning direction indices;
+                         if it also has episode_end(env_ids, results) that is called for
+                         every finished game. Defaults to RandomOpponent.
+        :param view: Half size of the observation window
+        :param relative: Actions are turn left / straight / turn right instead of
+                         the four absolute directions
+        """
+        self.num_envs = num_envs
+        self.topology = Topology(width, height)
+        self.opponent = opponent or RandomOpponent()
+        self.view = view
+        self.observation_size = observation_size(view)
+        self.relative = relative
+        self.action_size = 3 if relative else 4
+        self.start_heads = np.array([self.topology.index(width // 4, height // 2),
+                                     self.topology.index(3 * width // 4, height // 2)], dtype=np.int64)
+        self.start_dirs = np.array([3, 2], dtype=np.int64)  # right, left as in Player
+        self.template = self.topology.new_board()
+        self.template[self.start_heads] = [1, 2]
+        self.cells = np.repeat(self.template[None, :], num_envs, axis=0)
+        self.heads = np.repeat(self.start_heads[None, :], num_envs, axis=0)
+        self.dirs = np.repeat(self.start_dirs[None, :], num_envs, axis=0)
+        self.results = np.zeros(num_envs, dtype=np.int64)
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+
+    def reset(self, env_ids=None):
+        """
+        :param env_ids: Games to reset, all by default
+        :return: Player 1 observations for all games
+        """
+        if env_ids is None:
+            env_ids = np.arange(self.num_envs)
+        self._restart(env_ids)
+        return self.observe(0)
+
+    def _restart(self, env_ids):
+        self.cells[env_ids] = self.template
+        self.heads[env_ids] = self.start_heads
+        self.dirs[env_ids] = self.start_dirs
+        self.results[env_ids] = 0
+        self.episode_steps[env_ids] = 0
+
+    def observe(self, player):
+        return encode(self.topology, self.cells, self.heads, self.dirs, player, self.view)
+
+    def action_masks(self, player=0):
+        """
+        :return: (num_envs, action_size) legal-move masks, see legal_masks
+        """
+        return legal_masks(self.topology, self.cells, self.heads, self.dirs, player, self.relative)
+
+    def step(self, actions):
+        """
+        Move player 1 in every game with actions and player 2 with the opponent.
+        Finished games are reset automatically.
+        :param actions: (num_envs,) actions for player 1, relative ones if the env is relative
+        :return: observations, rewards (+1 win, -1 loss, 0 otherwise), dones and an info
+                 dict with the result code of every game that just finished and the
+                 action masks for the returned observations
+        """
+        requested = np.empty((self.num_envs, 2), dtype=np.int64)
+        requested[:, 0] = RELATIVE[self.dirs[:, 0], actions] if self.relative else actions
+        requested[:, 1] = self.opponent.act(self.observe(1), self.dirs[:, 1])
+        kernels.batched_step(self.cells, self.topology.neighbors, self.heads, self.dirs,
+                             requested, self.results)
+        self.episode_steps += 1
+
+        results = self.results.copy()
+        dones = results != 0
+        rewards = np.select([results == 1, results == 2], [1.0, -1.0], 0.0).astype(np.float32)
+        done_ids = np.flatnonzero(dones)
+        if len(done_ids):
+            if hasattr(self.opponent, "episode_end"):
+                self.opponent.episode_end(done_ids, results[done_ids])
+            self._restart(done_ids)
+        return self.observe(0), rewards, dones, {"results": results, "action_mask": self.action_masks(0)}
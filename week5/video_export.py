@@ -0,0 +1,121 @@
+import argparse
+import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from game_record import GameRecord
+from multi_game import player_colors
+
+EMPTY_COLOR = (50, 50, 50)
+# Colors of Player 1 and 2 in tron_game.main
+TWO_PLAYER_COLORS = [(255, 0, 0), (0, 0, 255)]
+
+def find_ffmpeg():
+    """
+    :return: Path of an ffmpeg binary, from PATH or the imageio-ffmpeg package
+    """
+    path = shutil.which("ffmpeg")
+    if path:
+        return path
+    try:
+        import imageio_ffmpeg
+    except ImportError:
+        raise RuntimeError("ffmpeg not found; install it or the imageio-ffmpeg package")
+    return imageio_ffmpeg.get_ffmpeg_exe()
+
+def palette(num_players):
+    colors = TWO_PLAYER_COLORS if num_players == 2 else player_colors(num_players).tolist()
+    return np.array([EMPTY_COLOR] + list(colors), dtype=np.uint8)
+
+def render_frame(board, cell_size, colors):
+    """
+    Render a board without a display by nearest-neighbour upscaling.
+    :param board: (height, width) array of player ids, 0 for empty
+    :param cell_size: Pixels per cell
+    :param colors: Palette from palette()
+    :return: (height * cell_size, width * cell_size, 3) uint8 RGB image
+    """
+    return colors[np.repeat(np.repeat(board, cell_size, axis=0), cell_size, axis=1)]
+
+def record_frames(record, cell_size=10):
+    """
+    Yield one RGB frame per recorded step. Only the new head cells are painted
+    each step, and the same buffer is yielded every time, so copy frames to keep them.
+    """
+    colors = palette(record.num_players)
+    frame = render_frame(np.zeros((record.height, record.width), dtype=np.int64), cell_size, colors)
+    for heads in record.heads:
+        for player_id, (x, y) in enumerate(heads, 1):
+            frame[y * cell_size:(y + 1) * cell_size, x * cell_size:(x + 1) * cell_size] = colors[player_id]
+        yield frame
+
+class FrameWriter:
+    def __init__(self, path, width, height, fps=10):
+        """
+        Stream raw RGB frames into an ffmpeg process; the container (MP4, GIF, ...)
+        follows the file extension of path.
+        :param width: Frame width in pixels
+        :param height: Frame height in pixels
+        """
+        command = [find_ffmpeg(), "-y", "-loglevel", "error",
+                   "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps),
+                   "-i", "-"]
+        if path.endswith(".mp4"):
+            # yuv420p needs even dimensions and is what most players expect
+            command += ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p"]
+        self.process = subprocess.Popen(command + [path], stdin=subprocess.PIPE)
+
+    def write(self, frame):
+        self.process.stdin.write(frame.tobytes())
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError("ffmpeg failed to encode the video")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def export_video(record_path, output_path, cell_size=10, fps=10):
+    """
+    Render one saved GameRecord to a video file.
+    :return: output_path
+    """
+    record = GameRecord.load(record_path)
+    with FrameWriter(output_path, record.width * cell_size, record.height * cell_size, fps) as writer:
+        for frame in record_frames(record, cell_size):
+            writer.write(frame)
+    return output_path
+
+def export_videos(record_paths, output_dir, fmt="mp4", cell_size=10, fps=10, workers=None):
+    """
+    Render many records in parallel worker processes.
+    :return: List of written video paths
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = [os.path.join(output_dir, os.path.splitext(os.path.basename(p))[0] + "." + fmt)
+               for p in record_paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(export_video, record_paths, outputs,
+                             [cell_size] * len(outputs), [fps] * len(outputs)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Render recorded Tron games to video")
+    parser.add_argument("records", nargs="+", help="GameRecord .npz files")
+    parser.add_argument("--output-dir", default="videos")
+    parser.add_argument("--format", default="mp4", choices=["mp4", "gif"])
+    parser.add_argument("--cell-size", type=int, default=10)
+    parser.add_argument("--fps", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    for path in export_videos(args.records, args.output_dir, args.format, args.cell_size,
+                              args.fps, args.workers):
+        print(f"Wrote {path}")
+
+if __name__ == "__main__":
+    main()